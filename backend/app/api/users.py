@@ -3,42 +3,42 @@ API router for user-related endpoints.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..core.security import create_access_token, get_password_hash, verify_password
-from ..db.database import get_db
-from ..models.user import User as UserModel
-from ..schemas.user import Token, User, UserCreate
+from ..core.hashing import password_hasher
+from ..core.security import create_access_token
+from ..db.database import get_async_db
+from ..repositories.user_repository import AsyncUserRepository
+from ..schemas.user import Token, User, UserCreate, token_serializer, user_serializer
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
 @router.post("/", response_model=User)
-def create_user(user: UserCreate, db: Session = Depends(get_db)):
+async def create_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new user."""
+    user_repo = AsyncUserRepository(db)
+
     # Check if user already exists
-    db_user = db.query(UserModel).filter(UserModel.email == user.email).first()
+    db_user = await user_repo.get_by_email(user.email)
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
         )
 
     # Create new user
-    hashed_password = get_password_hash(user.password)
-    db_user = UserModel(
+    hashed_password = await password_hasher.hash(user.password)
+    db_user = await user_repo.create(
         email=user.email, username=user.username, hashed_password=hashed_password
     )
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    return db_user
+    return user_serializer.response(db_user)
 
 
 @router.post("/login", response_model=Token)
-def login(email: str, password: str, db: Session = Depends(get_db)):
+async def login(email: str, password: str, db: AsyncSession = Depends(get_async_db)):
     """Authenticate user and return access token."""
-    user = db.query(UserModel).filter(UserModel.email == email).first()
-    if not user or not verify_password(password, user.hashed_password):
+    user = await AsyncUserRepository(db).get_by_email(email)
+    if not user or not await password_hasher.verify(password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -46,4 +46,6 @@ def login(email: str, password: str, db: Session = Depends(get_db)):
         )
 
     access_token = create_access_token(data={"sub": user.username})
-    return {"access_token": access_token, "token_type": "bearer"}
+    return token_serializer.response(
+        {"access_token": access_token, "token_type": "bearer"}
+    )
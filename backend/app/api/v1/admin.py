@@ -0,0 +1,196 @@
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Iterator, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from starlette.types import Receive, Scope, Send
+
+from ...core.identity_cache import CachedUser
+from ...core.serialization import ORMSerializer, RawJSONResponse
+from ...db.database import get_db
+from ...repositories import BaseRepository
+from ...repositories.pagination import InvalidCursor, Page
+from ...repositories.user_repository import AuditLogRepository, UserRepository
+from ...schemas.pagination import CursorPage
+from ...schemas.user import AuditLog, User, audit_log_serializer, user_serializer
+from ...services.audit import audit_sink
+from ...services.auth import get_current_superuser
+from ...services.user_import import user_importer
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+# Rows fetched per batch when exporting
+EXPORT_BATCH_SIZE = 1000
+
+
+class _DuplexStreamingResponse(StreamingResponse):
+    """
+    Streaming response produced while the request body is still being read.
+
+    ``StreamingResponse`` watches for disconnects by reading the request
+    channel, which would swallow body chunks the iterator is waiting for.
+    This variant leaves the channel to the iterator; a disconnect surfaces
+    as a failed send instead.
+    """
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def _paginate(fetch: Callable[..., Page], cursor: Optional[str], **kwargs: Any):
+    try:
+        return fetch(cursor=cursor, **kwargs)
+    except InvalidCursor as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from None
+
+
+def _page_response(page: Page, serializer: ORMSerializer) -> RawJSONResponse:
+    return RawJSONResponse(serializer.dumps_page(page.items, page.next_cursor))
+
+
+def _ndjson(
+    repository: BaseRepository, serializer: ORMSerializer, **kwargs: Any
+) -> StreamingResponse:
+    """
+    Stream a repository listing as newline-delimited JSON, one chunk per batch.
+
+    FastAPI closes ``get_db`` sessions only after the response has been sent,
+    so the request's session stays open for the whole export.
+    """
+
+    def generate() -> Iterator[bytes]:
+        for batch in repository.stream(batch_size=EXPORT_BATCH_SIZE, **kwargs):
+            yield serializer.dumps_lines(batch)
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+@router.get("/users", response_model=CursorPage[User])
+def list_users(
+    cursor: Optional[str] = None,
+    sort: Literal["id", "username", "email", "created_at"] = "id",
+    descending: bool = False,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: CachedUser = Depends(get_current_superuser),
+):
+    """
+    List users one page at a time.
+    """
+    page = _paginate(
+        UserRepository(db).paginate,
+        cursor,
+        sort=sort,
+        descending=descending,
+        page_size=limit,
+    )
+    return _page_response(page, user_serializer)
+
+
+@router.get("/users/export")
+def export_users(
+    sort: Literal["id", "username", "email", "created_at"] = "id",
+    db: Session = Depends(get_db),
+    current_user: CachedUser = Depends(get_current_superuser),
+):
+    """
+    Export all users as NDJSON.
+    """
+    return _ndjson(UserRepository(db), user_serializer, sort=sort)
+
+
+@router.post("/users/import")
+async def import_users(
+    request: Request,
+    import_format: Optional[Literal["csv", "ndjson"]] = Query(None, alias="format"),
+    current_user: CachedUser = Depends(get_current_superuser),
+):
+    """
+    Bulk-import users from a streamed CSV or NDJSON body.
+
+    The format defaults from the Content-Type. Results stream back as NDJSON:
+    one line per rejected row, then a summary line.
+    """
+    if import_format is None:
+        content_type = request.headers.get("content-type", "")
+        import_format = "csv" if content_type.startswith("text/csv") else "ndjson"
+
+    async def generate() -> AsyncIterator[str]:
+        async for result in user_importer.run(request.stream(), import_format):
+            if result["status"] == "done":
+                audit_sink.emit(
+                    user_id=current_user.id,
+                    action="users_imported",
+                    resource="user",
+                    details=f"Imported {result['created']} users, {result['failed']} rejected",
+                    ip_address=request.client.host if request.client else None,
+                    user_agent=request.headers.get("user-agent"),
+                )
+            yield json.dumps(result) + "\n"
+
+    return _DuplexStreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+@router.get("/audit-logs", response_model=CursorPage[AuditLog])
+def list_audit_logs(
+    cursor: Optional[str] = None,
+    user_id: Optional[int] = None,
+    action: Optional[str] = None,
+    resource: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: CachedUser = Depends(get_current_superuser),
+):
+    """
+    Query audit log entries one page at a time, newest first.
+
+    Filters combine; ``until`` is exclusive.
+    """
+    page = _paginate(
+        AuditLogRepository(db).search,
+        cursor,
+        page_size=limit,
+        user_id=user_id,
+        action=action,
+        resource=resource,
+        since=since,
+        until=until,
+    )
+    return _page_response(page, audit_log_serializer)
+
+
+@router.get("/audit-logs/export")
+def export_audit_logs(
+    user_id: Optional[int] = None,
+    action: Optional[str] = None,
+    resource: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+    current_user: CachedUser = Depends(get_current_superuser),
+):
+    """
+    Export matching audit log entries as NDJSON, newest first.
+    """
+    filters = AuditLogRepository.audit_filters(
+        user_id=user_id,
+        action=action,
+        resource=resource,
+        since=since,
+        until=until,
+    )
+    return _ndjson(
+        AuditLogRepository(db),
+        audit_log_serializer,
+        sort="created_at",
+        descending=True,
+        filters=filters,
+    )
@@ -1,13 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer
-from sqlalchemy.orm import Session
-
-from ..db.database import get_db
-from ..models.user import User
-from ..schemas.user import Token
-from ..schemas.user import User as UserSchema
-from ..schemas.user import UserCreate
-from ..services.auth import auth_service, get_current_active_user
+from ...core.identity_cache import CachedUser
+from ...schemas.user import Token
+from ...schemas.user import User as UserSchema
+from ...schemas.user import UserCreate, token_serializer, user_serializer
+from ...services.auth import AuthService, get_auth_service, get_current_active_user
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 security = HTTPBearer()
@@ -17,17 +14,18 @@ security = HTTPBearer()
     "/register", response_model=UserSchema, status_code=status.HTTP_201_CREATED
 )
 async def register(
-    user: UserCreate, request: Request = None, db: Session = Depends(get_db)
+    user: UserCreate,
+    request: Request = None,
+    auth_service: AuthService = Depends(get_auth_service),
 ):
     """
     Register a new user.
     """
     try:
-        db_user = auth_service.create_user(db, user)
+        db_user = await auth_service.create_user(user)
 
         # Log audit event
         auth_service.log_audit_event(
-            db=db,
             user_id=db_user.id,
             action="user_registered",
             resource="user",
@@ -37,7 +35,7 @@ async def register(
             user_agent=request.headers.get("user-agent") if request else None,
         )
 
-        return db_user
+        return user_serializer.response(db_user, status_code=status.HTTP_201_CREATED)
     except HTTPException:
         raise
     except Exception:
@@ -49,29 +47,24 @@ async def register(
 
 @router.post("/login", response_model=Token)
 async def login(
-    username: str, password: str, request: Request = None, db: Session = Depends(get_db)
+    username: str,
+    password: str,
+    request: Request = None,
+    auth_service: AuthService = Depends(get_auth_service),
 ):
     """
     Login user and return access token.
     """
     try:
-        token_data = auth_service.login_user(db, username, password)
-
-        # Log audit event
-        user = auth_service.authenticate_user(db, username, password)
-        if user:
-            auth_service.log_audit_event(
-                db=db,
-                user_id=user.id,
-                action="user_login",
-                resource="user",
-                resource_id=str(user.id),
-                details=f"User {user.username} logged in",
-                ip_address=request.client.host if request else None,
-                user_agent=request.headers.get("user-agent") if request else None,
-            )
+        # login_user records the audit event
+        token_data = await auth_service.login_user(
+            username,
+            password,
+            ip_address=request.client.host if request else None,
+            user_agent=request.headers.get("user-agent") if request else None,
+        )
 
-        return token_data
+        return token_serializer.response(token_data)
     except HTTPException:
         raise
     except Exception:
@@ -82,12 +75,16 @@ async def login(
 
 
 @router.post("/refresh", response_model=Token)
-async def refresh_token(refresh_token: str, db: Session = Depends(get_db)):
+async def refresh_token(
+    refresh_token: str, auth_service: AuthService = Depends(get_auth_service)
+):
     """
     Refresh access token using refresh token.
     """
     try:
-        return auth_service.refresh_access_token(db, refresh_token)
+        return token_serializer.response(
+            await auth_service.refresh_access_token(refresh_token)
+        )
     except HTTPException:
         raise
     except Exception:
@@ -101,18 +98,17 @@ async def refresh_token(refresh_token: str, db: Session = Depends(get_db)):
 async def logout(
     refresh_token: str,
     request: Request = None,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    current_user: CachedUser = Depends(get_current_active_user),
+    auth_service: AuthService = Depends(get_auth_service),
 ):
     """
     Logout user and revoke refresh token.
     """
     try:
-        success = auth_service.logout_user(db, refresh_token)
+        success = await auth_service.logout_user(refresh_token)
 
         # Log audit event
         auth_service.log_audit_event(
-            db=db,
             user_id=current_user.id,
             action="user_logout",
             resource="user",
@@ -138,11 +134,13 @@ async def logout(
 
 
 @router.get("/me", response_model=UserSchema)
-async def get_current_user_info(current_user: User = Depends(get_current_active_user)):
+async def get_current_user_info(
+    current_user: CachedUser = Depends(get_current_active_user),
+):
     """
     Get current user information.
     """
-    return current_user
+    return user_serializer.response(current_user)
 
 
 @router.post("/change-password")
@@ -150,16 +148,23 @@ async def change_password(
     current_password: str,
     new_password: str,
     request: Request = None,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db),
+    current_user: CachedUser = Depends(get_current_active_user),
+    auth_service: AuthService = Depends(get_auth_service),
 ):
     """
     Change user password.
     """
     try:
+        # The cached identity has no password hash, so load the full row
+        user = auth_service.user_repo.get_by_id(current_user.id)
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+            )
+
         # Verify current password
-        if not auth_service.verify_password(
-            current_password, current_user.hashed_password
+        if not await auth_service.verify_password(
+            current_password, user.hashed_password
         ):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -167,12 +172,14 @@ async def change_password(
             )
 
         # Update password
-        current_user.hashed_password = auth_service.get_password_hash(new_password)
-        db.commit()
+        hashed_password = await auth_service.get_password_hash(new_password)
+        auth_service.user_repo.update_password(user, hashed_password)
+
+        # Existing refresh tokens were issued against the old password
+        await auth_service.revoke_all_refresh_tokens(user.id)
 
         # Log audit event
         auth_service.log_audit_event(
-            db=db,
             user_id=current_user.id,
             action="password_changed",
             resource="user",
@@ -0,0 +1,105 @@
+import aiofiles.os
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    UploadFile,
+    status,
+)
+from fastapi.responses import Response
+
+from ...core.file_response import file_response
+from ...core.identity_cache import CachedUser
+from ...schemas.file import FileList
+from ...services.auth import get_current_active_user
+from ...services.file_upload import file_upload_service
+
+router = APIRouter(prefix="/files", tags=["files"])
+
+
+@router.get("", response_model=FileList)
+async def list_files(
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: CachedUser = Depends(get_current_active_user),
+):
+    """
+    List the current user's files and storage usage.
+    """
+    return {
+        "files": await file_upload_service.list_user_files(current_user.id, limit),
+        "usage": await file_upload_service.get_usage(current_user.id),
+        "quota": file_upload_service.storage_quota,
+    }
+
+
+@router.delete("", status_code=status.HTTP_202_ACCEPTED)
+async def delete_files(
+    background_tasks: BackgroundTasks,
+    current_user: CachedUser = Depends(get_current_active_user),
+):
+    """
+    Delete all of the current user's files in the background.
+    """
+    background_tasks.add_task(file_upload_service.delete_user_files, current_user.id)
+    return {"message": "File deletion scheduled"}
+
+
+@router.post("/images", status_code=status.HTTP_202_ACCEPTED)
+async def upload_image(
+    file: UploadFile = File(...),
+    current_user: CachedUser = Depends(get_current_active_user),
+):
+    """
+    Upload an image; thumbnails are generated in the background.
+    """
+    return await file_upload_service.save_image_with_thumbnails(file, current_user.id)
+
+
+@router.get("/images/{filename}/status")
+async def get_thumbnail_status(
+    filename: str, current_user: CachedUser = Depends(get_current_active_user)
+):
+    """
+    Get the thumbnail generation status for an uploaded image.
+    """
+    job = await file_upload_service.get_thumbnail_status(filename, current_user.id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="File not found"
+        )
+    return job
+
+
+@router.api_route("/{filename}", methods=["GET", "HEAD"], response_class=Response)
+async def download_file(filename: str, request: Request):
+    """
+    Serve an uploaded file or thumbnail variant.
+
+    File URLs never change content, so responses carry a strong ETag and are
+    cacheable indefinitely; conditional and ranged requests are honoured.
+    """
+    location = await file_upload_service.locate_file(filename)
+    if location is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="File not found"
+        )
+
+    try:
+        stat_result = await aiofiles.os.stat(location.path)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="File not found"
+        ) from None
+
+    return file_response(
+        request,
+        location.path,
+        stat_result,
+        etag=location.etag,
+        media_type=location.content_type,
+        accel_redirect=file_upload_service.accel_redirect_path(location.path),
+    )
@@ -22,16 +22,77 @@ class Settings(BaseSettings):
     POSTGRES_DB: str
     POSTGRES_HOST: str = "db"
     POSTGRES_PORT: int = 5432
+    ASYNC_DATABASE_URL: Optional[str] = None  # Derived from DATABASE_URL if unset
 
     # Redis
     REDIS_HOST: str = "redis"
     REDIS_PORT: int = 6379
     REDIS_PASSWORD: Optional[str] = None
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_SOCKET_TIMEOUT: float = 1.0  # Seconds; keeps the limiter failing fast
+
+    # Rate limiting
+    API_RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_LOCAL_SHARE: float = 0.5  # Share of remaining headroom decided locally
+    RATE_LIMIT_SYNC_INTERVAL_SECONDS: float = 0.25
+    RATE_LIMIT_LOCAL_MAX_KEYS: int = 10000  # Client buckets kept per worker
+    RATE_LIMIT_WORKERS: int = 1  # Processes sharing the limits; splits local leases
+    RATE_LIMIT_LOCAL_MIN_LIMIT: int = 50  # Smaller limits are always checked in Redis
 
     # Security
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
+    JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    REFRESH_TOKEN_STORE: str = "redis"  # "redis" or "database"
+    TOKEN_CACHE_SIZE: int = 10000  # Decoded access tokens kept in memory
+    USER_CACHE_TTL_SECONDS: int = 60  # How long a user identity is reused
+    USER_CACHE_SIZE: int = 10000
+
+    # Password hashing
+    PASSWORD_HASH_WORKERS: Optional[int] = None  # Defaults to the CPU count
+    PASSWORD_HASH_MAX_PENDING: int = 64  # Queued hashes before shedding with 503
+
+    # Bulk user import
+    USER_IMPORT_BATCH_SIZE: int = 500  # Rows checked, hashed and inserted together
+
+    # Audit logging
+    AUDIT_BATCH_SIZE: int = 500  # Events per INSERT/COPY batch
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0
+    AUDIT_MAX_BUFFER: int = 10000  # Buffered events before new ones are dropped
+    AUDIT_PARTITION_MONTHS_AHEAD: int = 3  # Monthly partitions created in advance
+
+    # Data retention
+    RETENTION_INTERVAL_SECONDS: int = 24 * 60 * 60  # How often the jobs run
+    RETENTION_BATCH_SIZE: int = 1000  # Rows deleted per transaction
+    RETENTION_BATCH_PAUSE: float = 0.1  # Seconds slept between batches
+    REFRESH_TOKEN_RETENTION_DAYS: int = 0  # Days expired tokens are kept
+    AUDIT_LOG_RETENTION_DAYS: Optional[int] = 365  # Kept forever if unset
+    AUDIT_ARCHIVE_DIR: str = "archive/audit"  # Dropped partitions, as .ndjson.gz
+
+    # File uploads
+    UPLOAD_DIR: str = "uploads"
+    MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
+    ALLOWED_FILE_TYPES: str = "image/jpeg,image/png,image/gif,application/pdf"
+    UPLOAD_CHUNK_SIZE: int = 64 * 1024  # Bytes read per chunk while streaming
+    THUMBNAIL_WORKERS: Optional[int] = None  # Defaults to the CPU count
+    USER_STORAGE_QUOTA: Optional[int] = None  # Bytes per user; unlimited if unset
+    FILE_DELETE_BATCH_SIZE: int = 500  # Files released per transaction
+    # Internal nginx location aliasing UPLOAD_DIR; when set, downloads are
+    # handed off with X-Accel-Redirect so nginx serves them with sendfile
+    UPLOAD_ACCEL_REDIRECT_PREFIX: Optional[str] = None
+    CDN_URL: Optional[str] = None
+    CDN_ENABLED: bool = False
+
+    # Metrics
+    METRICS_ENABLED: bool = True  # Record request metrics and serve /metrics
+    DB_N_PLUS_ONE_THRESHOLD: int = 10  # Runs of one statement per request that warn
+    DB_SLOW_QUERY_SECONDS: float = 0.5  # Statements slower than this are logged
+
+    # Startup
+    CREATE_TABLES_ON_STARTUP: bool = True  # Off when migrations own the schema
+    STARTUP_WARM_CONNECTIONS: int = 5  # DB and Redis connections opened at startup
 
     # CORS
     CORS_ORIGINS: list[str] = ["http://localhost:3000", "http://localhost"]
@@ -0,0 +1,237 @@
+"""
+File responses with conditional GET, byte ranges and zero-copy sends.
+"""
+
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Mapping, Optional, Tuple, Union
+
+import anyio
+from fastapi import HTTPException, Request, status
+from starlette.background import BackgroundTask
+from starlette.responses import FileResponse, Response
+from starlette.types import Receive, Scope, Send
+
+# Cache policy for content that never changes under its URL
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# ASGI extension letting the server send file contents with sendfile(2)
+ZEROCOPY_EXTENSION = "http.response.zerocopy"
+
+
+def etag_matches(header: str, etag: str, weak: bool = True) -> bool:
+    """Check an ``If-None-Match``/``If-Range`` header value against an ETag."""
+    if header.strip() == "*":
+        return True
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            if not weak:
+                continue
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def _not_modified_since(header: str, mtime: float) -> bool:
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    # HTTP dates have one-second resolution
+    return int(mtime) <= since.timestamp()
+
+
+def is_not_modified(request: Request, etag: str, mtime: float) -> bool:
+    """
+    Evaluate conditional GET headers.
+
+    ``If-None-Match`` takes precedence; ``If-Modified-Since`` is only
+    consulted when the client sent no ETag to compare.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        return _not_modified_since(if_modified_since, mtime)
+    return False
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a ``Range`` header into an inclusive ``(start, end)`` byte range.
+
+    Only a single range is supported; malformed or multi-range headers return
+    None so the full body is served. Unsatisfiable ranges raise a 416.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if not first:
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length <= 0:
+                raise ValueError
+            start, end = max(size - length, 0), size - 1
+        else:
+            start = int(first)
+            end = int(last) if last else max(start, size - 1)
+    except ValueError:
+        return None
+
+    if start < 0 or end < start:
+        return None
+    if start >= size:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, min(end, size - 1)
+
+
+class RangeFileResponse(FileResponse):
+    """
+    ``FileResponse`` serving an optional byte range.
+
+    When the server advertises the ASGI zero-copy extension, the body is
+    handed to it as a file descriptor so it can use ``sendfile(2)``;
+    otherwise it is streamed in chunks.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        stat_result: os.stat_result,
+        byte_range: Optional[Tuple[int, int]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        media_type: Optional[str] = None,
+        method: Optional[str] = None,
+        background: Optional[BackgroundTask] = None,
+    ):
+        size = stat_result.st_size
+        self.offset, last = byte_range or (0, size - 1)
+        self.count = max(last - self.offset + 1, 0)
+
+        headers = dict(headers or {})
+        headers["accept-ranges"] = "bytes"
+        headers["content-length"] = str(self.count)
+        if byte_range is not None:
+            headers["content-range"] = f"bytes {self.offset}-{last}/{size}"
+
+        super().__init__(
+            path,
+            status_code=(
+                status.HTTP_206_PARTIAL_CONTENT
+                if byte_range is not None
+                else status.HTTP_200_OK
+            ),
+            headers=headers,
+            media_type=media_type,
+            background=background,
+            stat_result=stat_result,
+            method=method,
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+        if self.send_header_only or not self.count:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        elif ZEROCOPY_EXTENSION in scope.get("extensions", {}):
+            with open(self.path, "rb") as file:
+                await send(
+                    {
+                        "type": ZEROCOPY_EXTENSION,
+                        "file": file,
+                        "offset": self.offset,
+                        "count": self.count,
+                        "more_body": False,
+                    }
+                )
+        else:
+            async with await anyio.open_file(self.path, mode="rb") as file:
+                await file.seek(self.offset)
+                remaining = self.count
+                while remaining:
+                    chunk = await file.read(min(self.chunk_size, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    await send(
+                        {
+                            "type": "http.response.body",
+                            "body": chunk,
+                            "more_body": remaining > 0,
+                        }
+                    )
+                if remaining:
+                    # The file shrank underneath us; end the body cleanly
+                    await send(
+                        {"type": "http.response.body", "body": b"", "more_body": False}
+                    )
+        if self.background is not None:
+            await self.background()
+
+
+def file_response(
+    request: Request,
+    path: Union[str, os.PathLike],
+    stat_result: os.stat_result,
+    etag: str,
+    media_type: str,
+    cache_control: str = IMMUTABLE_CACHE_CONTROL,
+    accel_redirect: Optional[str] = None,
+) -> Response:
+    """
+    Build the response for a stored file.
+
+    Answers 304 to matching conditional requests and serves a single
+    ``Range`` (unless ``If-Range`` no longer matches). If ``accel_redirect``
+    is given, the body is left to the fronting nginx via ``X-Accel-Redirect``,
+    which serves it with ``sendfile`` and handles ranges itself.
+    """
+    headers = {
+        "etag": etag,
+        "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+        "cache-control": cache_control,
+    }
+
+    if is_not_modified(request, etag, stat_result.st_mtime):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if accel_redirect is not None:
+        headers["x-accel-redirect"] = accel_redirect
+        return Response(headers=headers, media_type=media_type)
+
+    byte_range = None
+    range_header = request.headers.get("range")
+    if range_header is not None:
+        if_range = request.headers.get("if-range")
+        if if_range is None or (
+            etag_matches(if_range, etag, weak=False)
+            if if_range.lstrip().startswith(('"', "W/"))
+            else if_range.strip() == headers["last-modified"]
+        ):
+            byte_range = parse_range(range_header, stat_result.st_size)
+
+    return RangeFileResponse(
+        path,
+        stat_result,
+        byte_range=byte_range,
+        headers=headers,
+        media_type=media_type,
+        method=request.method,
+    )
@@ -0,0 +1,136 @@
+"""
+Process pool executor for CPU-bound password hashing.
+"""
+
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, List, Optional, Sequence
+
+from fastapi import HTTPException, status
+
+from .config import settings
+from .security import get_password_hash, pwd_context, verify_password
+
+
+def hash_passwords(passwords: Sequence[str]) -> List[str]:
+    """Hash a batch of passwords in one worker call."""
+    return [get_password_hash(password) for password in passwords]
+
+
+def load_hash_backend() -> None:
+    """Load bcrypt and run passlib's self-test, otherwise done on first use."""
+    pwd_context.handler().get_backend()
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hash/verify calls in a process pool sized to the CPU count.
+
+    Calls are awaitable so the event loop keeps serving other requests while a
+    hash is computed. Once ``max_pending`` calls are in flight, new calls are
+    rejected with a 503 instead of queueing without bound.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: int = 64,
+        chunk_size: int = 4,
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.chunk_size = chunk_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of hash/verify calls currently queued or running."""
+        return self._pending
+
+    def start(self) -> ProcessPoolExecutor:
+        """Create the worker pool if it is not running yet."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    async def warm(self) -> None:
+        """Start the worker processes and load bcrypt in each of them."""
+        # Forked workers inherit the backend loaded here
+        load_hash_backend()
+        loop = asyncio.get_running_loop()
+        executor = self.start()
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(executor, load_hash_backend)
+                for _ in range(self.max_workers)
+            )
+        )
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    async def _run(self, func: Callable[..., Any], *args: Any, weight: int = 1) -> Any:
+        # Each password counts, so batch calls cannot bypass the queue limit
+        if self._pending + weight > self.max_pending:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+
+        self._pending += weight
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.start(), func, *args)
+        except BrokenProcessPool:
+            # A worker died; drop the pool so the next call starts a fresh one
+            self._executor = None
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please retry shortly",
+                headers={"Retry-After": "1"},
+            ) from None
+        finally:
+            self._pending -= weight
+
+    async def hash(self, password: str) -> str:
+        """Hash a password in the worker pool."""
+        return await self._run(get_password_hash, password)
+
+    async def hash_many(self, passwords: Sequence[str]) -> List[str]:
+        """
+        Hash many passwords, leaving a worker free for other calls.
+
+        Passwords are hashed ``chunk_size`` per worker call and at most
+        ``max_workers - 1`` chunks run at once, so logins are never queued
+        behind a whole batch.
+        """
+        if not passwords:
+            return []
+        size = max(min(self.chunk_size, self.max_pending), 1)
+        chunks = [passwords[i : i + size] for i in range(0, len(passwords), size)]
+        slots = asyncio.Semaphore(max(self.max_workers - 1, 1))
+
+        async def hash_chunk(chunk: Sequence[str]) -> List[str]:
+            async with slots:
+                return await self._run(hash_passwords, list(chunk), weight=len(chunk))
+
+        results = await asyncio.gather(*(hash_chunk(chunk) for chunk in chunks))
+        return [hashed for chunk in results for hashed in chunk]
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash in the worker pool."""
+        return await self._run(verify_password, plain_password, hashed_password)
+
+
+# Create hasher instance
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
@@ -0,0 +1,119 @@
+"""
+In-process cache of authenticated user identities.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from .config import settings
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """Snapshot of the user fields needed to authorize and describe a request."""
+
+    id: int
+    username: str
+    email: str
+    is_active: bool
+    is_superuser: bool
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    @classmethod
+    def from_model(cls, user: Any) -> "CachedUser":
+        """Build a snapshot from a ``User`` row."""
+        return cls(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            is_active=bool(user.is_active),
+            is_superuser=bool(user.is_superuser),
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+
+class IdentityCache:
+    """
+    TTL-bounded LRU cache of ``CachedUser`` snapshots keyed on user ID.
+
+    Writes through ``UserRepository`` invalidate entries in this process; the
+    TTL bounds how long other workers can serve a stale snapshot.
+    """
+
+    def __init__(self, ttl_seconds: int = 60, max_size: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[int, Tuple[float, CachedUser]]" = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped on every invalidation."""
+        return self._generation
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def get(self, user_id: int) -> Optional[CachedUser]:
+        """Return the cached snapshot for a user, if still fresh."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                expires_at, user = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(user_id)
+                    self.hits += 1
+                    return user
+                del self._entries[user_id]
+            self.misses += 1
+            return None
+
+    def set(self, user: Any, generation: Optional[int] = None) -> CachedUser:
+        """
+        Cache a snapshot of ``user`` and return it.
+
+        When ``generation`` is given and an invalidation happened since it was
+        read, the snapshot may be stale and is returned without being cached.
+        """
+        snapshot = CachedUser.from_model(user)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return snapshot
+            self._entries[snapshot.id] = (
+                time.monotonic() + self.ttl_seconds,
+                snapshot,
+            )
+            self._entries.move_to_end(snapshot.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return snapshot
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop the cached snapshot for a user."""
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        """Drop all cached snapshots."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+# Create cache instance
+identity_cache = IdentityCache(
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+    max_size=settings.USER_CACHE_SIZE,
+)
@@ -0,0 +1,148 @@
+"""
+Prometheus metrics for the API and its shared resources.
+
+Label values come from small, fixed sets (route templates, methods, status
+codes, limit types), never from raw paths or client input, so the number of
+series stays bounded.
+"""
+
+from typing import Dict, Iterator
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+from sqlalchemy.engine import Engine
+from starlette.responses import Response
+
+# Request latency buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Redis round trips are expected to be sub-millisecond to a few milliseconds
+REDIS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+# Thumbnail jobs resize full images in a worker process
+THUMBNAIL_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time spent handling HTTP requests, by route template.",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS = Counter(
+    "http_requests",
+    "HTTP responses sent, by route template and status code.",
+    ["method", "route", "status"],
+)
+
+DB_QUERIES = Histogram(
+    "db_queries_per_request",
+    "SQL statements run per request, by route template.",
+    ["route"],
+    buckets=(1, 2, 3, 5, 10, 20, 50, 100),
+)
+DB_TIME = Histogram(
+    "db_time_per_request_seconds",
+    "Time spent running SQL statements per request, by route template.",
+    ["route"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_REPEATED_STATEMENTS = Counter(
+    "db_repeated_statements",
+    "Requests that ran one statement more than the N+1 threshold.",
+    ["route"],
+)
+
+RATE_LIMIT_DECISIONS = Counter(
+    "rate_limit_decisions",
+    "Rate limiter decisions, by where they were made.",
+    ["limit_type", "source", "decision"],
+)
+REDIS_LATENCY = Histogram(
+    "redis_command_duration_seconds",
+    "Round-trip time of Redis calls made by the rate limiter.",
+    ["command"],
+    buckets=REDIS_BUCKETS,
+)
+
+UPLOAD_BYTES = Counter(
+    "upload_bytes",
+    "Bytes received in stored uploads; duplicates share an existing blob.",
+    ["blob"],
+)
+UPLOADS = Counter(
+    "uploads",
+    "Uploads stored; duplicates share an existing blob.",
+    ["blob"],
+)
+THUMBNAIL_JOB_DURATION = Histogram(
+    "thumbnail_job_duration_seconds",
+    "Time from queueing a thumbnail job to its completion.",
+    ["status"],
+    buckets=THUMBNAIL_BUCKETS,
+)
+
+
+class PoolCollector(Collector):
+    """
+    Reports the connection pool state of SQLAlchemy engines.
+
+    The pools are read when metrics are scraped, so requests pay nothing for
+    these gauges.
+    """
+
+    def __init__(self):
+        self.engines: Dict[str, Engine] = {}
+
+    def track(self, name: str, engine: Engine) -> None:
+        """Report the pool of an engine under ``name``."""
+        self.engines[name] = engine
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        gauges = {
+            "size": GaugeMetricFamily(
+                "db_pool_size", "Connections the pool keeps open.", labels=["engine"]
+            ),
+            "checkedout": GaugeMetricFamily(
+                "db_pool_checked_out",
+                "Connections currently in use.",
+                labels=["engine"],
+            ),
+            "checkedin": GaugeMetricFamily(
+                "db_pool_checked_in",
+                "Idle connections in the pool.",
+                labels=["engine"],
+            ),
+            "overflow": GaugeMetricFamily(
+                "db_pool_overflow",
+                "Connections beyond the pool size; negative until the pool fills.",
+                labels=["engine"],
+            ),
+        }
+        for name, engine in self.engines.items():
+            for method, gauge in gauges.items():
+                # Not every pool class (e.g. NullPool) reports every figure
+                reading = getattr(engine.pool, method, None)
+                if reading is not None:
+                    gauge.add_metric([name], reading())
+        yield from gauges.values()
+
+
+def metrics_response(registry: CollectorRegistry = REGISTRY) -> Response:
+    """Render every metric in the Prometheus text format."""
+    # The content type already names its charset, so pass it as a header
+    return Response(
+        generate_latest(registry), headers={"Content-Type": CONTENT_TYPE_LATEST}
+    )
+
+
+# Create collector instance
+pool_collector = PoolCollector()
+REGISTRY.register(pool_collector)
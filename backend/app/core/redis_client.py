@@ -0,0 +1,62 @@
+"""
+Shared async Redis connection pool.
+"""
+
+import asyncio
+from typing import Optional
+
+import redis.asyncio as redis
+
+from .config import settings
+
+
+class RedisClient:
+    """
+    Owns the process-wide async Redis client and its connection pool.
+
+    The pool is created by the application lifespan and shared by every
+    caller, so requests reuse warm connections instead of connecting anew.
+    """
+
+    def __init__(self):
+        self._client: Optional[redis.Redis] = None
+
+    @property
+    def client(self) -> redis.Redis:
+        """The shared client, created on first use if the pool is not started."""
+        return self.start()
+
+    def start(self) -> redis.Redis:
+        """Create the connection pool if it does not exist yet."""
+        if self._client is None:
+            pool = redis.ConnectionPool(
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                password=settings.REDIS_PASSWORD,
+                max_connections=settings.REDIS_MAX_CONNECTIONS,
+                socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+                socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+                decode_responses=True,
+            )
+            self._client = redis.Redis(connection_pool=pool)
+        return self._client
+
+    async def warm(self, connections: int) -> None:
+        """Open up to ``connections`` pooled connections with concurrent pings."""
+        client = self.start()
+        count = min(connections, settings.REDIS_MAX_CONNECTIONS)
+        await asyncio.gather(*(client.ping() for _ in range(count)))
+
+    def use(self, client: redis.Redis) -> None:
+        """Replace the shared client, e.g. with a fake in tests."""
+        self._client = client
+
+    async def close(self) -> None:
+        """Close the client and disconnect its pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Create client instance
+redis_client = RedisClient()
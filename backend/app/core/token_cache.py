@@ -0,0 +1,83 @@
+"""
+In-process cache of validated JWT claims.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from jose import jwt
+
+from .config import settings
+
+
+class TokenCache:
+    """
+    Bounded LRU cache of decoded JWT claims keyed on a digest of the token.
+
+    Entries are dropped once the token's ``exp`` passes, so a hit never
+    returns claims that ``jwt.decode`` would reject as expired. Changing the
+    signing key or algorithm flushes the cache.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = (
+            OrderedDict()
+        )
+        self._key_id: Optional[bytes] = None
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def clear(self) -> None:
+        """Drop all cached claims."""
+        with self._lock:
+            self._entries.clear()
+
+    def decode(self, token: str, secret_key: str, algorithm: str) -> Dict[str, Any]:
+        """Return the token's claims, raising ``JWTError`` if it is invalid."""
+        key_id = hashlib.sha256(f"{algorithm}:{secret_key}".encode()).digest()
+        digest = hashlib.sha256(token.encode()).digest()
+        now = time.time()
+
+        with self._lock:
+            if key_id != self._key_id:
+                # Signing key rotated; claims verified with the old key are stale
+                self._entries.clear()
+                self._key_id = key_id
+
+            entry = self._entries.get(digest)
+            if entry is not None:
+                expires_at, claims = entry
+                if expires_at > now:
+                    self._entries.move_to_end(digest)
+                    self.hits += 1
+                    return claims
+                del self._entries[digest]
+            self.misses += 1
+
+        claims = jwt.decode(token, secret_key, algorithms=[algorithm])
+
+        # Only tokens with an expiry are cached, so every entry has a lifetime
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)) and exp > now:
+            with self._lock:
+                if key_id == self._key_id:
+                    self._entries[digest] = (float(exp), claims)
+                    self._entries.move_to_end(digest)
+                    while len(self._entries) > self.max_size:
+                        self._entries.popitem(last=False)
+
+        return claims
+
+
+# Create cache instance
+token_cache = TokenCache(max_size=settings.TOKEN_CACHE_SIZE)
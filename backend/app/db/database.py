@@ -2,11 +2,39 @@
 Database configuration and session management.
 """
 
+import asyncio
+import contextlib
+from typing import AsyncIterator, Iterator
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.requests import Request
+
+from ..core.config import settings
+from .query_stats import request_stats, track_session
+
+# Async drivers for each sync database backend
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def make_async_url(database_url: str) -> str:
+    """Translate a sync database URL to its async driver equivalent."""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if url.get_driver_name() in ("asyncpg", "aiosqlite"):
+        return database_url
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend} databases")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(
+        hide_password=False
+    )
 
-from .config import settings
 
 # Create database engine
 engine = create_engine(
@@ -15,17 +43,73 @@ engine = create_engine(
     pool_recycle=300,
 )
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Create async database engine
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL or make_async_url(settings.DATABASE_URL),
+    pool_pre_ping=True,
+    pool_recycle=300,
+)
+
+# Create session factories
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
 
 # Create base class for models
 Base = declarative_base()
 
 
-def get_db():
-    """Dependency to get database session."""
+def get_db(request: Request = None) -> Iterator[Session]:
+    """Dependency to get database session, counting its statements."""
     db = SessionLocal()
+    track_session(db, request_stats(request))
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db(request: Request = None) -> AsyncIterator[AsyncSession]:
+    """
+    Dependency to get an async database session.
+
+    The session only checks a connection out of the pool when the first
+    statement runs, so requests that never query hold no connection. Its
+    statements are counted like those of ``get_db``.
+    """
+    async with AsyncSessionLocal() as db:
+        track_session(db.sync_session, request_stats(request))
+        yield db
+
+
+def _pool_size(engine) -> int:
+    size = getattr(engine.pool, "size", None)
+    return size() if size is not None else 1
+
+
+def _warm_sync_pool(connections: int) -> None:
+    held = []
+    try:
+        for _ in range(min(connections, _pool_size(engine))):
+            held.append(engine.connect())
+    finally:
+        for conn in held:
+            conn.close()
+
+
+async def warm_pools(connections: int) -> None:
+    """
+    Open up to ``connections`` connections in each engine's pool.
+
+    Run at startup, so the first requests reuse established connections
+    instead of each paying for a connect and handshake.
+    """
+    count = min(connections, _pool_size(async_engine.sync_engine))
+    async with contextlib.AsyncExitStack() as stack:
+        await asyncio.gather(
+            asyncio.to_thread(_warm_sync_pool, connections),
+            *(stack.enter_async_context(async_engine.connect()) for _ in range(count)),
+        )
@@ -0,0 +1,204 @@
+"""
+Monthly range partitioning for append-only PostgreSQL tables.
+"""
+
+import asyncio
+import contextlib
+import logging
+import re
+from datetime import date
+from typing import List, Optional, Tuple
+
+from sqlalchemy import PrimaryKeyConstraint, Table, event, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.compiler import compiles
+
+logger = logging.getLogger(__name__)
+
+# Table.info key naming the column a table is range-partitioned on
+PARTITION_KEY = "partition_key"
+
+
+def add_months(day: date, months: int) -> date:
+    """First day of the month ``months`` after the month containing ``day``."""
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def partition_name(table_name: str, month: date) -> str:
+    """Name of the partition holding one month of a table."""
+    return f"{table_name}_y{month.year:04d}m{month.month:02d}"
+
+
+def parse_partition_name(table_name: str, name: str) -> Optional[date]:
+    """First day of the month held by a partition, or None for other tables."""
+    match = re.fullmatch(rf"{re.escape(table_name)}_y(\d{{4}})m(\d{{2}})", name)
+    if match is None:
+        return None
+    return date(int(match.group(1)), int(match.group(2)), 1)
+
+
+@compiles(PrimaryKeyConstraint, "postgresql")
+def _compile_partitioned_primary_key(constraint, compiler, **kw):
+    """
+    Add the partition key to the primary key of partitioned tables.
+
+    PostgreSQL requires unique constraints on a partitioned table to include
+    the partition key; other dialects keep the model's single-column key.
+    """
+    partition_key = constraint.table.info.get(PARTITION_KEY)
+    if partition_key is None or partition_key in constraint.columns:
+        return compiler.visit_primary_key_constraint(constraint, **kw)
+
+    columns = [*constraint.columns, constraint.table.c[partition_key]]
+    return "PRIMARY KEY (%s)" % ", ".join(
+        compiler.preparer.quote(column.name) for column in columns
+    )
+
+
+def ensure_monthly_partitions(
+    conn: Connection,
+    table: Table,
+    months_ahead: int = 3,
+    today: Optional[date] = None,
+) -> List[str]:
+    """
+    Create this month's partition and the next ``months_ahead``.
+
+    Also creates a default partition, so rows outside the covered range are
+    still accepted. PostgreSQL refuses to add a partition for a range the
+    default partition holds rows for, so each missing month is created
+    detached, takes over its rows from the default partition and is then
+    attached. Existing partitions are left alone; returns the names of the
+    partitions checked.
+    """
+    first = (today or date.today()).replace(day=1)
+    preparer = conn.dialect.identifier_preparer
+    parent = preparer.format_table(table)
+    key = preparer.quote(table.info[PARTITION_KEY])
+    default = preparer.quote(f"{table.name}_default")
+
+    # Workers maintaining the same table take turns
+    conn.execute(text(f"LOCK TABLE {parent} IN SHARE UPDATE EXCLUSIVE MODE"))
+    conn.execute(
+        text(f"CREATE TABLE IF NOT EXISTS {default} PARTITION OF {parent} DEFAULT")
+    )
+    existing = {name for name, _ in list_monthly_partitions(conn, table)}
+
+    names = []
+    for offset in range(months_ahead + 1):
+        start = add_months(first, offset).isoformat()
+        end = add_months(first, offset + 1).isoformat()
+        name = partition_name(table.name, add_months(first, offset))
+        names.append(name)
+        if name in existing:
+            continue
+
+        partition = preparer.quote(name)
+        conn.execute(text(f"CREATE TABLE {partition} (LIKE {parent})"))
+        conn.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {default} "
+                f"WHERE {key} >= '{start}' AND {key} < '{end}' RETURNING *) "
+                f"INSERT INTO {partition} SELECT * FROM moved"
+            )
+        )
+        conn.execute(
+            text(
+                f"ALTER TABLE {parent} ATTACH PARTITION {partition} "
+                f"FOR VALUES FROM ('{start}') TO ('{end}')"
+            )
+        )
+    return names
+
+
+def list_monthly_partitions(conn: Connection, table: Table) -> List[Tuple[str, date]]:
+    """Monthly partitions attached to a table, oldest first."""
+    names = conn.scalars(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :table"
+        ),
+        {"table": table.name},
+    )
+    partitions = []
+    for name in names:
+        month = parse_partition_name(table.name, name)
+        if month is not None:
+            partitions.append((name, month))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def drop_partition(conn: Connection, table: Table, name: str) -> None:
+    """Detach a partition from its table and drop it."""
+    preparer = conn.dialect.identifier_preparer
+    conn.execute(
+        text(
+            f"ALTER TABLE {preparer.format_table(table)} "
+            f"DETACH PARTITION {preparer.quote(name)}"
+        )
+    )
+    conn.execute(text(f"DROP TABLE {preparer.quote(name)}"))
+
+
+def partition_on_create(table: Table, months_ahead: int = 3) -> None:
+    """Create the initial partitions right after a partitioned table is created."""
+
+    @event.listens_for(table, "after_create")
+    def create_partitions(target, connection, **kw):
+        if connection.dialect.name == "postgresql":
+            ensure_monthly_partitions(connection, target, months_ahead)
+
+
+class PartitionMaintainer:
+    """
+    Keeps future monthly partitions created while the application runs.
+
+    A background task checks once per ``interval`` seconds, so partitions
+    exist well before rows for a new month arrive. Does nothing on
+    databases other than PostgreSQL.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        tables: List[Table],
+        months_ahead: int = 3,
+        interval: float = 24 * 60 * 60,
+    ):
+        self.engine = engine
+        self.tables = tables
+        self.months_ahead = months_ahead
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def run_once(self) -> None:
+        """Create any missing partitions."""
+        if self.engine.dialect.name != "postgresql":
+            return
+        with self.engine.begin() as conn:
+            for table in self.tables:
+                ensure_monthly_partitions(conn, table, self.months_ahead)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception:
+                logger.exception("Failed to create partitions")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start the background task on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
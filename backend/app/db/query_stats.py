@@ -0,0 +1,151 @@
+"""
+Per-request SQL statement counts and timings.
+
+Sessions handed out by ``get_db`` and ``get_async_db`` carry the request's
+``QueryStats`` in ``session.info``. When a session begins a transaction the
+stats are attached to its connection, and engine events record every
+statement run on it until the connection goes back to the pool.
+"""
+
+import contextlib
+import heapq
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session, SessionTransaction
+from sqlalchemy.pool import Pool
+from starlette.requests import Request
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Key of the stats in session.info, connection.info and request.state
+STATS_KEY = "query_stats"
+
+# Statements kept as the slowest of a request
+SLOWEST_KEPT = 3
+
+
+class NPlusOneWarning(UserWarning):
+    """One statement ran many times in a request, with different parameters."""
+
+
+@dataclass
+class QueryStats:
+    """Statements run during one request, or inside ``count_queries``."""
+
+    count: int = 0
+    seconds: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+    _slowest: List[Tuple[float, str]] = field(default_factory=list, repr=False)
+
+    def record(self, statement: str, seconds: float) -> None:
+        """Add one executed statement."""
+        self.count += 1
+        self.seconds += seconds
+        self.statements[statement] += 1
+        if len(self._slowest) < SLOWEST_KEPT:
+            heapq.heappush(self._slowest, (seconds, statement))
+        elif seconds > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, (seconds, statement))
+
+    @property
+    def slowest(self) -> List[Tuple[float, str]]:
+        """The slowest statements as (seconds, statement), slowest first."""
+        return sorted(self._slowest, reverse=True)
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statements that ran at least ``threshold`` times, most frequent first."""
+        return [
+            (statement, count)
+            for statement, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+
+# Stats of active count_queries blocks, which see every statement
+_global_stats: List[QueryStats] = []
+
+
+def request_stats(request: Optional[Request]) -> Optional[QueryStats]:
+    """The stats of a request, created on first use."""
+    if request is None:
+        return None
+    stats = getattr(request.state, STATS_KEY, None)
+    if stats is None:
+        stats = QueryStats()
+        setattr(request.state, STATS_KEY, stats)
+    return stats
+
+
+def track_session(session: Session, stats: Optional[QueryStats]) -> None:
+    """Record the statements a session runs into ``stats``."""
+    if stats is not None:
+        session.info[STATS_KEY] = stats
+
+
+@contextlib.contextmanager
+def count_queries() -> Iterator[QueryStats]:
+    """Record every statement run on any engine inside the block."""
+    stats = QueryStats()
+    _global_stats.append(stats)
+    try:
+        yield stats
+    finally:
+        _global_stats.remove(stats)
+
+
+@contextlib.contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryStats]:
+    """Fail if the block runs more than ``limit`` statements."""
+    with count_queries() as stats:
+        yield stats
+    if stats.count > limit:
+        statements = "\n".join(
+            f"  {count}x {statement}" for statement, count in stats.statements.items()
+        )
+        raise AssertionError(
+            f"Expected at most {limit} queries, ran {stats.count}:\n{statements}"
+        )
+
+
+@event.listens_for(Session, "after_begin")
+def _attach_stats(
+    session: Session, transaction: SessionTransaction, connection: Connection
+) -> None:
+    stats = session.info.get(STATS_KEY)
+    if stats is not None:
+        connection.info[STATS_KEY] = stats
+
+
+@event.listens_for(Pool, "checkin")
+def _detach_stats(dbapi_connection, connection_record) -> None:
+    connection_record.info.pop(STATS_KEY, None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info["query_started"] = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_statement(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    started = conn.info.pop("query_started", None)
+    # A listener attached mid-statement sees no start time; count it untimed
+    seconds = 0.0 if started is None else time.perf_counter() - started
+    if seconds >= settings.DB_SLOW_QUERY_SECONDS:
+        logger.warning("Slow query (%.3fs): %s", seconds, statement)
+
+    stats = conn.info.get(STATS_KEY)
+    if stats is not None:
+        stats.record(statement, seconds)
+    for stats in _global_stats:
+        stats.record(statement, seconds)
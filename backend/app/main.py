@@ -2,45 +2,89 @@
 Main application entry point for the FastAPI backend.
 """
 
+import asyncio
 import logging
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import AsyncIterator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
 
 from .api.users import router as users_router
+from .api.v1.admin import router as admin_router
+from .api.v1.auth import router as auth_router
+from .api.v1.files import router as files_router
 from .core.config import settings
-from .db.database import engine
+from .core.hashing import password_hasher
+from .core.metrics import metrics_response, pool_collector
+from .core.redis_client import redis_client
+from .db.database import async_engine, engine, warm_pools
+from .middleware.metrics import MetricsMiddleware
+from .middleware.query_stats import QueryStatsMiddleware
+from .middleware.rate_limit import rate_limit_middleware, rate_limiter
 from .models import user
+from .services.audit import audit_partitions, audit_sink
+from .services.retention import retention_jobs
+from .services.thumbnails import thumbnail_runner
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Create database tables
-user.Base.metadata.create_all(bind=engine)
 
-# Create the FastAPI app instance
-app = FastAPI(
-    title=settings.APP_NAME,
-    description="A modern full-stack application backend",
-    version=settings.APP_VERSION,
-    debug=settings.DEBUG,
-)
-
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Include API routers
-app.include_router(users_router, prefix=settings.API_V1_STR)
-
-
-@app.get("/health", tags=["Health"])
+async def warm_up(app: FastAPI) -> None:
+    """
+    Prepare shared resources before the first request arrives.
+
+    Opens pooled database and Redis connections, starts the password
+    hashing workers and builds the OpenAPI schema. A resource that cannot
+    be warmed is logged and left to start on first use.
+    """
+    connections = settings.STARTUP_WARM_CONNECTIONS
+    results = await asyncio.gather(
+        warm_pools(connections),
+        redis_client.warm(connections),
+        password_hasher.warm(),
+        return_exceptions=True,
+    )
+    for name, result in zip(
+        ("database pool", "Redis pool", "hashing"), results, strict=True
+    ):
+        if isinstance(result, Exception):
+            logger.warning("Could not warm %s: %s", name, result)
+    app.openapi()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Start and stop shared resources with the application.
+
+    Each resource is released in reverse order of startup, and a failure to
+    release one does not stop the rest from being released.
+    """
+    async with AsyncExitStack() as stack:
+        stack.push_async_callback(async_engine.dispose)
+        stack.callback(thumbnail_runner.shutdown)
+        stack.callback(password_hasher.shutdown)
+        stack.push_async_callback(redis_client.close)
+        if settings.CREATE_TABLES_ON_STARTUP:
+            await asyncio.to_thread(user.Base.metadata.create_all, bind=engine)
+        await warm_up(app)
+
+        thumbnail_runner.start()
+        rate_limiter.start()
+        stack.push_async_callback(rate_limiter.stop)
+        audit_sink.start()
+        stack.push_async_callback(audit_sink.stop)
+        audit_partitions.start()
+        stack.push_async_callback(audit_partitions.stop)
+        retention_jobs.start()
+        stack.push_async_callback(retention_jobs.stop)
+        yield
+
+
 def health_check() -> dict[str, str]:
     """
     Simple health check endpoint to confirm the API is running.
@@ -48,7 +92,13 @@ def health_check() -> dict[str, str]:
     return {"status": "ok", "service": settings.APP_NAME}
 
 
-@app.get("/", tags=["Root"])
+def metrics() -> Response:
+    """
+    Prometheus metrics for this worker.
+    """
+    return metrics_response()
+
+
 def root() -> dict[str, str]:
     """
     Root endpoint with API information.
@@ -58,3 +108,64 @@ def root() -> dict[str, str]:
         "version": settings.APP_VERSION,
         "docs": "/docs",
     }
+
+
+def create_app() -> FastAPI:
+    """
+    Build the application with its middleware and routes.
+
+    Nothing here connects to the database or Redis; that happens in the
+    lifespan, so importing this module stays cheap.
+    """
+    app = FastAPI(
+        title=settings.APP_NAME,
+        description="A modern full-stack application backend",
+        version=settings.APP_VERSION,
+        debug=settings.DEBUG,
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
+    )
+
+    # Add CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.CORS_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Add rate limiting middleware
+    if settings.API_RATE_LIMIT_ENABLED:
+        app.middleware("http")(rate_limit_middleware)
+
+    # Add SQL statement reporting: headers in debug mode, metrics otherwise
+    if settings.DEBUG or settings.METRICS_ENABLED:
+        app.add_middleware(
+            QueryStatsMiddleware,
+            debug=settings.DEBUG,
+            n_plus_one_threshold=settings.DB_N_PLUS_ONE_THRESHOLD,
+        )
+
+    # Add metrics middleware last so it times every other middleware too
+    if settings.METRICS_ENABLED:
+        pool_collector.track("sync", engine)
+        pool_collector.track("async", async_engine.sync_engine)
+        app.add_middleware(MetricsMiddleware)
+
+    # Include API routers
+    app.include_router(users_router, prefix=settings.API_V1_STR)
+    app.include_router(auth_router, prefix=settings.API_V1_STR)
+    app.include_router(files_router, prefix=settings.API_V1_STR)
+    app.include_router(admin_router, prefix=settings.API_V1_STR)
+
+    app.add_api_route("/health", health_check, methods=["GET"], tags=["Health"])
+    if settings.METRICS_ENABLED:
+        app.add_api_route("/metrics", metrics, methods=["GET"], include_in_schema=False)
+    app.add_api_route("/", root, methods=["GET"], tags=["Root"])
+
+    return app
+
+
+# Create the FastAPI app instance
+app = create_app()
@@ -0,0 +1,67 @@
+import time
+from typing import Any, Dict, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..core.metrics import REQUEST_LATENCY, REQUESTS
+
+# Methods reported by name; anything else is counted as "other"
+KNOWN_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+
+def route_name(scope: Scope) -> str:
+    """The template of the route that handled a request, or ``unmatched``."""
+    route = scope.get("route")
+    return route.path if route is not None else "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    Records the latency and status of every HTTP request.
+
+    Requests are labelled by the template of the route that handled them
+    (``/api/v1/files/{file_id}``), or ``unmatched``, so IDs in paths never
+    become labels. It is plain ASGI middleware: the response is passed
+    through untouched, and the only per-request work is a clock read and
+    two metric updates. Labelled series are looked up once and then reused.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._latency: Dict[Tuple[str, str], Any] = {}
+        self._requests: Dict[Tuple[str, str, int], Any] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            method = scope["method"]
+            if method not in KNOWN_METHODS:
+                method = "other"
+            route = route_name(scope)
+
+            latency = self._latency.get((method, route))
+            if latency is None:
+                latency = REQUEST_LATENCY.labels(method, route)
+                self._latency[method, route] = latency
+            latency.observe(elapsed)
+
+            requests = self._requests.get((method, route, status_code))
+            if requests is None:
+                requests = REQUESTS.labels(method, route, str(status_code))
+                self._requests[method, route, status_code] = requests
+            requests.inc()
@@ -0,0 +1,77 @@
+import warnings
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..core.metrics import DB_QUERIES, DB_REPEATED_STATEMENTS, DB_TIME
+from ..db.query_stats import STATS_KEY, NPlusOneWarning, QueryStats
+from .metrics import route_name
+
+# Characters of each slow statement shown in debug headers
+HEADER_STATEMENT_LENGTH = 200
+
+
+def _stats(scope: Scope) -> Optional[QueryStats]:
+    return scope.get("state", {}).get(STATS_KEY)
+
+
+class QueryStatsMiddleware:
+    """
+    Reports the SQL statements each request ran through its sessions.
+
+    In debug mode the query count, total DB time and slowest statements are
+    sent as ``X-DB-*`` response headers; otherwise they feed the per-route
+    ``db_*`` metrics. Either way, a request that runs one statement at least
+    ``n_plus_one_threshold`` times (the signature of an N+1 query pattern)
+    raises an ``NPlusOneWarning``. Statements run while a response streams
+    are counted in the metrics but not the headers.
+    """
+
+    def __init__(
+        self, app: ASGIApp, debug: bool = False, n_plus_one_threshold: int = 10
+    ):
+        self.app = app
+        self.debug = debug
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                stats = _stats(scope)
+                if stats is not None:
+                    self.add_headers(MutableHeaders(scope=message), stats)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper if self.debug else send)
+
+        stats = _stats(scope)
+        if stats is None:
+            return
+        route = route_name(scope)
+        if not self.debug:
+            DB_QUERIES.labels(route).observe(stats.count)
+            DB_TIME.labels(route).observe(stats.seconds)
+        repeated = stats.repeated(self.n_plus_one_threshold)
+        if repeated:
+            DB_REPEATED_STATEMENTS.labels(route).inc()
+            statement, count = repeated[0]
+            warnings.warn(
+                f"{scope['method']} {route} ran one statement {count} times, "
+                f"possibly an N+1 query: {statement}",
+                NPlusOneWarning,
+                stacklevel=2,
+            )
+
+    @staticmethod
+    def add_headers(headers: MutableHeaders, stats: QueryStats) -> None:
+        """Describe the statements run so far in response headers."""
+        headers["X-DB-Query-Count"] = str(stats.count)
+        headers["X-DB-Time"] = f"{stats.seconds * 1000:.2f}ms"
+        for index, (seconds, statement) in enumerate(stats.slowest, start=1):
+            statement = " ".join(statement.split())[:HEADER_STATEMENT_LENGTH]
+            headers[f"X-DB-Slowest-{index}"] = f"{seconds * 1000:.2f}ms {statement}"
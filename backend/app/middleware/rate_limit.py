@@ -1,31 +1,83 @@
+import asyncio
+import contextlib
+import functools
+import logging
+import math
 import time
-from typing import Dict, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 
 import redis.asyncio as redis
 from fastapi import HTTPException, Request, status
 from fastapi.responses import JSONResponse
+from redis.commands.core import AsyncScript
 
 from ..core.config import settings
+from ..core.metrics import RATE_LIMIT_DECISIONS, REDIS_LATENCY
+from ..core.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Sliding-window check-and-increment in a single server-side call.
+# The estimate weights the previous window's count by how much of it still
+# overlaps the sliding window. Returns {allowed, current, previous};
+# rejected requests do not consume the window.
+RATE_LIMIT_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+if previous * tonumber(ARGV[3]) + current >= tonumber(ARGV[1]) then
+    return {0, current, previous}
+end
+current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return {1, current, previous}
+"""
+
+# Push locally admitted requests for many keys and read back global counts.
+# KEYS are (current, previous) window pairs, ARGV are (count, ttl) pairs.
+# Returns a flat list of (current, previous) counts.
+RATE_LIMIT_SYNC_SCRIPT = """
+local result = {}
+for i = 1, #KEYS, 2 do
+    local current = redis.call('INCRBY', KEYS[i], ARGV[i])
+    redis.call('EXPIRE', KEYS[i], ARGV[i + 1])
+    result[#result + 1] = current
+    result[#result + 1] = tonumber(redis.call('GET', KEYS[i + 1]) or '0')
+end
+return result
+"""
 
 
 class RateLimiter:
-    def __init__(self):
-        self.redis_client = None
+    def __init__(self, client: Optional[redis.Redis] = None):
+        self.redis_client = client
+        self._scripts: Dict[str, AsyncScript] = {}
+        self._script_client: Optional[redis.Redis] = None
         self.rate_limits = {
             "default": {"requests": 60, "window": 60},  # 60 requests per minute
             "auth": {"requests": 5, "window": 60},  # 5 auth attempts per minute
             "api": {"requests": 100, "window": 60},  # 100 API calls per minute
         }
 
-    async def get_redis_client(self):
-        if self.redis_client is None:
-            self.redis_client = redis.Redis(
-                host=settings.REDIS_HOST,
-                port=settings.REDIS_PORT,
-                password=settings.REDIS_PASSWORD,
-                decode_responses=True,
-            )
-        return self.redis_client
+    async def get_redis_client(self) -> redis.Redis:
+        """Return the explicit client, or the app-wide pooled client."""
+        return self.redis_client or redis_client.client
+
+    def _get_script(self, client: redis.Redis, source: str) -> AsyncScript:
+        if self._script_client is not client:
+            self._scripts = {}
+            self._script_client = client
+        if source not in self._scripts:
+            self._scripts[source] = client.register_script(source)
+        return self._scripts[source]
+
+    @staticmethod
+    def window_key(key: str, limit_type: str, window_start: int) -> str:
+        """Redis key holding the counter for one window."""
+        return f"rate_limit:{key}:{limit_type}:{window_start}"
 
     async def is_rate_limited(
         self, key: str, limit_type: str = "default"
@@ -34,41 +86,61 @@ class RateLimiter:
         Check if request is rate limited.
         Returns (is_limited, rate_info)
         """
-        redis_client = await self.get_redis_client()
-        limit_config = self.rate_limits[limit_type]
-
-        # Create rate limit key
-        window_key = f"rate_limit:{key}:{limit_type}:{int(time.time() // limit_config['window'])}"
-
         try:
-            # Get current count
-            current_count = await redis_client.get(window_key)
-            current_count = int(current_count) if current_count else 0
-
-            # Check if limit exceeded
-            if current_count >= limit_config["requests"]:
-                return True, {
-                    "limit": limit_config["requests"],
-                    "remaining": 0,
-                    "reset": int(time.time() // limit_config["window"] + 1)
-                    * limit_config["window"],
-                }
-
-            # Increment counter
-            await redis_client.incr(window_key)
-            await redis_client.expire(window_key, limit_config["window"])
-
-            return False, {
-                "limit": limit_config["requests"],
-                "remaining": limit_config["requests"] - current_count - 1,
-                "reset": int(time.time() // limit_config["window"] + 1)
-                * limit_config["window"],
-            }
-
+            is_limited, rate_info, _, _ = await self.check_remote(key, limit_type)
         except Exception as e:
             # If Redis is unavailable, allow request but log error
-            print(f"Rate limiting error: {e}")
+            logger.warning("Rate limiting error: %s", e)
+            RATE_LIMIT_DECISIONS.labels(limit_type, "redis", "error").inc()
             return False, {"limit": 0, "remaining": 0, "reset": 0}
+        self._record(limit_type, "redis", is_limited)
+        return is_limited, rate_info
+
+    async def check_remote(
+        self, key: str, limit_type: str
+    ) -> Tuple[bool, Dict, int, int]:
+        """
+        Run the authoritative sliding-window check in Redis.
+        Returns (is_limited, rate_info, current_count, previous_count)
+        """
+        redis_client = await self.get_redis_client()
+        limit_config = self.rate_limits[limit_type]
+        window = limit_config["window"]
+        limit = limit_config["requests"]
+
+        now = time.time()
+        window_start = int(now // window)
+        weight = 1 - (now % window) / window
+
+        started = time.perf_counter()
+        allowed, current, previous = await self._get_script(
+            redis_client, RATE_LIMIT_SCRIPT
+        )(
+            keys=[
+                self.window_key(key, limit_type, window_start),
+                self.window_key(key, limit_type, window_start - 1),
+            ],
+            args=[limit, window * 2, weight],
+        )
+        REDIS_LATENCY.labels("rate_limit_check").observe(time.perf_counter() - started)
+
+        rate_info = self._rate_info(
+            limit, window, window_start, previous * weight + current
+        )
+        return not allowed, rate_info, int(current), int(previous)
+
+    @staticmethod
+    def _record(limit_type: str, source: str, is_limited: bool) -> None:
+        decision = "limited" if is_limited else "allowed"
+        RATE_LIMIT_DECISIONS.labels(limit_type, source, decision).inc()
+
+    @staticmethod
+    def _rate_info(limit: int, window: int, window_start: int, used: float) -> Dict:
+        return {
+            "limit": limit,
+            "remaining": max(limit - math.ceil(used), 0),
+            "reset": (window_start + 1) * window,
+        }
 
     def get_client_ip(self, request: Request) -> str:
         """Extract client IP from request."""
@@ -84,18 +156,265 @@ class RateLimiter:
         return request.client.host if request.client else "unknown"
 
 
+@dataclass
+class LocalBucket:
+    """A worker's view of one client's sliding window."""
+
+    limit: int
+    window: int
+    window_start: int
+    current: int = 0  # Last known global count plus local admissions
+    previous: int = 0  # Global count of the previous window
+    tokens: int = 0  # Admissions leased from the remaining global headroom
+    pending: int = 0  # Local admissions not yet pushed to Redis
+
+
+class HybridRateLimiter(RateLimiter):
+    """
+    Two-tier rate limiter with per-worker token buckets ahead of Redis.
+
+    Each worker leases a share of a client's remaining headroom as local
+    tokens and admits requests against them without a Redis round trip.
+    Clients whose estimate is already over the limit are rejected locally.
+    Only requests close to the limit run the authoritative Redis check.
+    Local admissions are pushed to Redis in batches by a background task,
+    which also pulls back the global counts. Buckets are kept in an LRU
+    bounded by ``max_keys``.
+
+    The leased share is split between the ``workers`` processes enforcing
+    the same limits, so together they cannot overshoot a limit by more than
+    ``local_share`` of its headroom before syncing. Policies allowing fewer
+    than ``local_min_limit`` requests, such as login attempts, skip the
+    local tier and are always checked in Redis.
+    """
+
+    def __init__(
+        self,
+        client: Optional[redis.Redis] = None,
+        local_share: float = 0.5,
+        sync_interval: float = 0.25,
+        max_keys: int = 10000,
+        workers: int = 1,
+        local_min_limit: int = 50,
+    ):
+        super().__init__(client)
+        self.local_share = local_share
+        self.sync_interval = sync_interval
+        self.max_keys = max_keys
+        self.workers = max(workers, 1)
+        self.local_min_limit = local_min_limit
+        self._buckets: "OrderedDict[Tuple[str, str], LocalBucket]" = OrderedDict()
+        # Unsynced admissions from rolled-over or evicted buckets, by Redis
+        # key; bounded by max_keys while Redis is unreachable
+        self._orphans: Dict[str, Tuple[str, int, int]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the local tier and its sync task are active."""
+        return self._task is not None
+
+    def _lease(self, limit: int, used: float) -> int:
+        return max(int((limit - used) * self.local_share / self.workers), 0)
+
+    def _get_bucket(self, key: str, limit_type: str, window_start: int) -> LocalBucket:
+        bucket_key = (key, limit_type)
+        bucket = self._buckets.get(bucket_key)
+        if bucket is not None:
+            self._buckets.move_to_end(bucket_key)
+            if bucket.window_start == window_start:
+                return bucket
+            # Window rolled over; unsynced admissions still belong to the old one
+            self._orphan(key, limit_type, bucket)
+            previous = bucket.current if bucket.window_start == window_start - 1 else 0
+        else:
+            previous = 0
+
+        limit_config = self.rate_limits[limit_type]
+        bucket = LocalBucket(
+            limit=limit_config["requests"],
+            window=limit_config["window"],
+            window_start=window_start,
+            previous=previous,
+        )
+        self._buckets[bucket_key] = bucket
+        while len(self._buckets) > self.max_keys:
+            (old_key, old_type), old_bucket = self._buckets.popitem(last=False)
+            self._orphan(old_key, old_type, old_bucket)
+        return bucket
+
+    def _orphan(self, key: str, limit_type: str, bucket: LocalBucket) -> None:
+        if bucket.pending:
+            window_key = self.window_key(key, limit_type, bucket.window_start)
+            previous_key = self.window_key(key, limit_type, bucket.window_start - 1)
+            self._queue_orphan(window_key, previous_key, bucket.pending, bucket.window)
+            bucket.pending = 0
+
+    def _queue_orphan(
+        self, window_key: str, previous_key: str, count: int, window: int
+    ) -> None:
+        _, queued, _ = self._orphans.pop(window_key, ("", 0, 0))
+        self._orphans[window_key] = (previous_key, queued + count, window)
+        while len(self._orphans) > self.max_keys:
+            # Losing the oldest admissions only errs towards admitting
+            del self._orphans[next(iter(self._orphans))]
+
+    async def is_rate_limited(
+        self, key: str, limit_type: str = "default"
+    ) -> Tuple[bool, Dict]:
+        """
+        Check if request is rate limited, deciding locally when possible.
+        Returns (is_limited, rate_info)
+        """
+        limit_config = self.rate_limits[limit_type]
+        window = limit_config["window"]
+        limit = limit_config["requests"]
+        if not self.running or limit < self.local_min_limit:
+            return await super().is_rate_limited(key, limit_type)
+
+        now = time.time()
+        window_start = int(now // window)
+        weight = 1 - (now % window) / window
+        bucket = self._get_bucket(key, limit_type, window_start)
+        used = bucket.previous * weight + bucket.current
+
+        if used >= limit:
+            self._record(limit_type, "local", True)
+            return True, self._rate_info(limit, window, window_start, used)
+
+        if bucket.tokens > 0:
+            bucket.tokens -= 1
+            bucket.current += 1
+            bucket.pending += 1
+            self._record(limit_type, "local", False)
+            return False, self._rate_info(limit, window, window_start, used + 1)
+
+        # Close to the limit (or first sight of this client): ask Redis
+        try:
+            is_limited, rate_info, current, previous = await self.check_remote(
+                key, limit_type
+            )
+        except Exception as e:
+            # If Redis is unavailable, allow request but log error
+            logger.warning("Rate limiting error: %s", e)
+            RATE_LIMIT_DECISIONS.labels(limit_type, "redis", "error").inc()
+            return False, {"limit": 0, "remaining": 0, "reset": 0}
+
+        if bucket.window_start == window_start:
+            bucket.current = current + bucket.pending
+            bucket.previous = previous
+            bucket.tokens = self._lease(limit, previous * weight + bucket.current)
+        self._record(limit_type, "redis", is_limited)
+        return is_limited, rate_info
+
+    async def sync(self) -> int:
+        """Push local admissions to Redis and refresh global counts."""
+        batch: List[Tuple[str, str, int, int, Optional[LocalBucket]]] = []
+        for (key, limit_type), bucket in self._buckets.items():
+            if bucket.pending:
+                batch.append(
+                    (
+                        self.window_key(key, limit_type, bucket.window_start),
+                        self.window_key(key, limit_type, bucket.window_start - 1),
+                        bucket.pending,
+                        bucket.window,
+                        bucket,
+                    )
+                )
+                bucket.pending = 0
+        for window_key, (previous_key, count, window) in self._orphans.items():
+            batch.append((window_key, previous_key, count, window, None))
+        self._orphans = {}
+
+        if not batch:
+            return 0
+
+        keys: List[str] = []
+        args: List[int] = []
+        for window_key, previous_key, count, window, _ in batch:
+            keys += [window_key, previous_key]
+            args += [count, window * 2]
+
+        try:
+            redis_client = await self.get_redis_client()
+            started = time.perf_counter()
+            counts = await self._get_script(redis_client, RATE_LIMIT_SYNC_SCRIPT)(
+                keys=keys, args=args
+            )
+            REDIS_LATENCY.labels("rate_limit_sync").observe(
+                time.perf_counter() - started
+            )
+        except Exception as e:
+            logger.warning("Rate limit sync error: %s", e)
+            # Keep the admissions so the next sync retries them
+            for window_key, previous_key, count, window, _ in batch:
+                self._queue_orphan(window_key, previous_key, count, window)
+            return 0
+
+        now = time.time()
+        for index, (_, _, _, _, bucket) in enumerate(batch):
+            if bucket is None:
+                continue
+            weight = 1 - (now % bucket.window) / bucket.window
+            bucket.current = int(counts[index * 2]) + bucket.pending
+            bucket.previous = int(counts[index * 2 + 1])
+            bucket.tokens = self._lease(
+                bucket.limit, bucket.previous * weight + bucket.current
+            )
+        return len(batch)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            await self.sync()
+
+    def start(self) -> None:
+        """Enable the local tier and start the background sync task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the sync task and push any remaining local admissions."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        await self.sync()
+        self._buckets.clear()
+
+
+# Create shared limiter instance
+rate_limiter = HybridRateLimiter(
+    local_share=settings.RATE_LIMIT_LOCAL_SHARE,
+    sync_interval=settings.RATE_LIMIT_SYNC_INTERVAL_SECONDS,
+    max_keys=settings.RATE_LIMIT_LOCAL_MAX_KEYS,
+    workers=settings.RATE_LIMIT_WORKERS,
+    local_min_limit=settings.RATE_LIMIT_LOCAL_MIN_LIMIT,
+)
+
+
+# Endpoints that check credentials get the strict "auth" policy; other auth
+# routes (me, refresh, logout) are ordinary API calls
+CREDENTIAL_PATHS = frozenset(
+    f"{prefix}/auth/{endpoint}"
+    for prefix in ("", settings.API_V1_STR)
+    for endpoint in ("login", "register")
+)
+
+
+def get_limit_type(path: str) -> str:
+    """Determine rate limit type based on path."""
+    if path.rstrip("/") in CREDENTIAL_PATHS:
+        return "auth"
+    if path.startswith("/api"):
+        return "api"
+    return "default"
+
+
 async def rate_limit_middleware(request: Request, call_next):
     """Rate limiting middleware."""
-    rate_limiter = RateLimiter()
-
-    # Determine rate limit type based on path
-    path = request.url.path
-    if path.startswith("/auth"):
-        limit_type = "auth"
-    elif path.startswith("/api"):
-        limit_type = "api"
-    else:
-        limit_type = "default"
+    limit_type = get_limit_type(request.url.path)
 
     # Get client identifier
     client_ip = rate_limiter.get_client_ip(request)
@@ -133,7 +452,8 @@ async def rate_limit_middleware(request: Request, call_next):
 def rate_limit(limit_type: str = "default"):
     """Decorator to apply rate limiting to specific endpoints."""
 
-    async def decorator(func):
+    def decorator(func):
+        @functools.wraps(func)
         async def wrapper(*args, **kwargs):
             # Extract request from args or kwargs
             request = None
@@ -149,7 +469,6 @@ def rate_limit(limit_type: str = "default"):
                         break
 
             if request:
-                rate_limiter = RateLimiter()
                 client_ip = rate_limiter.get_client_ip(request)
                 user_id = request.headers.get("X-User-ID", "anonymous")
                 client_key = f"{client_ip}:{user_id}"
@@ -2,6 +2,7 @@
 Models package initialization.
 """
 
+from .file import FileBlob, UserFile
 from .user import User
 
-__all__ = ["User"]
+__all__ = ["FileBlob", "User", "UserFile"]
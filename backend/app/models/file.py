@@ -0,0 +1,41 @@
+"""
+Content-addressed file storage models.
+"""
+
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String
+from sqlalchemy.sql import func
+
+from ..db.database import Base
+
+
+class FileBlob(Base):
+    """A unique file body, stored once under its SHA-256."""
+
+    __tablename__ = "file_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    size = Column(BigInteger, nullable=False)
+    content_type = Column(String(100), nullable=False)
+    # Number of user files pointing at this blob
+    ref_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class UserFile(Base):
+    """A user-facing file ID pointing at a blob."""
+
+    __tablename__ = "user_files"
+    __table_args__ = (
+        # Per-user index: listing, quota sums and deletion touch only the
+        # user's own rows
+        Index("ix_user_files_user_id_created_at", "user_id", "created_at"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
+
+    id = Column(String(255), primary_key=True)
+    user_id = Column(Integer, nullable=True)
+    blob_sha256 = Column(String(64), nullable=False)
+    # Copied from the blob so quota checks need no join
+    size = Column(BigInteger, nullable=False, default=0)
+    original_filename = Column(String(255), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -2,17 +2,19 @@
 Example user model for demonstration.
 """
 
-from passlib.context import CryptContext
-from sqlalchemy import Boolean, Column, DateTime, Integer, String, Text
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, String, Text
 from sqlalchemy.sql import func
 
+from ..core.config import settings
+from ..core.hashing import password_hasher
 from ..db.database import Base
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from ..db.partitions import PARTITION_KEY, partition_on_create
 
 
 class User(Base):
     __tablename__ = "users"
+    # Fetch server-generated columns with RETURNING instead of a later SELECT
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String(255), unique=True, index=True, nullable=False)
@@ -25,16 +27,19 @@ class User(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     @staticmethod
-    def verify_password(plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(plain_password: str, hashed_password: str) -> bool:
+        """Verify a password in the hashing pool, off the event loop."""
+        return await password_hasher.verify(plain_password, hashed_password)
 
     @staticmethod
-    def get_password_hash(password: str) -> str:
-        return pwd_context.hash(password)
+    async def get_password_hash(password: str) -> str:
+        """Hash a password in the hashing pool, off the event loop."""
+        return await password_hasher.hash(password)
 
 
 class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, nullable=False)
@@ -46,6 +51,12 @@ class RefreshToken(Base):
 
 class AuditLog(Base):
     __tablename__ = "audit_logs"
+    # Range-partitioned by month on PostgreSQL
+    __table_args__ = {
+        "postgresql_partition_by": "RANGE (created_at)",
+        "info": {PARTITION_KEY: "created_at"},
+    }
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, nullable=True)
@@ -55,4 +66,14 @@ class AuditLog(Base):
     details = Column(Text, nullable=True)
     ip_address = Column(String(45), nullable=True)
     user_agent = Column(Text, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+# Indexes for the audit query API, newest entries first
+Index("ix_audit_logs_user_id_created_at", AuditLog.user_id, AuditLog.created_at.desc())
+Index("ix_audit_logs_action_created_at", AuditLog.action, AuditLog.created_at.desc())
+Index("ix_audit_logs_created_at", AuditLog.created_at.desc())
+
+partition_on_create(AuditLog.__table__, settings.AUDIT_PARTITION_MONTHS_AHEAD)
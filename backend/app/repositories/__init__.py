@@ -2,14 +2,86 @@
 Base repository pattern implementation.
 """
 
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Generic, List, Optional, TypeVar
+from contextlib import contextmanager
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+)
 
+from sqlalchemy import delete, insert, literal, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from .pagination import InvalidCursor, Page, decode_cursor, encode_cursor
+
 # Generic type for the model
 T = TypeVar("T")
 
+# Rows sent per statement by the bulk repository methods
+BULK_BATCH_SIZE = 1000
+
+# Dialect-specific INSERT constructs that support ON CONFLICT
+UPSERT_INSERTS = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+# Session.info keys used to track an open unit of work
+UNIT_OF_WORK_DEPTH = "unit_of_work_depth"
+UNIT_OF_WORK_CALLBACKS = "unit_of_work_callbacks"
+
+
+def in_unit_of_work(db: Session) -> bool:
+    """Check whether the session is inside a ``unit_of_work`` block."""
+    return db.info.get(UNIT_OF_WORK_DEPTH, 0) > 0
+
+
+def chunked(rows: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Split an iterable into lists of at most ``size`` items."""
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+@contextmanager
+def unit_of_work(db: Session) -> Iterator[Session]:
+    """
+    Group repository writes into a single transaction.
+
+    Inside the block, repository methods only flush when they need generated
+    keys, and the outermost block commits once on exit or rolls back on error.
+    Nested blocks join the enclosing one.
+    """
+    depth = db.info.get(UNIT_OF_WORK_DEPTH, 0)
+    db.info[UNIT_OF_WORK_DEPTH] = depth + 1
+    try:
+        yield db
+        if depth == 0:
+            db.commit()
+    except BaseException:
+        if depth == 0:
+            db.rollback()
+            db.info.pop(UNIT_OF_WORK_CALLBACKS, None)
+        raise
+    finally:
+        db.info[UNIT_OF_WORK_DEPTH] = depth
+
+    if depth == 0:
+        for callback in db.info.pop(UNIT_OF_WORK_CALLBACKS, []):
+            callback()
+
 
 class BaseRepository(ABC, Generic[T]):
     """
@@ -20,6 +92,32 @@ class BaseRepository(ABC, Generic[T]):
         self.db = db
         self.model = model
 
+    def _save(self, instance: Optional[T] = None, flush: bool = False) -> None:
+        """
+        Commit pending changes, or defer them to the enclosing unit of work.
+
+        Models fetch server defaults with RETURNING where the dialect supports
+        it, so the instance is only refreshed with a SELECT as a fallback.
+        """
+        if in_unit_of_work(self.db):
+            if flush:
+                self.db.flush()
+            return
+
+        self.db.commit()
+        dialect = self.db.get_bind().dialect
+        if instance is not None and not (
+            dialect.insert_returning and dialect.update_returning
+        ):
+            self.db.refresh(instance)
+
+    def _after_commit(self, callback: Callable[[], None]) -> None:
+        """Run a callback once pending changes are committed."""
+        if in_unit_of_work(self.db):
+            self.db.info.setdefault(UNIT_OF_WORK_CALLBACKS, []).append(callback)
+        else:
+            callback()
+
     def get_by_id(self, id: Any) -> Optional[T]:
         """Get an entity by its ID."""
         return self.db.query(self.model).filter(self.model.id == id).first()
@@ -32,22 +130,21 @@ class BaseRepository(ABC, Generic[T]):
         """Create a new entity."""
         instance = self.model(**kwargs)
         self.db.add(instance)
-        self.db.commit()
-        self.db.refresh(instance)
+        # Flush inside a unit of work so the caller gets the generated key
+        self._save(instance, flush=True)
         return instance
 
     def update(self, instance: T, **kwargs) -> T:
         """Update an existing entity."""
         for key, value in kwargs.items():
             setattr(instance, key, value)
-        self.db.commit()
-        self.db.refresh(instance)
+        self._save(instance)
         return instance
 
     def delete(self, instance: T) -> None:
         """Delete an entity."""
         self.db.delete(instance)
-        self.db.commit()
+        self._save()
 
     def get_by_field(self, field_name: str, value: Any) -> Optional[T]:
         """Get an entity by a specific field."""
@@ -64,3 +161,326 @@ class BaseRepository(ABC, Generic[T]):
             .filter(getattr(self.model, field_name) == value)
             .all()
         )
+
+    def _returns_ids(self) -> bool:
+        """Whether the dialect can RETURNING generated keys from executemany."""
+        return self.db.get_bind().dialect.insert_executemany_returning
+
+    def create_many(
+        self, rows: Iterable[Dict[str, Any]], batch_size: int = BULK_BATCH_SIZE
+    ) -> List[Any]:
+        """
+        Insert many entities and return their integer IDs in input order.
+
+        Rows are sent ``batch_size`` at a time as multi-row INSERTs and
+        committed once. IDs are only returned where the dialect supports
+        RETURNING for bulk inserts; otherwise an empty list is returned.
+        """
+        returns_ids = self._returns_ids()
+        # PostgreSQL returns keys in parameter order within batched INSERTs.
+        # Asking SQLite for that would send one statement per row, so its keys
+        # are sorted instead, as rowids are assigned in VALUES order.
+        ordered = self.db.get_bind().dialect.name == "postgresql"
+        ids: List[Any] = []
+        for chunk in chunked(rows, batch_size):
+            if returns_ids:
+                statement = insert(self.model).returning(
+                    self.model.id, sort_by_parameter_order=ordered
+                )
+                chunk_ids = list(self.db.scalars(statement, chunk))
+                ids.extend(chunk_ids if ordered else sorted(chunk_ids))
+            else:
+                self.db.execute(insert(self.model), chunk)
+        self._save()
+        return ids
+
+    def update_many(
+        self, rows: Iterable[Dict[str, Any]], batch_size: int = BULK_BATCH_SIZE
+    ) -> int:
+        """
+        Update many entities by primary key and return how many were sent.
+
+        Each row must include ``id``; only the other keys it carries are
+        updated. Rows are sent ``batch_size`` at a time with executemany and
+        committed once. Instances already loaded in the session are not
+        refreshed.
+        """
+        count = 0
+        for chunk in chunked(rows, batch_size):
+            self.db.execute(update(self.model), chunk)
+            count += len(chunk)
+        self._save()
+        return count
+
+    def upsert_many(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        conflict_columns: Sequence[str] = ("id",),
+        update_columns: Optional[Sequence[str]] = None,
+        batch_size: int = BULK_BATCH_SIZE,
+    ) -> List[Any]:
+        """
+        Insert many entities, updating those that already exist.
+
+        Uses ``INSERT ... ON CONFLICT (conflict_columns) DO UPDATE`` on
+        PostgreSQL and SQLite. Other dialects look up which rows already exist
+        and then insert or update them by primary key in the same
+        transaction; unlike ON CONFLICT, a concurrent insert of the same keys
+        then fails with an ``IntegrityError``. ``update_columns`` defaults to
+        every column in the first row other than the conflict columns; if
+        there are none, conflicting rows are left untouched. Returns the IDs
+        of inserted or updated rows where the dialect supports it.
+        """
+        dialect = self.db.get_bind().dialect.name
+        returns_ids = self._returns_ids()
+        ids: List[Any] = []
+        for chunk in chunked(rows, batch_size):
+            columns = update_columns
+            if columns is None:
+                columns = [key for key in chunk[0] if key not in conflict_columns]
+
+            if dialect not in UPSERT_INSERTS:
+                ids.extend(
+                    self._upsert_by_lookup(
+                        chunk, conflict_columns, columns, returns_ids
+                    )
+                )
+                continue
+
+            statement = UPSERT_INSERTS[dialect](self.model)
+            if columns:
+                set_ = {column: statement.excluded[column] for column in columns}
+                # Keep server-side ``onupdate`` timestamps current on updates
+                for column in self.model.__table__.columns:
+                    onupdate = column.onupdate
+                    if onupdate is not None and onupdate.is_clause_element:
+                        set_.setdefault(column.name, onupdate.arg)
+                statement = statement.on_conflict_do_update(
+                    index_elements=list(conflict_columns), set_=set_
+                )
+            else:
+                statement = statement.on_conflict_do_nothing(
+                    index_elements=list(conflict_columns)
+                )
+
+            if returns_ids:
+                ids.extend(self.db.scalars(statement.returning(self.model.id), chunk))
+            else:
+                self.db.execute(statement, chunk)
+        self._save()
+        return ids
+
+    def _upsert_by_lookup(
+        self,
+        chunk: List[Dict[str, Any]],
+        conflict_columns: Sequence[str],
+        update_columns: Sequence[str],
+        returns_ids: bool,
+    ) -> List[Any]:
+        """Upsert one batch without ON CONFLICT, by finding existing rows first."""
+        keys = [self.model.__table__.c[name] for name in conflict_columns]
+        values = [tuple(row[name] for name in conflict_columns) for row in chunk]
+        if len(keys) == 1:
+            where = keys[0].in_([value for (value,) in values])
+        else:
+            where = tuple_(*keys).in_(values)
+        existing = {
+            tuple(found[1:]): found[0]
+            for found in self.db.execute(select(self.model.id, *keys).where(where))
+        }
+
+        new_rows, updates = [], []
+        for row, value in zip(chunk, values, strict=True):
+            if value not in existing:
+                new_rows.append(row)
+            elif update_columns:
+                updates.append(
+                    {"id": existing[value]}
+                    | {column: row[column] for column in update_columns}
+                )
+
+        ids: List[Any] = []
+        if new_rows:
+            if returns_ids:
+                statement = insert(self.model).returning(self.model.id)
+                ids.extend(self.db.scalars(statement, new_rows))
+            else:
+                self.db.execute(insert(self.model), new_rows)
+        if updates:
+            self.db.execute(update(self.model), updates)
+            if returns_ids:
+                ids.extend(row["id"] for row in updates)
+        return ids
+
+    def delete_where(
+        self,
+        *criteria: Any,
+        batch_size: Optional[int] = None,
+        pause: float = 0.0,
+    ) -> int:
+        """
+        Delete all entities matching ``criteria`` and return how many went.
+
+        With ``batch_size``, rows are removed ``batch_size`` at a time with
+        ``DELETE ... WHERE id IN (SELECT id ... LIMIT n)``, committing after
+        each batch outside a unit of work, so large deletes hold locks
+        briefly; ``pause`` seconds between batches throttles them further.
+        Instances already loaded in the session are not expunged.
+        """
+        if batch_size is None:
+            result = self.db.execute(
+                delete(self.model)
+                .where(*criteria)
+                .execution_options(synchronize_session=False)
+            )
+            self._save()
+            return result.rowcount
+
+        deleted = 0
+        while True:
+            batch = (
+                select(self.model.id).where(*criteria).limit(batch_size)
+            ).scalar_subquery()
+            result = self.db.execute(
+                delete(self.model)
+                .where(self.model.id.in_(batch))
+                .execution_options(synchronize_session=False)
+            )
+            self._save()
+            deleted += result.rowcount
+            if result.rowcount < batch_size:
+                return deleted
+            if pause:
+                time.sleep(pause)
+
+    def _sort_columns(self, sort: str) -> List[Any]:
+        """Sort column plus the primary key as a unique tie-breaker."""
+        column = getattr(self.model, sort)
+        return [column] if column is self.model.id else [column, self.model.id]
+
+    def _ordered(self, sort: str, descending: bool, filters: Sequence[Any]):
+        columns = self._sort_columns(sort)
+        query = select(self.model).where(*filters)
+        return columns, query.order_by(
+            *(column.desc() if descending else column.asc() for column in columns)
+        )
+
+    def paginate(
+        self,
+        cursor: Optional[str] = None,
+        sort: str = "id",
+        page_size: int = 50,
+        descending: bool = False,
+        filters: Sequence[Any] = (),
+    ) -> Page[T]:
+        """
+        Get one page of entities using keyset (seek) pagination.
+
+        Rows are ordered by ``sort`` with the primary key as a tie-breaker,
+        and each page seeks past the last row of the previous one instead of
+        using OFFSET, so deep pages cost the same as the first. ``cursor`` is
+        the ``next_cursor`` of the previous page.
+        """
+        columns, query = self._ordered(sort, descending, filters)
+
+        if cursor is not None:
+            values = decode_cursor(cursor, sort, descending)
+            if len(values) != len(columns):
+                raise InvalidCursor("Malformed cursor")
+            key = tuple_(*columns)
+            bound = tuple_(
+                *(
+                    literal(value, column.type)
+                    for value, column in zip(values, columns, strict=True)
+                )
+            )
+            query = query.where(key < bound if descending else key > bound)
+
+        # Fetch one extra row to learn whether another page follows
+        items = list(self.db.scalars(query.limit(page_size + 1)))
+        if len(items) <= page_size:
+            return Page(items=items)
+
+        items = items[:page_size]
+        last = items[-1]
+        next_cursor = encode_cursor(
+            sort, descending, [getattr(last, column.key) for column in columns]
+        )
+        return Page(items=items, next_cursor=next_cursor)
+
+    def stream(
+        self,
+        sort: str = "id",
+        descending: bool = False,
+        filters: Sequence[Any] = (),
+        batch_size: int = 1000,
+    ) -> Iterator[List[T]]:
+        """
+        Iterate over entities in batches without loading them all at once.
+
+        Uses ``yield_per``, which streams rows through a server-side cursor on
+        drivers that support one, so at most one batch is held in memory.
+        """
+        _, query = self._ordered(sort, descending, filters)
+        result = self.db.scalars(query.execution_options(yield_per=batch_size))
+        for batch in result.partitions():
+            yield batch
+            # Let the batch be garbage collected before fetching the next
+            for instance in batch:
+                self.db.expunge(instance)
+
+
+class AsyncBaseRepository(ABC, Generic[T]):
+    """
+    Abstract base repository class providing common CRUD operations on an
+    ``AsyncSession``.
+    """
+
+    def __init__(self, db: AsyncSession, model: type[T]):
+        self.db = db
+        self.model = model
+
+    async def get_by_id(self, id: Any) -> Optional[T]:
+        """Get an entity by its ID."""
+        result = await self.db.execute(select(self.model).where(self.model.id == id))
+        return result.scalars().first()
+
+    async def get_all(self) -> List[T]:
+        """Get all entities."""
+        result = await self.db.execute(select(self.model))
+        return list(result.scalars().all())
+
+    async def create(self, **kwargs) -> T:
+        """Create a new entity."""
+        instance = self.model(**kwargs)
+        self.db.add(instance)
+        await self.db.commit()
+        await self.db.refresh(instance)
+        return instance
+
+    async def update(self, instance: T, **kwargs) -> T:
+        """Update an existing entity."""
+        for key, value in kwargs.items():
+            setattr(instance, key, value)
+        await self.db.commit()
+        await self.db.refresh(instance)
+        return instance
+
+    async def delete(self, instance: T) -> None:
+        """Delete an entity."""
+        await self.db.delete(instance)
+        await self.db.commit()
+
+    async def get_by_field(self, field_name: str, value: Any) -> Optional[T]:
+        """Get an entity by a specific field."""
+        result = await self.db.execute(
+            select(self.model).where(getattr(self.model, field_name) == value)
+        )
+        return result.scalars().first()
+
+    async def get_many_by_field(self, field_name: str, value: Any) -> List[T]:
+        """Get multiple entities by a specific field."""
+        result = await self.db.execute(
+            select(self.model).where(getattr(self.model, field_name) == value)
+        )
+        return list(result.scalars().all())
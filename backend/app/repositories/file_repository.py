@@ -0,0 +1,164 @@
+"""
+File repository for the content-addressed upload index.
+"""
+
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.file import FileBlob, UserFile
+from . import AsyncBaseRepository
+
+
+class AsyncFileRepository(AsyncBaseRepository[UserFile]):
+    """Async repository mapping user-facing file IDs to reference-counted blobs."""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(db, UserFile)
+
+    async def get_with_blob(self, file_id: str) -> Optional[Tuple[UserFile, FileBlob]]:
+        """Get a user file together with the blob it points at."""
+        result = await self.db.execute(
+            select(UserFile, FileBlob)
+            .join(FileBlob, FileBlob.sha256 == UserFile.blob_sha256)
+            .where(UserFile.id == file_id)
+        )
+        row = result.first()
+        return (row[0], row[1]) if row else None
+
+    async def get_by_user(
+        self, user_id: int, limit: Optional[int] = None
+    ) -> List[UserFile]:
+        """Get a user's files, newest first."""
+        result = await self.db.execute(
+            select(UserFile)
+            .where(UserFile.user_id == user_id)
+            .order_by(UserFile.created_at.desc())
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def list_by_user(
+        self, user_id: int, limit: Optional[int] = None
+    ) -> List[Tuple[UserFile, str]]:
+        """Get a user's files with their content types, newest first."""
+        result = await self.db.execute(
+            select(UserFile, FileBlob.content_type)
+            .join(FileBlob, FileBlob.sha256 == UserFile.blob_sha256)
+            .where(UserFile.user_id == user_id)
+            .order_by(UserFile.created_at.desc())
+            .limit(limit)
+        )
+        return [(row[0], row[1]) for row in result.all()]
+
+    async def get_usage(self, user_id: int) -> int:
+        """Total bytes stored by a user, counting shared blobs per file."""
+        result = await self.db.execute(
+            select(func.coalesce(func.sum(UserFile.size), 0)).where(
+                UserFile.user_id == user_id
+            )
+        )
+        return int(result.scalar_one())
+
+    async def add_reference(
+        self,
+        file_id: str,
+        sha256: str,
+        size: int,
+        content_type: str,
+        user_id: Optional[int] = None,
+        original_filename: Optional[str] = None,
+    ) -> bool:
+        """
+        Record a user file pointing at a blob.
+
+        Returns True if this is the blob's first reference. The reference
+        count is bumped with a single UPDATE, and the blob row is only
+        inserted when that matches nothing; if a concurrent upload of the
+        same content inserts it first, the increment is retried.
+        """
+        for attempt in range(2):
+            self.db.add(
+                UserFile(
+                    id=file_id,
+                    user_id=user_id,
+                    blob_sha256=sha256,
+                    size=size,
+                    original_filename=original_filename,
+                )
+            )
+            result = await self.db.execute(
+                update(FileBlob)
+                .where(FileBlob.sha256 == sha256)
+                .values(ref_count=FileBlob.ref_count + 1)
+            )
+            created = result.rowcount == 0
+            if created:
+                self.db.add(
+                    FileBlob(
+                        sha256=sha256,
+                        size=size,
+                        content_type=content_type,
+                        ref_count=1,
+                    )
+                )
+            try:
+                await self.db.commit()
+                return created
+            except IntegrityError:
+                await self.db.rollback()
+                if not created or attempt:
+                    raise
+        return False
+
+    async def blob_exists(self, sha256: str) -> bool:
+        """Whether a blob row exists, i.e. something still references it."""
+        result = await self.db.execute(
+            select(FileBlob.sha256).where(FileBlob.sha256 == sha256)
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def remove_references(self, files: List[UserFile]) -> List[str]:
+        """
+        Delete user files and return the hashes of blobs left unreferenced.
+
+        Orphaned blob rows are deleted in the same transaction; removing the
+        blob bodies from storage is left to the caller.
+        """
+        by_blob: Dict[str, List[str]] = defaultdict(list)
+        for user_file in files:
+            by_blob[user_file.blob_sha256].append(user_file.id)
+        if not by_blob:
+            return []
+
+        for sha256, file_ids in by_blob.items():
+            result = await self.db.execute(
+                delete(UserFile)
+                .where(UserFile.id.in_(file_ids))
+                .execution_options(synchronize_session=False)
+            )
+            # Only count rows this call actually removed
+            if result.rowcount:
+                await self.db.execute(
+                    update(FileBlob)
+                    .where(FileBlob.sha256 == sha256)
+                    .values(ref_count=FileBlob.ref_count - result.rowcount)
+                )
+
+        result = await self.db.execute(
+            select(FileBlob.sha256).where(
+                FileBlob.sha256.in_(list(by_blob)), FileBlob.ref_count <= 0
+            )
+        )
+        orphaned = list(result.scalars().all())
+        if orphaned:
+            await self.db.execute(
+                delete(FileBlob)
+                .where(FileBlob.sha256.in_(orphaned), FileBlob.ref_count <= 0)
+                .execution_options(synchronize_session=False)
+            )
+        await self.db.commit()
+        return orphaned
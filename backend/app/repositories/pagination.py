@@ -0,0 +1,61 @@
+"""
+Keyset pagination primitives.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor token is malformed or was issued for another sort."""
+
+
+@dataclass
+class Page(Generic[T]):
+    """One page of results and the cursor for the next one."""
+
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(sort: str, descending: bool, values: Sequence[Any]) -> str:
+    """Encode the sort key of the last row seen as an opaque token."""
+    payload = {
+        "s": sort,
+        "d": descending,
+        "v": [_encode_value(value) for value in values],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(token: str, sort: str, descending: bool) -> Tuple[Any, ...]:
+    """Decode a cursor token, checking it matches the requested ordering."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        values = tuple(_decode_value(value) for value in payload["v"])
+        matches = payload["s"] == sort and payload["d"] == descending
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor("Malformed cursor") from e
+    if not matches:
+        raise InvalidCursor("Cursor was issued for a different sort order")
+    return values
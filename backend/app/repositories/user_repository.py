@@ -2,15 +2,32 @@
 User repository for database operations.
 """
 
+import io
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Iterable, List, Optional
 
-from sqlalchemy import or_
+from sqlalchemy import insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from ..core.identity_cache import identity_cache
 from ..models.user import AuditLog, RefreshToken, User
 from ..schemas.user import UserCreate
-from . import BaseRepository
+from . import AsyncBaseRepository, BaseRepository
+from .pagination import Page
+
+
+def _copy_value(value: Any) -> str:
+    """Encode a value for COPY's text format."""
+    if value is None:
+        return "\\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
 
 
 class UserRepository(BaseRepository[User]):
@@ -19,6 +36,43 @@ class UserRepository(BaseRepository[User]):
     def __init__(self, db: Session):
         super().__init__(db, User)
 
+    def update(self, instance: User, **kwargs) -> User:
+        """Update a user and drop its cached identity."""
+        user = super().update(instance, **kwargs)
+        self._after_commit(lambda: identity_cache.invalidate(user.id))
+        return user
+
+    def delete(self, instance: User) -> None:
+        """Delete a user and drop its cached identity."""
+        user_id = instance.id
+        super().delete(instance)
+        self._after_commit(lambda: identity_cache.invalidate(user_id))
+
+    def update_many(self, rows: Iterable[Dict[str, Any]], **kwargs) -> int:
+        """Update many users and drop their cached identities."""
+        rows = list(rows)
+        count = super().update_many(rows, **kwargs)
+        user_ids = [row["id"] for row in rows]
+
+        def invalidate() -> None:
+            for user_id in user_ids:
+                identity_cache.invalidate(user_id)
+
+        self._after_commit(invalidate)
+        return count
+
+    def upsert_many(self, rows: Iterable[Dict[str, Any]], **kwargs) -> List[Any]:
+        """Upsert many users and drop the identity cache."""
+        ids = super().upsert_many(rows, **kwargs)
+        self._after_commit(identity_cache.clear)
+        return ids
+
+    def delete_where(self, *criteria: Any, **kwargs) -> int:
+        """Delete matching users and drop the identity cache."""
+        deleted = super().delete_where(*criteria, **kwargs)
+        self._after_commit(identity_cache.clear)
+        return deleted
+
     def get_by_username(self, username: str) -> Optional[User]:
         """Get user by username."""
         return self.get_by_field("username", username)
@@ -52,11 +106,9 @@ class UserRepository(BaseRepository[User]):
             hashed_password=hashed_password,
             full_name=user_data.full_name,
             is_active=user_data.is_active,
-            is_superuser=user_data.is_superuser,
         )
         self.db.add(user)
-        self.db.commit()
-        self.db.refresh(user)
+        self._save(user, flush=True)
         return user
 
     def get_active_user_by_id(self, user_id: int) -> Optional[User]:
@@ -65,11 +117,90 @@ class UserRepository(BaseRepository[User]):
 
     def update_last_login(self, user: User) -> User:
         """Update user's last login timestamp."""
-        user.updated_at = datetime.utcnow()
-        self.db.commit()
-        self.db.refresh(user)
+        return self.update(user, updated_at=datetime.utcnow())
+
+    def update_password(self, user: User, hashed_password: str) -> User:
+        """Replace a user's password hash."""
+        return self.update(user, hashed_password=hashed_password)
+
+    def deactivate(self, user: User) -> User:
+        """Mark a user as inactive."""
+        return self.update(user, is_active=False)
+
+
+class AsyncUserRepository(AsyncBaseRepository[User]):
+    """Async repository for User model with specialized database operations."""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(db, User)
+
+    async def update(self, instance: User, **kwargs) -> User:
+        """Update a user and drop its cached identity once committed."""
+        user = await super().update(instance, **kwargs)
+        identity_cache.invalidate(user.id)
         return user
 
+    async def delete(self, instance: User) -> None:
+        """Delete a user and drop its cached identity once committed."""
+        user_id = instance.id
+        await super().delete(instance)
+        identity_cache.invalidate(user_id)
+
+    async def get_by_username(self, username: str) -> Optional[User]:
+        """Get user by username."""
+        return await self.get_by_field("username", username)
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        """Get user by email."""
+        return await self.get_by_field("email", email)
+
+    async def get_by_username_or_email(self, identifier: str) -> Optional[User]:
+        """Get user by username or email."""
+        result = await self.db.execute(
+            select(User).where(
+                or_(User.username == identifier, User.email == identifier)
+            )
+        )
+        return result.scalars().first()
+
+    async def user_exists(self, username: str, email: str) -> bool:
+        """Check if user exists by username or email."""
+        result = await self.db.execute(
+            select(User.id)
+            .where(or_(User.username == username, User.email == email))
+            .limit(1)
+        )
+        return result.first() is not None
+
+    async def create_user(self, user_data: UserCreate, hashed_password: str) -> User:
+        """Create a new user with hashed password."""
+        return await self.create(
+            email=user_data.email,
+            username=user_data.username,
+            hashed_password=hashed_password,
+            full_name=user_data.full_name,
+            is_active=user_data.is_active,
+        )
+
+    async def get_active_user_by_id(self, user_id: int) -> Optional[User]:
+        """Get active user by ID."""
+        result = await self.db.execute(
+            select(User).where(User.id == user_id, User.is_active)
+        )
+        return result.scalars().first()
+
+    async def update_last_login(self, user: User) -> User:
+        """Update user's last login timestamp."""
+        return await self.update(user, updated_at=datetime.utcnow())
+
+    async def update_password(self, user: User, hashed_password: str) -> User:
+        """Replace a user's password hash."""
+        return await self.update(user, hashed_password=hashed_password)
+
+    async def deactivate(self, user: User) -> User:
+        """Mark a user as inactive."""
+        return await self.update(user, is_active=False)
+
 
 class RefreshTokenRepository(BaseRepository[RefreshToken]):
     """Repository for RefreshToken model."""
@@ -85,8 +216,7 @@ class RefreshTokenRepository(BaseRepository[RefreshToken]):
             user_id=user_id, token=token, expires_at=expires_at
         )
         self.db.add(refresh_token)
-        self.db.commit()
-        self.db.refresh(refresh_token)
+        self._save(refresh_token)
         return refresh_token
 
     def get_valid_token(self, token: str) -> Optional[RefreshToken]:
@@ -95,7 +225,7 @@ class RefreshTokenRepository(BaseRepository[RefreshToken]):
             self.db.query(RefreshToken)
             .filter(
                 RefreshToken.token == token,
-                not RefreshToken.is_revoked,
+                RefreshToken.is_revoked.is_(False),
                 RefreshToken.expires_at > datetime.utcnow(),
             )
             .first()
@@ -104,21 +234,42 @@ class RefreshTokenRepository(BaseRepository[RefreshToken]):
     def revoke_token(self, token: str) -> bool:
         """Revoke a refresh token."""
         db_token = (
-            self.db.query(RefreshToken).filter(RefreshToken.token == token).first()
+            self.db.query(RefreshToken)
+            .filter(RefreshToken.token == token, RefreshToken.is_revoked.is_(False))
+            .first()
         )
 
         if db_token:
             db_token.is_revoked = True
-            self.db.commit()
+            self._save()
             return True
         return False
 
-    def revoke_all_user_tokens(self, user_id: int) -> None:
+    def revoke_all_user_tokens(self, user_id: int) -> int:
         """Revoke all refresh tokens for a user."""
-        self.db.query(RefreshToken).filter(
-            RefreshToken.user_id == user_id, not RefreshToken.is_revoked
-        ).update({"is_revoked": True})
-        self.db.commit()
+        count = (
+            self.db.query(RefreshToken)
+            .filter(RefreshToken.user_id == user_id, RefreshToken.is_revoked.is_(False))
+            .update({"is_revoked": True})
+        )
+        self._save()
+        return count
+
+    def delete_expired(
+        self,
+        before: Optional[datetime] = None,
+        batch_size: Optional[int] = None,
+        pause: float = 0.0,
+    ) -> int:
+        """Delete revoked tokens and tokens expired before ``before`` (now)."""
+        return self.delete_where(
+            or_(
+                RefreshToken.expires_at <= (before or datetime.utcnow()),
+                RefreshToken.is_revoked.is_(True),
+            ),
+            batch_size=batch_size,
+            pause=pause,
+        )
 
 
 class AuditLogRepository(BaseRepository[AuditLog]):
@@ -148,10 +299,41 @@ class AuditLogRepository(BaseRepository[AuditLog]):
             user_agent=user_agent,
         )
         self.db.add(audit_log)
-        self.db.commit()
-        self.db.refresh(audit_log)
+        self._save(audit_log)
         return audit_log
 
+    def bulk_create_audit_logs(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert many audit log entries in a single transaction."""
+        if not rows:
+            return 0
+
+        dialect = self.db.get_bind().dialect
+        if dialect.name == "postgresql" and dialect.driver == "psycopg2":
+            self._copy_audit_logs(rows)
+        else:
+            # executemany; SQLAlchemy batches this into multi-row INSERTs
+            self.db.execute(insert(AuditLog), rows)
+        self._save()
+        return len(rows)
+
+    def _copy_audit_logs(self, rows: List[Dict[str, Any]]) -> None:
+        """Stream rows into audit_logs with COPY."""
+        columns = list(rows[0].keys())
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write("\t".join(_copy_value(row[column]) for column in columns))
+            buffer.write("\n")
+        buffer.seek(0)
+
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {AuditLog.__tablename__} ({', '.join(columns)}) " "FROM STDIN",
+                buffer,
+            )
+        finally:
+            cursor.close()
+
     def get_user_audit_logs(self, user_id: int, limit: int = 100):
         """Get audit logs for a specific user."""
         return (
@@ -161,3 +343,42 @@ class AuditLogRepository(BaseRepository[AuditLog]):
             .limit(limit)
             .all()
         )
+
+    @staticmethod
+    def audit_filters(
+        user_id: Optional[int] = None,
+        action: Optional[str] = None,
+        resource: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> List[Any]:
+        """
+        Build filter criteria for audit log queries.
+
+        A time range lets PostgreSQL prune partitions outside it; ``until``
+        is exclusive.
+        """
+        criteria = []
+        if user_id is not None:
+            criteria.append(AuditLog.user_id == user_id)
+        if action is not None:
+            criteria.append(AuditLog.action == action)
+        if resource is not None:
+            criteria.append(AuditLog.resource == resource)
+        if since is not None:
+            criteria.append(AuditLog.created_at >= since)
+        if until is not None:
+            criteria.append(AuditLog.created_at < until)
+        return criteria
+
+    def search(
+        self, cursor: Optional[str] = None, page_size: int = 50, **filters: Any
+    ) -> Page[AuditLog]:
+        """Get one page of matching audit logs, newest first."""
+        return self.paginate(
+            cursor=cursor,
+            sort="created_at",
+            descending=True,
+            page_size=page_size,
+            filters=self.audit_filters(**filters),
+        )
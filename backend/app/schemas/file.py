@@ -0,0 +1,27 @@
+"""
+Pydantic schemas for uploaded files.
+"""
+
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class FileInfo(BaseModel):
+    """Schema for an uploaded file in a listing."""
+
+    id: str
+    original_filename: Optional[str] = None
+    content_type: str
+    size: int
+    url: str
+    created_at: Optional[datetime] = None
+
+
+class FileList(BaseModel):
+    """Schema for a user's files and storage usage."""
+
+    files: List[FileInfo]
+    usage: int
+    quota: Optional[int] = None
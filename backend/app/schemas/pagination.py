@@ -0,0 +1,16 @@
+"""
+Pydantic schemas for paginated responses.
+"""
+
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """Schema for one page of a keyset-paginated listing."""
+
+    items: List[T]
+    next_cursor: Optional[str] = None
@@ -7,6 +7,8 @@ from typing import Optional
 
 from pydantic import BaseModel, EmailStr
 
+from ..core.serialization import ORMSerializer
+
 
 class UserBase(BaseModel):
     """Base user schema."""
@@ -20,6 +22,7 @@ class UserCreate(UserBase):
     """Schema for creating a new user."""
 
     password: str
+    full_name: Optional[str] = None
 
 
 class UserUpdate(BaseModel):
@@ -61,9 +64,35 @@ class Token(BaseModel):
 
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None
 
 
 class TokenData(BaseModel):
     """Schema for token data."""
 
     username: Optional[str] = None
+    user_id: Optional[int] = None
+
+
+class AuditLog(BaseModel):
+    """Schema for audit log response."""
+
+    id: int
+    user_id: Optional[int] = None
+    action: str
+    resource: str
+    resource_id: Optional[str] = None
+    details: Optional[str] = None
+    ip_address: Optional[str] = None
+    user_agent: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+# Serializers encoding trusted rows without per-object validation
+user_serializer = ORMSerializer(User)
+token_serializer = ORMSerializer(Token)
+audit_log_serializer = ORMSerializer(AuditLog)
@@ -0,0 +1,182 @@
+"""
+Write-behind audit log pipeline.
+"""
+
+import asyncio
+import contextlib
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..db.database import SessionLocal, engine
+from ..db.partitions import PartitionMaintainer
+from ..models.user import AuditLog
+from ..repositories.user_repository import AuditLogRepository
+
+logger = logging.getLogger(__name__)
+
+
+class AuditSink:
+    """
+    Buffers audit events in memory and writes them in batches.
+
+    A background task flushes the buffer every ``flush_interval`` seconds, or
+    as soon as ``batch_size`` events are waiting. If the writer falls behind
+    and ``max_buffer`` events pile up, new events are dropped and counted in
+    ``dropped`` rather than blocking the caller on a database write, so memory
+    stays bounded. When the sink is not running (scripts, tests), events are
+    written immediately.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_buffer: int = 10000,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.session_factory = session_factory
+        self.written = 0
+        self.failed = 0
+        self.dropped = 0
+        self._dropping = False
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the background flush task is active."""
+        return self._task is not None
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered events not yet written."""
+        return len(self._buffer)
+
+    def emit(
+        self,
+        user_id: Optional[int],
+        action: str,
+        resource: str,
+        resource_id: Optional[str] = None,
+        details: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None,
+    ) -> None:
+        """Queue an audit event for writing."""
+        event = {
+            "user_id": user_id,
+            "action": action,
+            "resource": resource,
+            "resource_id": resource_id,
+            "details": details,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "created_at": datetime.now(timezone.utc),
+        }
+
+        if not self.running:
+            if not self._write([event]):
+                logger.warning(
+                    "Audit event %s for user %s was not recorded", action, user_id
+                )
+            return
+
+        with self._lock:
+            full = len(self._buffer) >= self.max_buffer
+            first_drop = full and not self._dropping
+            if full:
+                self.dropped += 1
+                self._dropping = True
+            else:
+                self._buffer.append(event)
+            pending = len(self._buffer)
+
+        if first_drop:
+            # Backpressure: the writer fell behind, so shed events, logging
+            # the first drop after each successful flush
+            logger.warning(
+                "Audit buffer full, dropping events until the next flush "
+                "(%d dropped so far)",
+                self.dropped,
+            )
+        if full or pending >= self.batch_size:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def flush(self) -> int:
+        """Write all buffered events and return how many were written."""
+        with self._lock:
+            events, self._buffer = self._buffer, []
+
+        stored = [
+            self._write(events[start : start + self.batch_size])
+            for start in range(0, len(events), self.batch_size)
+        ]
+        if all(stored):
+            with self._lock:
+                self._dropping = False
+        return len(events)
+
+    def _write(self, events: List[Dict[str, Any]]) -> bool:
+        """Write a batch of events, returning whether it was stored."""
+        with self._write_lock:
+            db = self.session_factory()
+            try:
+                self.written += AuditLogRepository(db).bulk_create_audit_logs(events)
+                return True
+            except Exception:
+                db.rollback()
+                self.failed += len(events)
+                logger.exception("Failed to write %d audit events", len(events))
+                return False
+            finally:
+                db.close()
+
+    async def _run(self) -> None:
+        while True:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            self._wakeup.clear()
+            await asyncio.to_thread(self.flush)
+
+    def start(self) -> None:
+        """Start the background flush task on the running event loop."""
+        if self._task is None:
+            self._loop = asyncio.get_running_loop()
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task and write any remaining events."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        await asyncio.to_thread(self.flush)
+
+
+# Create sink instance
+audit_sink = AuditSink(
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+    max_buffer=settings.AUDIT_MAX_BUFFER,
+)
+
+# Keep monthly audit log partitions created ahead of time
+audit_partitions = PartitionMaintainer(
+    engine,
+    [AuditLog.__table__],
+    months_ahead=settings.AUDIT_PARTITION_MONTHS_AHEAD,
+)
@@ -5,20 +5,20 @@ from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 
 from ..core.config import settings
+from ..core.hashing import password_hasher
+from ..core.identity_cache import CachedUser, identity_cache
+from ..core.token_cache import token_cache
 from ..db.database import get_db
 from ..models.user import User
-from ..repositories.user_repository import (
-    AuditLogRepository,
-    RefreshTokenRepository,
-    UserRepository,
-)
+from ..repositories import unit_of_work
+from ..repositories.user_repository import AuditLogRepository, UserRepository
 from ..schemas.user import TokenData, UserCreate
+from .audit import audit_sink
+from .refresh_tokens import refresh_token_store
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 
 
@@ -26,7 +26,7 @@ class AuthService:
     def __init__(self, db: Session):
         self.db = db
         self.user_repo = UserRepository(db)
-        self.refresh_token_repo = RefreshTokenRepository(db)
+        self.refresh_tokens = refresh_token_store
         self.audit_repo = AuditLogRepository(db)
 
         self.secret_key = settings.SECRET_KEY
@@ -34,11 +34,11 @@ class AuthService:
         self.access_token_expire_minutes = settings.ACCESS_TOKEN_EXPIRE_MINUTES
         self.refresh_token_expire_days = settings.REFRESH_TOKEN_EXPIRE_DAYS
 
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return await password_hasher.verify(plain_password, hashed_password)
 
-    def get_password_hash(self, password: str) -> str:
-        return pwd_context.hash(password)
+    async def get_password_hash(self, password: str) -> str:
+        return await password_hasher.hash(password)
 
     def create_access_token(
         self, data: dict, expires_delta: Optional[timedelta] = None
@@ -55,19 +55,20 @@ class AuthService:
         encoded_jwt = jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
         return encoded_jwt
 
-    def create_refresh_token(self, user_id: int) -> str:
+    async def create_refresh_token(self, user_id: int) -> str:
         # Generate a random refresh token
         refresh_token = secrets.token_urlsafe(32)
 
-        # Store refresh token in database
-        expires_at = datetime.utcnow() + timedelta(days=self.refresh_token_expire_days)
-        self.refresh_token_repo.create_refresh_token(user_id, refresh_token, expires_at)
+        # Store refresh token until it expires, in this session's transaction
+        # when the store is the database
+        ttl = int(timedelta(days=self.refresh_token_expire_days).total_seconds())
+        await self.refresh_tokens.add(refresh_token, user_id, ttl, db=self.db)
 
         return refresh_token
 
     def verify_token(self, token: str) -> Optional[TokenData]:
         try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+            payload = token_cache.decode(token, self.secret_key, self.algorithm)
             username: str = payload.get("sub")
             user_id: int = payload.get("user_id")
             if username is None or user_id is None:
@@ -76,23 +77,28 @@ class AuthService:
         except JWTError:
             return None
 
-    def authenticate_user(self, username: str, password: str) -> Optional[User]:
+    async def authenticate_user(self, username: str, password: str) -> Optional[User]:
         user = self.user_repo.get_by_username(username)
-        if not user or not self.verify_password(password, user.hashed_password):
+        if not user or not await self.verify_password(password, user.hashed_password):
             return None
         return user
 
-    def get_current_user(self, token: str) -> Optional[User]:
+    def get_current_user(self, token: str) -> Optional[CachedUser]:
         token_data = self.verify_token(token)
         if token_data is None:
             return None
 
+        cached_user = identity_cache.get(token_data.user_id)
+        if cached_user is not None:
+            return cached_user
+
+        generation = identity_cache.generation
         user = self.user_repo.get_by_id(token_data.user_id)
         if user is None:
             return None
-        return user
+        return identity_cache.set(user, generation)
 
-    def create_user(self, user: UserCreate) -> User:
+    async def create_user(self, user: UserCreate) -> User:
         # Check if user already exists
         if self.user_repo.user_exists(user.username, user.email):
             raise HTTPException(
@@ -101,11 +107,12 @@ class AuthService:
             )
 
         # Create new user
-        hashed_password = self.get_password_hash(user.password)
-        db_user = self.user_repo.create_user(user, hashed_password)
+        hashed_password = await self.get_password_hash(user.password)
+        with unit_of_work(self.db):
+            db_user = self.user_repo.create_user(user, hashed_password)
 
-        # Log user creation
-        self.audit_repo.create_audit_log(
+        # Log user creation once it is committed
+        audit_sink.emit(
             user_id=db_user.id,
             action="USER_CREATED",
             resource="user",
@@ -115,14 +122,14 @@ class AuthService:
 
         return db_user
 
-    def login_user(
+    async def login_user(
         self,
         username: str,
         password: str,
         ip_address: Optional[str] = None,
         user_agent: Optional[str] = None,
     ) -> dict:
-        user = self.authenticate_user(username, password)
+        user = await self.authenticate_user(username, password)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -135,17 +142,16 @@ class AuthService:
                 status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user"
             )
 
-        # Create tokens
+        # Create tokens and update last login in one transaction
         access_token = self.create_access_token(
             data={"sub": user.username, "user_id": user.id}
         )
-        refresh_token = self.create_refresh_token(user.id)
-
-        # Update last login
-        self.user_repo.update_last_login(user)
+        with unit_of_work(self.db):
+            self.user_repo.update_last_login(user)
+            refresh_token = await self.create_refresh_token(user.id)
 
-        # Log login
-        self.audit_repo.create_audit_log(
+        # Log login once it is committed
+        audit_sink.emit(
             user_id=user.id,
             action="USER_LOGIN",
             resource="auth",
@@ -162,18 +168,23 @@ class AuthService:
             "expires_in": self.access_token_expire_minutes * 60,
         }
 
-    def refresh_access_token(self, refresh_token: str) -> dict:
+    async def refresh_access_token(self, refresh_token: str) -> dict:
         # Verify refresh token exists and is not expired
-        db_refresh_token = self.refresh_token_repo.get_valid_token(refresh_token)
+        user_id = await self.refresh_tokens.get_user_id(refresh_token)
 
-        if not db_refresh_token:
+        if user_id is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token"
             )
 
-        # Get user
-        user = self.user_repo.get_active_user_by_id(db_refresh_token.user_id)
-        if not user:
+        # Get user, from the identity cache when possible
+        user = identity_cache.get(user_id)
+        if user is None:
+            generation = identity_cache.generation
+            db_user = self.user_repo.get_by_id(user_id)
+            if db_user is not None:
+                user = identity_cache.set(db_user, generation)
+        if not user or not user.is_active:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="User not found or inactive",
@@ -190,7 +201,7 @@ class AuthService:
             "expires_in": self.access_token_expire_minutes * 60,
         }
 
-    def logout_user(
+    async def logout_user(
         self,
         refresh_token: str,
         user_id: Optional[int] = None,
@@ -198,11 +209,11 @@ class AuthService:
         user_agent: Optional[str] = None,
     ) -> bool:
         # Revoke refresh token
-        success = self.refresh_token_repo.revoke_token(refresh_token)
+        success = await self.refresh_tokens.revoke(refresh_token)
 
         if success and user_id:
             # Log logout
-            self.audit_repo.create_audit_log(
+            audit_sink.emit(
                 user_id=user_id,
                 action="USER_LOGOUT",
                 resource="auth",
@@ -214,6 +225,10 @@ class AuthService:
 
         return success
 
+    async def revoke_all_refresh_tokens(self, user_id: int) -> int:
+        """Revoke every refresh token of a user, e.g. after a password change."""
+        return await self.refresh_tokens.revoke_all(user_id)
+
     def log_audit_event(
         self,
         user_id: Optional[int],
@@ -223,9 +238,9 @@ class AuthService:
         details: Optional[str] = None,
         ip_address: Optional[str] = None,
         user_agent: Optional[str] = None,
-    ):
-        """Convenience method to log audit events."""
-        return self.audit_repo.create_audit_log(
+    ) -> None:
+        """Convenience method to queue audit events."""
+        audit_sink.emit(
             user_id=user_id,
             action=action,
             resource=resource,
@@ -245,7 +260,7 @@ def get_auth_service(db: Session = Depends(get_db)) -> AuthService:
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     auth_service: AuthService = Depends(get_auth_service),
-) -> User:
+) -> CachedUser:
     user = auth_service.get_current_user(credentials.credentials)
     if user is None:
         raise HTTPException(
@@ -256,13 +271,17 @@ def get_current_user(
     return user
 
 
-def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+def get_current_active_user(
+    current_user: CachedUser = Depends(get_current_user),
+) -> CachedUser:
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
 
 
-def get_current_superuser(current_user: User = Depends(get_current_user)) -> User:
+def get_current_superuser(
+    current_user: CachedUser = Depends(get_current_user),
+) -> CachedUser:
     if not current_user.is_superuser:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
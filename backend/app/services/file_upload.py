@@ -1,25 +1,104 @@
+import hashlib
 import uuid
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, List, Optional, Tuple
 
 import aiofiles
+import aiofiles.os
 from fastapi import HTTPException, UploadFile, status
-from PIL import Image
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core.config import settings
+from ..core.metrics import UPLOAD_BYTES, UPLOADS
+from ..db.database import AsyncSessionLocal
+from ..models.file import FileBlob, UserFile
+from ..repositories.file_repository import AsyncFileRepository
+from .thumbnails import (
+    THUMBNAIL_SIZES,
+    failure_marker_filename,
+    parse_thumbnail_filename,
+    thumbnail_filename,
+    thumbnail_runner,
+)
+
+# Leading bytes identifying each supported content type
+CONTENT_SIGNATURES = [
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"%PDF-", "application/pdf"),
+]
+
+
+def sniff_content_type(head: bytes) -> Optional[str]:
+    """Identify a file's content type from its first bytes."""
+    for signature, content_type in CONTENT_SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+@dataclass
+class StoredFile:
+    """Result of streaming an upload to disk."""
+
+    filename: str
+    size: int
+    sha256: str
+    content_type: str
+    # Whether this upload stored a new blob rather than reusing one
+    new_blob: bool = True
+
+
+@dataclass
+class FileLocation:
+    """A stored file or thumbnail variant resolved for serving."""
+
+    path: Path
+    etag: str
+    content_type: str
 
 
 class FileUploadService:
-    def __init__(self):
+    """
+    Stores uploads in a content-addressed, deduplicating layout.
+
+    Each unique body is written once as a blob named by its SHA-256 under
+    ``blobs/<aa>/<bb>/``. A metadata index maps the user-facing file IDs
+    returned to callers onto blobs and counts references, so identical
+    uploads share one blob and one set of thumbnails, and a blob is only
+    removed with its last reference.
+    """
+
+    def __init__(self, session_factory: Callable[[], AsyncSession] = AsyncSessionLocal):
         self.upload_dir = Path(settings.UPLOAD_DIR or "uploads")
         self.max_file_size = settings.MAX_FILE_SIZE or 10 * 1024 * 1024  # 10MB
+        self.chunk_size = settings.UPLOAD_CHUNK_SIZE
         self.allowed_types = (
             settings.ALLOWED_FILE_TYPES
             or "image/jpeg,image/png,image/gif,application/pdf"
         ).split(",")
+        self.storage_quota = settings.USER_STORAGE_QUOTA
+        self.delete_batch_size = settings.FILE_DELETE_BATCH_SIZE
+        self.session_factory = session_factory
+
+    @property
+    def blob_dir(self) -> Path:
+        """Root of the sharded blob tree."""
+        return self.upload_dir / "blobs"
 
-        # Create upload directory if it doesn't exist
-        self.upload_dir.mkdir(parents=True, exist_ok=True)
+    @property
+    def temp_dir(self) -> Path:
+        """Staging area for uploads whose hash is not known yet."""
+        return self.upload_dir / "tmp"
+
+    def blob_path(self, sha256: str) -> Path:
+        """Location of a blob, sharded by the first two bytes of its hash."""
+        return self.blob_dir / sha256[:2] / sha256[2:4] / sha256
 
     def validate_file(self, file: UploadFile) -> bool:
         """Validate file size and type."""
@@ -50,114 +129,323 @@ class FileUploadService:
 
     async def save_file(self, file: UploadFile, user_id: Optional[int] = None) -> str:
         """Save uploaded file and return filename."""
+        stored = await self.store_upload(file, user_id)
+        return stored.filename
+
+    async def store_upload(
+        self, file: UploadFile, user_id: Optional[int] = None
+    ) -> StoredFile:
+        """
+        Stream an upload into content-addressed storage.
+
+        The body is copied in fixed-size chunks to a staging file while its
+        SHA-256 is computed. The upload is aborted as soon as it crosses
+        ``max_file_size`` and its content type is sniffed from the first
+        chunk. A new file ID is then recorded against the blob, and only
+        after that commits is the staging file moved to the blob path. An
+        identical body already stored is kept untouched, so its modification
+        time, and the validators derived from it, do not change.
+        """
         self.validate_file(file)
+        quota_left = await self._remaining_quota(user_id)
 
         filename = self.generate_filename(file.filename, user_id)
-        file_path = self.upload_dir / filename
+        temp_path = self.temp_dir / f".{uuid.uuid4()}.part"
+
+        size = 0
+        digest = hashlib.sha256()
+        content_type = None
 
         try:
-            # Read file content
-            content = await file.read()
-
-            # Validate file size again (in case size wasn't available before)
-            if len(content) > self.max_file_size:
-                raise HTTPException(
-                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                    detail=f"File size exceeds maximum allowed size of {self.max_file_size / (1024*1024)}MB",
+            await aiofiles.os.makedirs(self.temp_dir, exist_ok=True)
+            async with aiofiles.open(temp_path, "wb") as f:
+                while chunk := await file.read(self.chunk_size):
+                    if content_type is None:
+                        content_type = self._check_content_type(chunk)
+
+                    size += len(chunk)
+                    if size > self.max_file_size:
+                        raise HTTPException(
+                            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f"File size exceeds maximum allowed size of {self.max_file_size / (1024*1024)}MB",
+                        )
+
+                    if quota_left is not None and size > quota_left:
+                        raise self._quota_exceeded()
+
+                    digest.update(chunk)
+                    await f.write(chunk)
+
+            if content_type is None:
+                content_type = self._check_content_type(b"")
+
+            sha256 = digest.hexdigest()
+            async with self.session_factory() as db:
+                new_blob = await AsyncFileRepository(db).add_reference(
+                    filename,
+                    sha256,
+                    size,
+                    content_type,
+                    user_id=user_id,
+                    original_filename=file.filename,
                 )
 
-            # Save file
-            async with aiofiles.open(file_path, "wb") as f:
-                await f.write(content)
-
-            return filename
+            # Move the body into place only once the reference is committed.
+            # A release that moved an existing blob aside sees the reference
+            # and puts it back, so a blob still on disk here is kept.
+            blob_path = self.blob_path(sha256)
+            if new_blob or not await aiofiles.os.path.exists(blob_path):
+                await aiofiles.os.makedirs(blob_path.parent, exist_ok=True)
+                await aiofiles.os.replace(temp_path, blob_path)
+            else:
+                await self._remove_quietly(temp_path)
+
+            blob = "new" if new_blob else "duplicate"
+            UPLOADS.labels(blob).inc()
+            UPLOAD_BYTES.labels(blob).inc(size)
+            return StoredFile(
+                filename=filename,
+                size=size,
+                sha256=sha256,
+                content_type=content_type,
+                new_blob=new_blob,
+            )
 
+        except HTTPException:
+            await self._remove_quietly(temp_path)
+            raise
         except Exception as e:
             # Clean up file if it was partially created
-            if file_path.exists():
-                file_path.unlink()
+            await self._remove_quietly(temp_path)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to save file: {str(e)}",
             ) from None
 
+    async def _remaining_quota(self, user_id: Optional[int]) -> Optional[int]:
+        """Bytes a user may still store, or None if uploads are not capped."""
+        if not self.storage_quota or user_id is None:
+            return None
+        remaining = self.storage_quota - await self.get_usage(user_id)
+        if remaining <= 0:
+            raise self._quota_exceeded()
+        return remaining
+
+    def _quota_exceeded(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Storage quota of {self.storage_quota / (1024*1024)}MB exceeded",
+        )
+
+    def _check_content_type(self, head: bytes) -> str:
+        """Sniff the content type from the first chunk and check it is allowed."""
+        content_type = sniff_content_type(head)
+        if content_type not in self.allowed_types:
+            raise HTTPException(
+                status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                detail=f"File content is not an allowed type. Allowed types: {', '.join(self.allowed_types)}",
+            )
+        return content_type
+
+    @staticmethod
+    async def _remove_quietly(path: Path) -> None:
+        try:
+            await aiofiles.os.remove(path)
+        except FileNotFoundError:
+            pass
+
     async def save_image_with_thumbnails(
         self, file: UploadFile, user_id: Optional[int] = None
     ) -> dict:
-        """Save image and create thumbnails."""
+        """Save image and queue thumbnail creation."""
         if not file.content_type.startswith("image/"):
             raise HTTPException(
                 status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
                 detail="File must be an image",
             )
 
-        # Save original file
-        filename = await self.save_file(file, user_id)
-        file_path = self.upload_dir / filename
-
-        try:
-            # Create thumbnails
-            with Image.open(file_path) as img:
-                # Convert to RGB if necessary
-                if img.mode in ("RGBA", "LA", "P"):
-                    img = img.convert("RGB")
-
-                # Create thumbnail sizes
-                thumbnails = {}
-                sizes = {"small": (150, 150), "medium": (300, 300), "large": (600, 600)}
-
-                for size_name, size in sizes.items():
-                    thumb = img.copy()
-                    thumb.thumbnail(size, Image.Resampling.LANCZOS)
-
-                    thumb_filename = f"thumb_{size_name}_{filename}"
-                    thumb_path = self.upload_dir / thumb_filename
-
-                    thumb.save(thumb_path, "JPEG", quality=85)
-                    thumbnails[size_name] = thumb_filename
-
-                return {
-                    "original": filename,
-                    "thumbnails": thumbnails,
-                    "size": img.size,
-                    "format": img.format,
-                }
-
-        except Exception as e:
-            # Clean up files if thumbnail creation failed
-            if file_path.exists():
-                file_path.unlink()
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to create thumbnails: {str(e)}",
-            ) from None
+        # Save original file; thumbnails are generated once per blob
+        stored = await self.store_upload(file, user_id)
+        blob_path = self.blob_path(stored.sha256)
+        if stored.new_blob:
+            thumbnail_runner.submit(blob_path)
+        job = thumbnail_runner.get_status(blob_path) or {"status": "pending"}
+
+        filename = stored.filename
+        thumbnails = {
+            size_name: thumbnail_filename(size_name, filename)
+            for size_name in THUMBNAIL_SIZES
+        }
+        return {
+            "original": filename,
+            "status": job["status"],
+            "thumbnails": thumbnails,
+            "thumbnail_urls": {
+                size_name: self.get_file_url(thumb_filename)
+                for size_name, thumb_filename in thumbnails.items()
+            },
+            "status_url": f"{settings.API_V1_STR}/files/images/{filename}/status",
+        }
+
+    async def get_thumbnail_status(self, filename: str, user_id: int) -> Optional[dict]:
+        """Get the thumbnail job status for one of a user's uploaded images."""
+        entry = await self._lookup(filename)
+        if entry is None or entry[0].user_id != user_id:
+            return None
+
+        job = thumbnail_runner.get_status(self.blob_path(entry[1].sha256))
+        if job is None:
+            return None
+        if "thumbnails" in job:
+            # Report variants under the file's own name rather than the blob's
+            job = {
+                **job,
+                "thumbnails": {
+                    size_name: thumbnail_filename(size_name, filename)
+                    for size_name in job["thumbnails"]
+                },
+            }
+        return job
+
+    async def _lookup(self, filename: str) -> Optional[Tuple[UserFile, FileBlob]]:
+        """Find the index entry for a user-facing file ID."""
+        if Path(filename).name != filename or filename.startswith("."):
+            return None
+        async with self.session_factory() as db:
+            return await AsyncFileRepository(db).get_with_blob(filename)
 
     async def get_file(self, filename: str) -> Optional[Path]:
-        """Get file path if it exists."""
-        file_path = self.upload_dir / filename
-        if file_path.exists() and file_path.is_file():
-            return file_path
+        """Get the stored path of a file or one of its thumbnail variants."""
+        location = await self.locate_file(filename)
+        return location.path if location is not None else None
+
+    async def locate_file(self, filename: str) -> Optional[FileLocation]:
+        """
+        Resolve a file or thumbnail variant to its blob for serving.
+
+        Thumbnail variants are addressed as ``thumb_<size>_<file id>``. A file
+        ID never points at different content, so the ETag is derived from the
+        blob's hash (and the variant) and is strong.
+        """
+        entry = await self._lookup(filename)
+        variant = None
+        if entry is None:
+            parsed = parse_thumbnail_filename(filename)
+            if parsed is None:
+                return None
+            variant, filename = parsed
+            entry = await self._lookup(filename)
+            if entry is None:
+                return None
+
+        blob = entry[1]
+        location = FileLocation(
+            path=self.blob_path(blob.sha256),
+            etag=f'"{blob.sha256}"',
+            content_type=blob.content_type,
+        )
+        if variant is not None:
+            location = FileLocation(
+                path=location.path.with_name(thumbnail_filename(variant, blob.sha256)),
+                etag=f'"{blob.sha256}-{variant}"',
+                content_type="image/jpeg",
+            )
+        if await aiofiles.os.path.isfile(location.path):
+            return location
         return None
 
     async def delete_file(self, filename: str) -> bool:
         """Delete file and return success status."""
-        file_path = self.upload_dir / filename
-        if file_path.exists():
-            file_path.unlink()
-            return True
-        return False
+        entry = await self._lookup(filename)
+        if entry is None:
+            return False
+        await self._release([entry[0]])
+        return True
 
     async def delete_user_files(self, user_id: int) -> List[str]:
-        """Delete all files belonging to a user."""
-        deleted_files = []
-        user_prefix = f"user_{user_id}_"
-
-        for file_path in self.upload_dir.glob(f"{user_prefix}*"):
-            if file_path.is_file():
-                file_path.unlink()
-                deleted_files.append(file_path.name)
+        """
+        Delete all files belonging to a user.
 
-        return deleted_files
+        Files are looked up through the per-user index and released in
+        batches of ``delete_batch_size``, one transaction per batch.
+        """
+        deleted_files = []
+        while True:
+            async with self.session_factory() as db:
+                user_files = await AsyncFileRepository(db).get_by_user(
+                    user_id, limit=self.delete_batch_size
+                )
+            if not user_files:
+                return deleted_files
+            await self._release(user_files)
+            deleted_files.extend(user_file.id for user_file in user_files)
+
+    async def list_user_files(
+        self, user_id: int, limit: Optional[int] = None
+    ) -> List[dict]:
+        """List a user's files, newest first."""
+        async with self.session_factory() as db:
+            rows = await AsyncFileRepository(db).list_by_user(user_id, limit=limit)
+        return [
+            {
+                "id": user_file.id,
+                "original_filename": user_file.original_filename,
+                "content_type": content_type,
+                "size": user_file.size,
+                "url": self.get_file_url(user_file.id),
+                "created_at": user_file.created_at,
+            }
+            for user_file, content_type in rows
+        ]
+
+    async def get_usage(self, user_id: int) -> int:
+        """Total bytes stored by a user."""
+        async with self.session_factory() as db:
+            return await AsyncFileRepository(db).get_usage(user_id)
+
+    async def _release(self, user_files: List[UserFile]) -> None:
+        """Drop file references and remove blobs that lost their last one."""
+        async with self.session_factory() as db:
+            orphaned = await AsyncFileRepository(db).remove_references(user_files)
+
+        for sha256 in orphaned:
+            await self._remove_blob(sha256)
+
+    async def _remove_blob(self, sha256: str) -> None:
+        """
+        Remove an orphaned blob and its thumbnails from storage.
+
+        An upload of the same content may re-add the blob row right after it
+        was deleted. The body is first moved aside, then the row is checked
+        again: if it is back the body is restored, otherwise it is deleted.
+        An upload that commits after the check moves its own copy into place.
+        """
+        blob_path = self.blob_path(sha256)
+        tombstone = blob_path.with_name(f".{sha256}.{uuid.uuid4()}.deleted")
+        try:
+            await aiofiles.os.replace(blob_path, tombstone)
+        except FileNotFoundError:
+            return
+
+        async with self.session_factory() as db:
+            referenced = await AsyncFileRepository(db).blob_exists(sha256)
+        if referenced:
+            await aiofiles.os.replace(tombstone, blob_path)
+            return
+
+        for size_name in THUMBNAIL_SIZES:
+            await self._remove_quietly(
+                blob_path.with_name(thumbnail_filename(size_name, sha256))
+            )
+        await self._remove_quietly(blob_path.with_name(failure_marker_filename(sha256)))
+        await self._remove_quietly(tombstone)
+
+    def accel_redirect_path(self, path: Path) -> Optional[str]:
+        """Internal nginx URI for a stored file, if downloads are offloaded."""
+        prefix = settings.UPLOAD_ACCEL_REDIRECT_PREFIX
+        if not prefix:
+            return None
+        return f"{prefix.rstrip('/')}/{path.relative_to(self.upload_dir).as_posix()}"
 
     def get_file_url(self, filename: str) -> str:
         """Get public URL for file."""
@@ -0,0 +1,208 @@
+"""
+Pluggable storage for refresh tokens.
+"""
+
+import asyncio
+import hashlib
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional, Type
+
+import redis.asyncio as redis
+from redis.commands.core import AsyncScript
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.redis_client import redis_client
+from ..db.database import SessionLocal
+from ..repositories.user_repository import RefreshTokenRepository
+
+# Delete one token and drop it from its user's set.
+# KEYS[1] is the token key; ARGV is (user set key prefix, token digest).
+REVOKE_SCRIPT = """
+local user_id = redis.call('GET', KEYS[1])
+if not user_id then
+    return 0
+end
+redis.call('DEL', KEYS[1])
+redis.call('SREM', ARGV[1] .. user_id, ARGV[2])
+return 1
+"""
+
+# Delete every token of a user, and the user's set, in one server-side call.
+# KEYS[1] is the user set key; ARGV[1] is the token key prefix.
+# Returns how many tokens were still live.
+REVOKE_ALL_SCRIPT = """
+local digests = redis.call('SMEMBERS', KEYS[1])
+local revoked = 0
+for i = 1, #digests do
+    revoked = revoked + redis.call('DEL', ARGV[1] .. digests[i])
+end
+redis.call('DEL', KEYS[1])
+return revoked
+"""
+
+
+def token_digest(token: str) -> str:
+    """SHA-256 of a refresh token; only the digest is ever stored."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class RefreshTokenStore(ABC):
+    """Where issued refresh tokens live until they expire or are revoked."""
+
+    @abstractmethod
+    async def add(
+        self, token: str, user_id: int, ttl: int, db: Optional[Session] = None
+    ) -> None:
+        """
+        Store a token for a user, valid for ``ttl`` seconds.
+
+        Stores kept in the database write through ``db`` when it is given, so
+        the token joins that session's transaction; other stores ignore it.
+        """
+
+    @abstractmethod
+    async def get_user_id(self, token: str) -> Optional[int]:
+        """Return the owner of a valid token, or None."""
+
+    @abstractmethod
+    async def revoke(self, token: str) -> bool:
+        """Revoke one token; returns False if it was not valid."""
+
+    @abstractmethod
+    async def revoke_all(self, user_id: int) -> int:
+        """Revoke every token of a user and return how many were revoked."""
+
+
+class RedisRefreshTokenStore(RefreshTokenStore):
+    """
+    Refresh tokens in Redis, keyed by their SHA-256 digest.
+
+    Each token key holds its user ID and expires with the token, so expired
+    tokens cost nothing to clean up. A per-user set of digests lets all of
+    a user's tokens be revoked in one call.
+    """
+
+    def __init__(self, client: Optional[redis.Redis] = None, prefix: str = "refresh"):
+        self.redis_client = client
+        self.prefix = prefix
+        self._scripts: Dict[str, AsyncScript] = {}
+        self._script_client: Optional[redis.Redis] = None
+
+    def get_redis_client(self) -> redis.Redis:
+        """Return the explicit client, or the app-wide pooled client."""
+        return self.redis_client or redis_client.client
+
+    def _get_script(self, client: redis.Redis, source: str) -> AsyncScript:
+        if self._script_client is not client:
+            self._scripts = {}
+            self._script_client = client
+        if source not in self._scripts:
+            self._scripts[source] = client.register_script(source)
+        return self._scripts[source]
+
+    @property
+    def token_prefix(self) -> str:
+        return f"{self.prefix}:token:"
+
+    @property
+    def user_prefix(self) -> str:
+        return f"{self.prefix}:user:"
+
+    def token_key(self, digest: str) -> str:
+        """Redis key holding the user ID of one token."""
+        return self.token_prefix + digest
+
+    def user_key(self, user_id: int) -> str:
+        """Redis key of the set of a user's token digests."""
+        return f"{self.user_prefix}{user_id}"
+
+    async def add(
+        self, token: str, user_id: int, ttl: int, db: Optional[Session] = None
+    ) -> None:
+        digest = token_digest(token)
+        user_key = self.user_key(user_id)
+        async with self.get_redis_client().pipeline(transaction=True) as pipe:
+            pipe.set(self.token_key(digest), user_id, ex=ttl)
+            pipe.sadd(user_key, digest)
+            # Every token has the same lifetime, so the newest outlives the rest
+            pipe.expire(user_key, ttl)
+            await pipe.execute()
+
+    async def get_user_id(self, token: str) -> Optional[int]:
+        user_id = await self.get_redis_client().get(self.token_key(token_digest(token)))
+        return int(user_id) if user_id is not None else None
+
+    async def revoke(self, token: str) -> bool:
+        client = self.get_redis_client()
+        digest = token_digest(token)
+        revoked = await self._get_script(client, REVOKE_SCRIPT)(
+            keys=[self.token_key(digest)], args=[self.user_prefix, digest]
+        )
+        return bool(revoked)
+
+    async def revoke_all(self, user_id: int) -> int:
+        client = self.get_redis_client()
+        return int(
+            await self._get_script(client, REVOKE_ALL_SCRIPT)(
+                keys=[self.user_key(user_id)], args=[self.token_prefix]
+            )
+        )
+
+
+class DatabaseRefreshTokenStore(RefreshTokenStore):
+    """
+    Refresh tokens in the ``refresh_tokens`` table, stored as digests.
+
+    Expired and revoked rows stay until ``delete_expired`` removes them.
+    """
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal):
+        self.session_factory = session_factory
+
+    def _run(self, method: str, *args):
+        with self.session_factory() as db:
+            return getattr(RefreshTokenRepository(db), method)(*args)
+
+    async def add(
+        self, token: str, user_id: int, ttl: int, db: Optional[Session] = None
+    ) -> None:
+        expires_at = datetime.utcnow() + timedelta(seconds=ttl)
+        if db is not None:
+            RefreshTokenRepository(db).create_refresh_token(
+                user_id, token_digest(token), expires_at
+            )
+            return
+        await asyncio.to_thread(
+            self._run,
+            "create_refresh_token",
+            user_id,
+            token_digest(token),
+            expires_at,
+        )
+
+    async def get_user_id(self, token: str) -> Optional[int]:
+        refresh_token = await asyncio.to_thread(
+            self._run, "get_valid_token", token_digest(token)
+        )
+        return refresh_token.user_id if refresh_token is not None else None
+
+    async def revoke(self, token: str) -> bool:
+        return await asyncio.to_thread(self._run, "revoke_token", token_digest(token))
+
+    async def revoke_all(self, user_id: int) -> int:
+        return await asyncio.to_thread(self._run, "revoke_all_user_tokens", user_id)
+
+    async def delete_expired(self, batch_size: Optional[int] = None) -> int:
+        """Delete expired and revoked tokens."""
+        return await asyncio.to_thread(self._run, "delete_expired", None, batch_size)
+
+
+REFRESH_TOKEN_STORES: Dict[str, Type[RefreshTokenStore]] = {
+    "redis": RedisRefreshTokenStore,
+    "database": DatabaseRefreshTokenStore,
+}
+
+# Create store instance
+refresh_token_store = REFRESH_TOKEN_STORES[settings.REFRESH_TOKEN_STORE]()
@@ -0,0 +1,282 @@
+"""
+Retention and compaction jobs for refresh tokens and audit logs.
+
+Run in the background by the application, or once from the command line:
+
+    python -m app.services.retention [--job NAME]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import gzip
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..db.database import SessionLocal, engine
+from ..db.partitions import add_months, drop_partition, list_monthly_partitions
+from ..models.user import AuditLog
+from ..repositories.user_repository import (
+    AuditLogRepository,
+    RefreshTokenRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+# Advisory lock held while retention jobs run, so one process runs them at a time
+RETENTION_LOCK = "retention_jobs"
+
+
+@dataclass
+class RetentionResult:
+    """What one retention job removed, and how long it took."""
+
+    job: str
+    deleted: int = 0
+    archived: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    def __str__(self) -> str:
+        summary = f"{self.job}: removed {self.deleted} rows in {self.seconds:.2f}s"
+        if self.archived:
+            summary += f", archived {', '.join(self.archived)}"
+        return summary
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def archive_table(
+    conn: Connection, name: str, path: Path, batch_size: int = 1000
+) -> int:
+    """
+    Write every row of a table to a gzip-compressed NDJSON file.
+
+    Rows are streamed with a server-side cursor, and the file is written
+    under a temporary name and renamed into place, so an archive that exists
+    is complete. Returns the number of rows written.
+    """
+    quoted = conn.dialect.identifier_preparer.quote(name)
+    result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(
+        text(f"SELECT * FROM {quoted}")
+    )
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f".{path.name}.part")
+    count = 0
+    with gzip.open(temp_path, "wt", encoding="utf-8") as file:
+        for row in result:
+            file.write(json.dumps(dict(row._mapping), default=_json_default))
+            file.write("\n")
+            count += 1
+    os.replace(temp_path, path)
+    return count
+
+
+@contextlib.contextmanager
+def advisory_lock(engine: Engine, name: str) -> Iterator[bool]:
+    """
+    Hold a PostgreSQL session-level advisory lock for the block, if it is free.
+
+    Yields whether the lock was taken; a process trying the same name in the
+    meantime gets False instead of waiting. The lock survives commits, so no
+    transaction stays open while it is held. Other databases are only used
+    by a single process, so the lock is always taken there.
+    """
+    if engine.dialect.name != "postgresql":
+        yield True
+        return
+
+    with engine.connect() as conn:
+        acquired = conn.scalar(
+            text("SELECT pg_try_advisory_lock(hashtext(:name))"), {"name": name}
+        )
+        conn.commit()
+        try:
+            yield bool(acquired)
+        finally:
+            if acquired:
+                conn.execute(
+                    text("SELECT pg_advisory_unlock(hashtext(:name))"), {"name": name}
+                )
+                conn.commit()
+
+
+class RetentionJobs:
+    """
+    Purges expired refresh tokens and audit logs past their retention.
+
+    Rows are deleted ``batch_size`` at a time with a ``pause`` between
+    batches, so no transaction holds locks for long. On PostgreSQL, monthly
+    audit partitions entirely older than the retention window are archived
+    to ``archive_dir`` as compressed NDJSON and then dropped, instead of
+    being deleted row by row. A background task runs every job once per
+    ``interval`` seconds. Each run takes an advisory lock first, and is skipped
+    while another worker or a command-line run holds it.
+    """
+
+    def __init__(
+        self,
+        token_retention_days: int = 0,
+        audit_retention_days: Optional[int] = 365,
+        archive_dir: str = "archive/audit",
+        batch_size: int = 1000,
+        pause: float = 0.1,
+        interval: float = 24 * 60 * 60,
+        session_factory: Callable[[], Session] = SessionLocal,
+        engine: Engine = engine,
+    ):
+        self.token_retention_days = token_retention_days
+        self.audit_retention_days = audit_retention_days
+        self.archive_dir = Path(archive_dir)
+        self.batch_size = batch_size
+        self.pause = pause
+        self.interval = interval
+        self.session_factory = session_factory
+        self.engine = engine
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def jobs(self) -> Dict[str, Callable[[], RetentionResult]]:
+        """Retention jobs by name."""
+        return {
+            "refresh_tokens": self.purge_refresh_tokens,
+            "audit_logs": self.purge_audit_logs,
+        }
+
+    def purge_refresh_tokens(self) -> RetentionResult:
+        """Delete revoked refresh tokens and those past their retention."""
+        result = RetentionResult("refresh_tokens")
+        started = time.monotonic()
+        before = datetime.utcnow() - timedelta(days=self.token_retention_days)
+        with self.session_factory() as db:
+            result.deleted = RefreshTokenRepository(db).delete_expired(
+                before, batch_size=self.batch_size, pause=self.pause
+            )
+        result.seconds = time.monotonic() - started
+        return result
+
+    def purge_audit_logs(self) -> RetentionResult:
+        """Archive and drop old audit partitions, then delete remaining old rows."""
+        result = RetentionResult("audit_logs")
+        if self.audit_retention_days is None:
+            return result
+
+        started = time.monotonic()
+        cutoff = datetime.utcnow() - timedelta(days=self.audit_retention_days)
+        if self.engine.dialect.name == "postgresql":
+            self._drop_audit_partitions(cutoff.date(), result)
+
+        # Rows in the default partition, or on databases without partitions
+        with self.session_factory() as db:
+            result.deleted += AuditLogRepository(db).delete_where(
+                AuditLog.created_at < cutoff,
+                batch_size=self.batch_size,
+                pause=self.pause,
+            )
+        result.seconds = time.monotonic() - started
+        return result
+
+    def _drop_audit_partitions(self, cutoff: date, result: RetentionResult) -> None:
+        table = AuditLog.__table__
+        with self.engine.connect() as conn:
+            partitions = list_monthly_partitions(conn, table)
+
+        for name, month in partitions:
+            if add_months(month, 1) > cutoff:
+                break
+            path = self.archive_dir / f"{name}.ndjson.gz"
+            with self.engine.begin() as conn:
+                result.deleted += archive_table(conn, name, path, self.batch_size)
+                drop_partition(conn, table, name)
+            result.archived.append(str(path))
+
+    def run_once(self, names: Optional[Sequence[str]] = None) -> List[RetentionResult]:
+        """Run the named jobs, or all of them, and log what each removed."""
+        results = []
+        with advisory_lock(self.engine, RETENTION_LOCK) as acquired:
+            if not acquired:
+                logger.info("Retention jobs are running elsewhere, skipping")
+                return results
+            for name, job in self.jobs.items():
+                if names and name not in names:
+                    continue
+                result = job()
+                logger.info("Retention %s", result)
+                results.append(result)
+        return results
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.run_once)
+            except Exception:
+                logger.exception("Retention jobs failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start the background task on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+
+# Create jobs instance
+retention_jobs = RetentionJobs(
+    token_retention_days=settings.REFRESH_TOKEN_RETENTION_DAYS,
+    audit_retention_days=settings.AUDIT_LOG_RETENTION_DAYS,
+    archive_dir=settings.AUDIT_ARCHIVE_DIR,
+    batch_size=settings.RETENTION_BATCH_SIZE,
+    pause=settings.RETENTION_BATCH_PAUSE,
+    interval=settings.RETENTION_INTERVAL_SECONDS,
+)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the retention jobs once and print what they removed."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument(
+        "--job",
+        action="append",
+        choices=sorted(retention_jobs.jobs),
+        help="job to run; may be repeated (default: all)",
+    )
+    parser.add_argument("--batch-size", type=int, default=retention_jobs.batch_size)
+    parser.add_argument(
+        "--pause",
+        type=float,
+        default=retention_jobs.pause,
+        help="seconds to sleep between batches",
+    )
+    args = parser.parse_args(argv)
+
+    retention_jobs.batch_size = args.batch_size
+    retention_jobs.pause = args.pause
+    for result in retention_jobs.run_once(args.job):
+        print(result)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,182 @@
+"""
+Background thumbnail generation in a process pool.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional, Set, Tuple
+
+from ..core.config import settings
+from ..core.metrics import THUMBNAIL_JOB_DURATION
+
+logger = logging.getLogger(__name__)
+
+# Thumbnail variants, largest first so each resize cascades from the previous
+THUMBNAIL_SIZES: Dict[str, Tuple[int, int]] = {
+    "large": (600, 600),
+    "medium": (300, 300),
+    "small": (150, 150),
+}
+
+
+def thumbnail_filename(size_name: str, filename: str) -> str:
+    """Name of a thumbnail variant of an uploaded file."""
+    return f"thumb_{size_name}_{filename}"
+
+
+def failure_marker_filename(filename: str) -> str:
+    """Name of the hidden file recording that thumbnailing a file failed."""
+    return f".thumb_failed_{filename}"
+
+
+def parse_thumbnail_filename(name: str) -> Optional[Tuple[str, str]]:
+    """Split a thumbnail variant name into its size name and source filename."""
+    for size_name in THUMBNAIL_SIZES:
+        prefix = thumbnail_filename(size_name, "")
+        if name.startswith(prefix) and len(name) > len(prefix):
+            return size_name, name[len(prefix) :]
+    return None
+
+
+def generate_thumbnails(
+    source_path: str, sizes: Dict[str, Tuple[int, int]] = THUMBNAIL_SIZES
+) -> Dict[str, Any]:
+    """
+    Create JPEG thumbnails next to ``source_path``.
+
+    Runs in a worker process. JPEG sources are decoded at reduced scale with
+    ``draft()``, and each variant is resized from the previous, larger one
+    instead of from the full-size original. Variants are written to a
+    temporary name and renamed into place, so a variant that exists is
+    complete.
+    """
+    # Only worker processes need Pillow, so the app does not load it at startup
+    from PIL import Image
+
+    source = Path(source_path)
+    ordered = sorted(sizes.items(), key=lambda item: item[1], reverse=True)
+
+    with Image.open(source) as img:
+        original_size = img.size
+        original_format = img.format
+
+        if img.format == "JPEG":
+            # Let libjpeg decode at the smallest scale still >= the largest variant
+            img.draft("RGB", ordered[0][1])
+
+        # Convert to RGB if necessary
+        thumb = img.convert("RGB") if img.mode != "RGB" else img.copy()
+
+    thumbnails = {}
+    for size_name, size in ordered:
+        thumb.thumbnail(size, Image.Resampling.LANCZOS)
+
+        thumb_filename = thumbnail_filename(size_name, source.name)
+        thumb_path = source.with_name(thumb_filename)
+        temp_path = source.with_name(f".{thumb_filename}.part")
+
+        thumb.save(temp_path, "JPEG", quality=85)
+        os.replace(temp_path, thumb_path)
+        thumbnails[size_name] = thumb_filename
+
+    return {"thumbnails": thumbnails, "size": original_size, "format": original_format}
+
+
+class ThumbnailJobRunner:
+    """
+    Runs thumbnail jobs in a process pool off the request path.
+
+    Job status is kept in a bounded in-memory table. Jobs that ran in another
+    worker, or before a restart, are reported from the files on disk: the
+    variants once they all exist, or a failure marker left by a failed job.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_jobs: int = 10000):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_jobs = max_jobs
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def start(self) -> ProcessPoolExecutor:
+        """Create the worker pool if it is not running yet."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    def _set_job(self, filename: str, job: Dict[str, Any]) -> None:
+        self._jobs[filename] = job
+        self._jobs.move_to_end(filename)
+        while len(self._jobs) > self.max_jobs:
+            self._jobs.popitem(last=False)
+
+    def submit(self, source_path: Path) -> None:
+        """Queue thumbnail generation for an uploaded image."""
+        self._set_job(source_path.name, {"status": "pending"})
+        task = asyncio.create_task(self._run(source_path))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, source_path: Path) -> None:
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        try:
+            result = await loop.run_in_executor(
+                self.start(), generate_thumbnails, str(source_path)
+            )
+        except Exception:
+            logger.exception("Failed to create thumbnails for %s", source_path.name)
+            job = {"status": "failed"}
+        else:
+            job = {"status": "ready", **result}
+        self._mark_failed(source_path, job["status"] == "failed")
+        self._set_job(source_path.name, job)
+        THUMBNAIL_JOB_DURATION.labels(job["status"]).observe(
+            time.perf_counter() - started
+        )
+
+    @staticmethod
+    def _mark_failed(source_path: Path, failed: bool) -> None:
+        """Create or clear the failure marker other workers report from."""
+        marker = source_path.with_name(failure_marker_filename(source_path.name))
+        try:
+            if failed:
+                marker.touch()
+            else:
+                marker.unlink(missing_ok=True)
+        except OSError:
+            logger.warning("Could not update %s", marker.name, exc_info=True)
+
+    def get_status(self, source_path: Path) -> Optional[Dict[str, Any]]:
+        """Return the job status for an uploaded image, if it exists."""
+        job = self._jobs.get(source_path.name)
+        if job is not None:
+            return job
+        if not source_path.is_file():
+            return None
+
+        thumbnails = {
+            size_name: thumbnail_filename(size_name, source_path.name)
+            for size_name in THUMBNAIL_SIZES
+        }
+        if all(source_path.with_name(name).is_file() for name in thumbnails.values()):
+            return {"status": "ready", "thumbnails": thumbnails}
+        marker = source_path.with_name(failure_marker_filename(source_path.name))
+        if marker.is_file():
+            return {"status": "failed"}
+        return {"status": "pending"}
+
+
+# Create runner instance
+thumbnail_runner = ThumbnailJobRunner(max_workers=settings.THUMBNAIL_WORKERS)
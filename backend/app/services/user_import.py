@@ -0,0 +1,290 @@
+"""
+Streaming bulk user import.
+"""
+
+import asyncio
+import codecs
+import csv
+import json
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.hashing import password_hasher
+from ..db.database import SessionLocal
+from ..models.user import User
+from ..repositories.user_repository import UserRepository
+from ..schemas.user import UserCreate
+
+# A parsed input record: line number, field values, parse error
+Record = Tuple[int, Optional[Dict[str, Any]], Optional[List[str]]]
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a byte stream into decoded lines without buffering the whole body."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending.strip():
+        yield pending.rstrip("\r")
+
+
+async def iter_csv_records(lines: AsyncIterator[str]) -> AsyncIterator[Record]:
+    """
+    Parse CSV with a header row into records.
+
+    Lines are joined while a quoted field is still open, so values may
+    contain newlines.
+    """
+    header: Optional[List[str]] = None
+    buffered: List[str] = []
+    line_no = start = 0
+    async for line in lines:
+        line_no += 1
+        if not buffered:
+            start = line_no
+        buffered.append(line)
+        text = "\n".join(buffered)
+        if text.count('"') % 2:
+            continue
+        buffered = []
+        if not text.strip():
+            continue
+
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+        elif len(values) != len(header):
+            yield start, None, [f"expected {len(header)} columns, got {len(values)}"]
+        else:
+            yield start, dict(zip(header, values, strict=True)), None
+
+    if buffered:
+        yield start, None, ["unterminated quoted field"]
+
+
+async def iter_ndjson_records(lines: AsyncIterator[str]) -> AsyncIterator[Record]:
+    """Parse newline-delimited JSON objects into records."""
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_no, None, [f"invalid JSON: {e}"]
+            continue
+        if not isinstance(row, dict):
+            yield line_no, None, ["expected a JSON object"]
+        else:
+            yield line_no, row, None
+
+
+RECORD_PARSERS: Dict[str, Callable[[AsyncIterator[str]], AsyncIterator[Record]]] = {
+    "csv": iter_csv_records,
+    "ndjson": iter_ndjson_records,
+}
+
+
+def _validation_errors(error: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}"
+        for item in error.errors()
+    ]
+
+
+class UserImporter:
+    """
+    Imports users from a streamed CSV or NDJSON body.
+
+    Rows are validated against ``UserCreate`` as they arrive and collected
+    into batches of ``batch_size``. Each batch is checked for existing users
+    with one query, its passwords are hashed across the process pool, and it
+    is inserted with a single bulk INSERT. Results are yielded as they are
+    known: one entry per rejected row, then a summary.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 500,
+        session_factory: Callable[[], Session] = SessionLocal,
+    ):
+        self.batch_size = batch_size
+        self.session_factory = session_factory
+
+    async def run(
+        self, chunks: AsyncIterator[bytes], import_format: str
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Import users from a byte stream and yield per-row errors and a summary."""
+        records = RECORD_PARSERS[import_format](iter_lines(chunks))
+        seen: Tuple[Set[str], Set[str]] = (set(), set())
+        batch: List[Tuple[int, UserCreate]] = []
+        summary = {"status": "done", "created": 0, "failed": 0}
+
+        async for line, row, errors in records:
+            user, errors = self._validate(row, errors, seen)
+            if errors:
+                summary["failed"] += 1
+                yield {"line": line, "status": "error", "errors": errors}
+                continue
+
+            batch.append((line, user))
+            if len(batch) >= self.batch_size:
+                async for result in self._flush(batch, summary):
+                    yield result
+                batch = []
+
+        if batch:
+            async for result in self._flush(batch, summary):
+                yield result
+
+        yield summary
+
+    @staticmethod
+    def _validate(
+        row: Optional[Dict[str, Any]],
+        errors: Optional[List[str]],
+        seen: Tuple[Set[str], Set[str]],
+    ) -> Tuple[Optional[UserCreate], Optional[List[str]]]:
+        """Validate one record, rejecting emails and usernames seen earlier."""
+        if errors is not None:
+            return None, errors
+        try:
+            user = UserCreate.model_validate(row)
+        except ValidationError as e:
+            return None, _validation_errors(e)
+
+        seen_emails, seen_usernames = seen
+        duplicate = user.email in seen_emails or user.username in seen_usernames
+        seen_emails.add(user.email)
+        seen_usernames.add(user.username)
+        if duplicate:
+            return None, ["duplicate email or username in this import"]
+        return user, None
+
+    async def _flush(
+        self, batch: List[Tuple[int, UserCreate]], summary: Dict[str, Any]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Import one batch, add it to the summary and yield its row errors.
+
+        The response is already streaming, so a batch the server is too busy
+        to hash fails row by row instead of cutting the stream short.
+        """
+        try:
+            count, results = await self._import_batch(batch)
+        except HTTPException as e:
+            count = 0
+            results = [
+                {"line": line, "status": "error", "errors": [e.detail]}
+                for line, _ in batch
+            ]
+        summary["created"] += count
+        summary["failed"] += len(results)
+        for result in results:
+            yield result
+
+    async def _import_batch(
+        self, batch: List[Tuple[int, UserCreate]]
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """Insert one batch and return the number created and the row errors."""
+        emails, usernames = await asyncio.to_thread(
+            self._find_existing,
+            [user.email for _, user in batch],
+            [user.username for _, user in batch],
+        )
+
+        results = []
+        accepted = []
+        for line, user in batch:
+            if user.email in emails or user.username in usernames:
+                results.append(
+                    {
+                        "line": line,
+                        "status": "error",
+                        "errors": ["email or username already registered"],
+                    }
+                )
+            else:
+                accepted.append((line, user))
+        if not accepted:
+            return 0, results
+
+        hashes = await password_hasher.hash_many(
+            [user.password for _, user in accepted]
+        )
+        rows = [
+            (
+                line,
+                {
+                    "email": user.email,
+                    "username": user.username,
+                    "full_name": user.full_name,
+                    "is_active": user.is_active,
+                    "hashed_password": hashed_password,
+                },
+            )
+            for (line, user), hashed_password in zip(accepted, hashes, strict=True)
+        ]
+        created, errors = await asyncio.to_thread(self._insert, rows)
+        return created, results + errors
+
+    def _find_existing(
+        self, emails: List[str], usernames: List[str]
+    ) -> Tuple[Set[str], Set[str]]:
+        """Find which emails and usernames are already taken, in one query."""
+        with self.session_factory() as db:
+            taken = db.execute(
+                select(User.email, User.username).where(
+                    or_(User.email.in_(emails), User.username.in_(usernames))
+                )
+            ).all()
+        return {email for email, _ in taken}, {username for _, username in taken}
+
+    def _insert(
+        self, rows: List[Tuple[int, Dict[str, Any]]]
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Bulk insert rows, falling back to one at a time on a conflict.
+
+        A conflict here means a user registered after the existence check;
+        the fallback isolates the offending rows.
+        """
+        with self.session_factory() as db:
+            repo = UserRepository(db)
+            try:
+                repo.create_many([row for _, row in rows])
+                return len(rows), []
+            except IntegrityError:
+                db.rollback()
+
+            created, errors = 0, []
+            for line, row in rows:
+                try:
+                    repo.create(**row)
+                    created += 1
+                except IntegrityError:
+                    db.rollback()
+                    errors.append(
+                        {
+                            "line": line,
+                            "status": "error",
+                            "errors": ["email or username already registered"],
+                        }
+                    )
+            return created, errors
+
+
+# Create importer instance
+user_importer = UserImporter(batch_size=settings.USER_IMPORT_BATCH_SIZE)
@@ -0,0 +1,9 @@
+"""
+Performance benchmarks for the backend.
+
+The pytest-benchmark suite runs against SQLite and an in-memory Redis:
+
+    pytest benchmarks --no-cov --benchmark-json=results.json
+
+See ``benchmarks.compare`` for baselines and regression checks.
+"""
@@ -0,0 +1,149 @@
+"""
+Save benchmark baselines and compare new results against them.
+
+Results come from pytest-benchmark's ``--benchmark-json`` output. Baselines
+keep only the statistics needed for comparison, so they stay small enough
+to commit:
+
+    pytest benchmarks --no-cov --benchmark-json=results.json
+    python -m benchmarks.compare save results.json benchmarks/baselines/local.json
+    python -m benchmarks.compare check benchmarks/baselines/local.json results.json
+
+``check`` exits with status 1 if any benchmark got slower than the baseline
+by more than ``--threshold``. Timings are only comparable on the machine
+that recorded the baseline.
+"""
+
+import argparse
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+# Statistics kept in a baseline, in seconds
+BASELINE_STATS = ("min", "median", "mean", "stddev")
+
+# Default allowed slowdown before a benchmark counts as a regression
+DEFAULT_THRESHOLD = 0.15
+
+
+def load_stats(path: Path) -> Dict[str, Dict[str, float]]:
+    """Read per-benchmark statistics from a results file or a baseline."""
+    data = json.loads(path.read_text())
+    if "benchmarks" not in data:
+        return data["stats"]
+    return {
+        benchmark["fullname"]: {
+            stat: benchmark["stats"][stat] for stat in BASELINE_STATS
+        }
+        for benchmark in data["benchmarks"]
+    }
+
+
+def save_baseline(results: Path, baseline: Path) -> int:
+    """Write the statistics of a results file as a baseline."""
+    stats = load_stats(results)
+    baseline.parent.mkdir(parents=True, exist_ok=True)
+    baseline.write_text(json.dumps({"stats": stats}, indent=2, sort_keys=True) + "\n")
+    return len(stats)
+
+
+def compare(
+    baseline: Dict[str, Dict[str, float]],
+    current: Dict[str, Dict[str, float]],
+    threshold: float = DEFAULT_THRESHOLD,
+    stat: str = "median",
+) -> List[Dict[str, object]]:
+    """
+    Compare each benchmark's ``stat`` with its baseline.
+
+    Each row has the benchmark name, both timings, the relative change and
+    a status: ``regression`` beyond ``threshold`` slower, ``improved``
+    beyond it faster, otherwise ``ok``; ``new`` and ``missing`` mark
+    benchmarks present on only one side.
+    """
+    rows = []
+    for name in sorted(baseline.keys() | current.keys()):
+        before: Optional[float] = baseline.get(name, {}).get(stat)
+        after: Optional[float] = current.get(name, {}).get(stat)
+        change = None
+        if before is None:
+            status = "new"
+        elif after is None:
+            status = "missing"
+        else:
+            change = after / before - 1
+            if change > threshold:
+                status = "regression"
+            elif change < -threshold:
+                status = "improved"
+            else:
+                status = "ok"
+        rows.append(
+            {
+                "name": name,
+                "baseline": before,
+                "current": after,
+                "change": change,
+                "status": status,
+            }
+        )
+    return rows
+
+
+def _format_time(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Save or check benchmark baselines."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    save = commands.add_parser("save", help="store results as a baseline")
+    save.add_argument("results", type=Path)
+    save.add_argument("baseline", type=Path)
+
+    check = commands.add_parser("check", help="compare results with a baseline")
+    check.add_argument("baseline", type=Path)
+    check.add_argument("results", type=Path)
+    check.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="allowed slowdown as a fraction (default: %(default)s)",
+    )
+    check.add_argument("--stat", choices=BASELINE_STATS, default="median")
+
+    args = parser.parse_args(argv)
+    if args.command == "save":
+        count = save_baseline(args.results, args.baseline)
+        print(f"Saved {count} benchmarks to {args.baseline}")
+        return 0
+
+    rows = compare(
+        load_stats(args.baseline), load_stats(args.results), args.threshold, args.stat
+    )
+    width = max((len(row["name"]) for row in rows), default=0)
+    for row in rows:
+        change = "" if row["change"] is None else f"{row['change']:+.1%}"
+        print(
+            f"{row['name']:<{width}}  {_format_time(row['baseline']):>10}  "
+            f"{_format_time(row['current']):>10}  {change:>8}  {row['status']}"
+        )
+
+    regressions = [row for row in rows if row["status"] == "regression"]
+    if regressions:
+        print(
+            f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,80 @@
+"""
+Fixtures for the benchmark suite: SQLite databases and an in-memory Redis.
+"""
+
+import asyncio
+
+import fakeredis.aioredis
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.repositories.user_repository import UserRepository
+
+# Users seeded into the benchmark database
+SEEDED_USERS = 1000
+
+
+@pytest.fixture(scope="session")
+def run():
+    """Run a coroutine to completion on one event loop shared by the suite."""
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
+
+
+@pytest.fixture
+def aio_benchmark(benchmark, run):
+    """Benchmark an async function, awaiting a fresh call each round."""
+
+    def measure(function, *args, **kwargs):
+        return benchmark(lambda: run(function(*args, **kwargs)))
+
+    return measure
+
+
+@pytest.fixture(scope="session")
+def database_path(tmp_path_factory):
+    """A SQLite database with the schema and ``SEEDED_USERS`` users."""
+    path = tmp_path_factory.mktemp("db") / "bench.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        UserRepository(db).create_many(
+            {
+                "email": f"user{index}@example.com",
+                "username": f"user{index}",
+                "hashed_password": "x",
+            }
+            for index in range(SEEDED_USERS)
+        )
+    engine.dispose()
+    return path
+
+
+@pytest.fixture
+def db(database_path):
+    """A session on the seeded database."""
+    engine = create_engine(f"sqlite:///{database_path}")
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def async_session_factory(database_path, run):
+    """An async session factory on the seeded database."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}")
+    yield async_sessionmaker(bind=engine, expire_on_commit=False)
+    run(engine.dispose())
+
+
+@pytest.fixture
+def fake_redis(run):
+    """An in-memory Redis client."""
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    yield client
+    run(client.aclose())
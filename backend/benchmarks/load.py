@@ -0,0 +1,444 @@
+"""
+End-to-end load generator for the API.
+
+Starts the application under uvicorn in a subprocess, on a throwaway SQLite
+database and an in-memory Redis unless told otherwise, and drives it with
+concurrent virtual users running one scenario:
+
+    python -m benchmarks.load run auth-mix --concurrency 50 --duration 30
+    python -m benchmarks.load run upload-burst --database-url postgresql://...
+    python -m benchmarks.load run rate-limit --url http://localhost:8000
+
+With ``--url`` an already running server is loaded instead. Reports
+throughput, p50/p95/p99 latency and error rates per endpoint.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Sequence
+
+import httpx
+
+# Relative weights of the steps in the auth mix
+AUTH_MIX = {"login": 1, "refresh": 2, "me": 7}
+
+# Uploads sent concurrently by one virtual user in each burst
+UPLOAD_BURST_SIZE = 5
+
+# Distinct clients the rate limit scenario spreads its users over
+RATE_LIMIT_CLIENTS = 10
+
+API = "/api/v1"
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def percentile(ordered: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending sequence."""
+    if not ordered:
+        return 0.0
+    rank = math.ceil(fraction * len(ordered))
+    return ordered[min(max(rank, 1), len(ordered)) - 1]
+
+
+class Recorder:
+    """Collects the outcome and latency of every request, per endpoint."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.limited: Dict[str, int] = defaultdict(int)
+
+    def record(self, endpoint: str, status_code: Optional[int], seconds: float) -> None:
+        """Record one request; a missing status means the request failed."""
+        self.latencies[endpoint].append(seconds)
+        if status_code == 429:
+            self.limited[endpoint] += 1
+        elif status_code is None or status_code >= 400:
+            self.errors[endpoint] += 1
+
+    def _summary(self, endpoint: str, latencies: List[float], elapsed: float) -> dict:
+        ordered = sorted(latencies)
+        count = len(ordered)
+        errors = sum(self.errors[name] for name in self._names(endpoint))
+        limited = sum(self.limited[name] for name in self._names(endpoint))
+        return {
+            "endpoint": endpoint,
+            "requests": count,
+            "rps": count / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(ordered, 0.50) * 1000,
+            "p95_ms": percentile(ordered, 0.95) * 1000,
+            "p99_ms": percentile(ordered, 0.99) * 1000,
+            "error_rate": errors / count if count else 0.0,
+            "limited_rate": limited / count if count else 0.0,
+        }
+
+    def _names(self, endpoint: str) -> List[str]:
+        return list(self.latencies) if endpoint == "total" else [endpoint]
+
+    def report(self, elapsed: float) -> List[dict]:
+        """Per-endpoint summaries, then the total."""
+        rows = [
+            self._summary(endpoint, latencies, elapsed)
+            for endpoint, latencies in sorted(self.latencies.items())
+        ]
+        everything = [value for values in self.latencies.values() for value in values]
+        rows.append(self._summary("total", everything, elapsed))
+        return rows
+
+
+def format_report(rows: List[dict]) -> str:
+    """Render report rows as a table."""
+    lines = [
+        f"{'endpoint':<32} {'requests':>9} {'req/s':>9} {'p50 ms':>8} "
+        f"{'p95 ms':>8} {'p99 ms':>8} {'errors':>7} {'limited':>8}"
+    ]
+    for row in rows:
+        lines.append(
+            f"{row['endpoint']:<32} {row['requests']:>9} {row['rps']:>9.1f} "
+            f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} "
+            f"{row['error_rate']:>7.1%} {row['limited_rate']:>8.1%}"
+        )
+    return "\n".join(lines)
+
+
+class VirtualUser:
+    """One simulated client with its own account and tokens."""
+
+    def __init__(
+        self, client: httpx.AsyncClient, recorder: Recorder, index: int, run_id: str
+    ):
+        self.client = client
+        self.recorder = recorder
+        self.index = index
+        self.username = f"load_{run_id}_{index}"
+        self.password = "load-test-password"
+        self.access_token: Optional[str] = None
+        self.refresh_token: Optional[str] = None
+        self.uploads = 0
+
+    @property
+    def auth_headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.access_token}"}
+
+    async def request(
+        self, endpoint: str, method: str, url: str, **kwargs: Any
+    ) -> Optional[httpx.Response]:
+        """Send one request and record it under ``endpoint``."""
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.recorder.record(endpoint, None, time.perf_counter() - started)
+            return None
+        self.recorder.record(
+            endpoint, response.status_code, time.perf_counter() - started
+        )
+        return response
+
+    async def register(self) -> None:
+        await self.request(
+            "POST /auth/register",
+            "POST",
+            f"{API}/auth/register",
+            json={
+                "email": f"{self.username}@example.com",
+                "username": self.username,
+                "password": self.password,
+            },
+        )
+
+    async def login(self) -> None:
+        response = await self.request(
+            "POST /auth/login",
+            "POST",
+            f"{API}/auth/login",
+            params={"username": self.username, "password": self.password},
+        )
+        if response is not None and response.status_code == 200:
+            tokens = response.json()
+            self.access_token = tokens["access_token"]
+            self.refresh_token = tokens.get("refresh_token")
+
+    async def refresh(self) -> None:
+        if self.refresh_token is None:
+            return await self.login()
+        response = await self.request(
+            "POST /auth/refresh",
+            "POST",
+            f"{API}/auth/refresh",
+            params={"refresh_token": self.refresh_token},
+        )
+        if response is not None and response.status_code == 200:
+            self.access_token = response.json()["access_token"]
+
+    async def me(self) -> None:
+        await self.request(
+            "GET /auth/me", "GET", f"{API}/auth/me", headers=self.auth_headers
+        )
+
+
+def make_image(seed: str) -> bytes:
+    """A small PNG whose bytes differ for every seed, so each upload is new."""
+    from PIL import Image
+
+    rng = random.Random(seed)
+    image = Image.new("RGB", (320, 240), (rng.randrange(256), 128, 64))
+    for _ in range(32):
+        image.putpixel((rng.randrange(320), rng.randrange(240)), (255, 255, 255))
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+async def sign_up(user: VirtualUser) -> None:
+    await user.register()
+    await user.login()
+
+
+async def auth_mix_step(user: VirtualUser) -> None:
+    (step,) = random.choices(list(AUTH_MIX), weights=list(AUTH_MIX.values()))
+    await getattr(user, step)()
+
+
+async def upload_burst_step(user: VirtualUser) -> None:
+    async def upload() -> Optional[str]:
+        user.uploads += 1
+        image = make_image(f"{user.username}-{user.uploads}")
+        response = await user.request(
+            "POST /files/images",
+            "POST",
+            f"{API}/files/images",
+            headers=user.auth_headers,
+            files={"file": ("image.png", image, "image/png")},
+        )
+        if response is None or response.status_code != 202:
+            return None
+        return response.json()["original"]
+
+    filenames = await asyncio.gather(*(upload() for _ in range(UPLOAD_BURST_SIZE)))
+    for filename in filter(None, filenames):
+        await user.request(
+            "GET /files/images/{id}/status",
+            "GET",
+            f"{API}/files/images/{filename}/status",
+            headers=user.auth_headers,
+        )
+        await user.request(
+            "GET /files/{id}",
+            "GET",
+            f"{API}/files/{filename}",
+            headers=user.auth_headers,
+        )
+
+
+async def rate_limit_step(user: VirtualUser) -> None:
+    await user.request(
+        "GET /",
+        "GET",
+        "/",
+        headers={"X-User-ID": f"client-{user.index % RATE_LIMIT_CLIENTS}"},
+    )
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """What each virtual user does once, then repeatedly until time is up."""
+
+    description: str
+    step: Callable[[VirtualUser], Awaitable[None]]
+    setup: Optional[Callable[[VirtualUser], Awaitable[None]]] = None
+    rate_limited: bool = False
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "auth-mix": Scenario(
+        "register and log in, then a login/refresh/me mix",
+        auth_mix_step,
+        setup=sign_up,
+    ),
+    "upload-burst": Scenario(
+        "bursts of concurrent image uploads, then status and download",
+        upload_burst_step,
+        setup=sign_up,
+    ),
+    "rate-limit": Scenario(
+        "few clients hammering one route until the limiter saturates",
+        rate_limit_step,
+        rate_limited=True,
+    ),
+}
+
+
+async def run_scenario(
+    url: str, scenario: Scenario, concurrency: int, duration: float
+) -> List[dict]:
+    """Run ``concurrency`` virtual users for ``duration`` seconds and report."""
+    recorder = Recorder()
+    run_id = uuid.uuid4().hex[:8]
+    limits = httpx.Limits(
+        max_connections=concurrency, max_keepalive_connections=concurrency
+    )
+
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        deadline = started + duration
+
+        async def virtual_user(index: int) -> None:
+            user = VirtualUser(client, recorder, index, run_id)
+            if scenario.setup is not None:
+                await scenario.setup(user)
+            while time.perf_counter() < deadline:
+                await scenario.step(user)
+
+        await asyncio.gather(*(virtual_user(index) for index in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return recorder.report(elapsed)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_ready(url: str, process: subprocess.Popen, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with status {process.returncode}")
+        with contextlib.suppress(httpx.HTTPError):
+            if httpx.get(f"{url}/health", timeout=1).status_code == 200:
+                return
+        time.sleep(0.2)
+    raise RuntimeError(f"Server did not become ready within {timeout:.0f}s")
+
+
+@contextlib.contextmanager
+def local_server(
+    database_url: Optional[str], redis: Optional[str], rate_limited: bool
+) -> Iterator[str]:
+    """Run the app under uvicorn in a subprocess and yield its URL."""
+    with tempfile.TemporaryDirectory(prefix="loadtest-") as workdir:
+        port = _free_port()
+        env = {
+            **os.environ,
+            "DATABASE_URL": database_url or f"sqlite:///{workdir}/load.db",
+            "UPLOAD_DIR": f"{workdir}/uploads",
+            "API_RATE_LIMIT_ENABLED": "true" if rate_limited else "false",
+        }
+        env.pop("ASYNC_DATABASE_URL", None)
+        for name, default in (
+            ("SECRET_KEY", "load-test-secret"),
+            ("POSTGRES_USER", "postgres"),
+            ("POSTGRES_PASSWORD", "postgres"),
+            ("POSTGRES_DB", "postgres"),
+        ):
+            env.setdefault(name, default)
+
+        command = [
+            sys.executable,
+            "-m",
+            "benchmarks.load",
+            "serve",
+            "--port",
+            str(port),
+        ]
+        if redis is None:
+            command.append("--fake-redis")
+        else:
+            host, _, redis_port = redis.partition(":")
+            env["REDIS_HOST"] = host
+            env["REDIS_PORT"] = redis_port or "6379"
+
+        process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env)
+        url = f"http://127.0.0.1:{port}"
+        try:
+            _wait_until_ready(url, process, timeout=60)
+            yield url
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+
+def serve(port: int, fake_redis: bool) -> None:
+    """Serve the app with one uvicorn worker, creating its tables first."""
+    import uvicorn
+
+    from app.db.database import Base, engine
+    from app.main import app
+
+    Base.metadata.create_all(bind=engine)
+    if fake_redis:
+        import fakeredis.aioredis
+
+        from app.core.redis_client import redis_client
+
+        redis_client.use(fakeredis.aioredis.FakeRedis(decode_responses=True))
+
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Load-test the API with one scenario."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run a load scenario")
+    run.add_argument("scenario", choices=sorted(SCENARIOS))
+    run.add_argument("--concurrency", type=int, default=20, help="virtual users")
+    run.add_argument("--duration", type=float, default=30, help="seconds")
+    run.add_argument("--url", help="load this server instead of starting one")
+    run.add_argument("--database-url", help="database for the local server")
+    run.add_argument("--redis", help="host:port of a real Redis for the server")
+    run.add_argument("--json", type=Path, help="also write the report here")
+
+    server = commands.add_parser("serve", help=argparse.SUPPRESS)
+    server.add_argument("--port", type=int, required=True)
+    server.add_argument("--fake-redis", action="store_true")
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        serve(args.port, args.fake_redis)
+        return 0
+
+    scenario = SCENARIOS[args.scenario]
+    print(
+        f"{args.scenario}: {scenario.description} "
+        f"({args.concurrency} users, {args.duration:g}s)"
+    )
+    with contextlib.ExitStack() as stack:
+        url = args.url or stack.enter_context(
+            local_server(args.database_url, args.redis, scenario.rate_limited)
+        )
+        rows = asyncio.run(run_scenario(url, scenario, args.concurrency, args.duration))
+
+    print(format_report(rows))
+    if args.json is not None:
+        args.json.write_text(
+            json.dumps({"scenario": args.scenario, "results": rows}, indent=2)
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,112 @@
+"""
+Benchmark response serialization of user rows.
+
+Compares FastAPI's ``response_model`` path rendered with the stdlib encoder,
+the same path rendered with orjson, and ``ORMSerializer``. Run with:
+
+    python -m benchmarks.serialization
+"""
+
+import functools
+import json
+import timeit
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+import orjson
+from pydantic import TypeAdapter
+
+from app.models.user import User
+from app.schemas.user import User as UserSchema
+from app.schemas.user import user_serializer
+
+PAYLOAD_SIZES = (1, 1000)
+
+
+def make_users(count: int) -> List[User]:
+    """Build transient user rows, as a query would return them."""
+    created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        User(
+            id=index,
+            email=f"user{index}@example.com",
+            username=f"user{index}",
+            hashed_password="secret-hash",
+            is_active=True,
+            is_superuser=False,
+            created_at=created_at,
+            updated_at=created_at,
+        )
+        for index in range(count)
+    ]
+
+
+def serializers() -> Dict[str, Callable[[List[Any]], bytes]]:
+    """Serialization paths by name, each turning rows into response bytes."""
+    adapter = TypeAdapter(List[UserSchema])
+
+    def response_model(rows: List[Any]) -> List[Any]:
+        # What FastAPI does with a response_model: validate, then dump as JSON
+        return adapter.dump_python(
+            adapter.validate_python(rows, from_attributes=True), mode="json"
+        )
+
+    def stdlib_json(rows: List[Any]) -> bytes:
+        # JSONResponse.render
+        return json.dumps(
+            response_model(rows),
+            ensure_ascii=False,
+            allow_nan=False,
+            indent=None,
+            separators=(",", ":"),
+        ).encode("utf-8")
+
+    def orjson_response(rows: List[Any]) -> bytes:
+        # ORJSONResponse.render
+        return orjson.dumps(response_model(rows), option=orjson.OPT_NON_STR_KEYS)
+
+    return {
+        "response_model + json": stdlib_json,
+        "response_model + orjson": orjson_response,
+        "ORMSerializer": user_serializer.dumps_many,
+    }
+
+
+def measure(function: Callable[[], Any]) -> float:
+    """Best time per call, in seconds, over several runs."""
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=5, number=number)) / number
+
+
+def run() -> List[Dict[str, Any]]:
+    """Time every serialization path on each payload size."""
+    results = []
+    for size in PAYLOAD_SIZES:
+        rows = make_users(size)
+        baseline = None
+        for name, serialize in serializers().items():
+            seconds = measure(functools.partial(serialize, rows))
+            baseline = baseline or seconds
+            results.append(
+                {
+                    "rows": size,
+                    "serializer": name,
+                    "microseconds": seconds * 1e6,
+                    "speedup": baseline / seconds,
+                }
+            )
+    return results
+
+
+def main() -> None:
+    print(f"{'rows':>5}  {'serializer':<24} {'per call':>12}  speedup")
+    for result in run():
+        print(
+            f"{result['rows']:>5}  {result['serializer']:<24} "
+            f"{result['microseconds']:>10.1f}us  {result['speedup']:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
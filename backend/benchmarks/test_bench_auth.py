@@ -0,0 +1,68 @@
+"""
+Benchmarks for access tokens and password hashing.
+"""
+
+import pytest
+
+from app.core.hashing import PasswordHasher
+from app.core.security import get_password_hash, verify_password
+from app.core.token_cache import token_cache
+from app.services.auth import AuthService
+
+PASSWORD = "correct horse battery staple"
+
+
+@pytest.fixture
+def auth_service():
+    """An auth service for the token helpers, which need no session."""
+    return AuthService(None)
+
+
+@pytest.fixture(scope="module")
+def password_hash():
+    """A bcrypt hash of ``PASSWORD``."""
+    return get_password_hash(PASSWORD)
+
+
+def test_create_access_token(benchmark, auth_service):
+    """Sign an access token."""
+    benchmark(auth_service.create_access_token, {"sub": "alice", "user_id": 1})
+
+
+def test_verify_token_cold(benchmark, auth_service):
+    """Decode and verify a token the cache has not seen."""
+    token = auth_service.create_access_token({"sub": "alice", "user_id": 1})
+    result = benchmark.pedantic(
+        auth_service.verify_token,
+        args=(token,),
+        setup=token_cache.clear,
+        rounds=2000,
+    )
+    assert result.user_id == 1
+
+
+def test_verify_token_cached(benchmark, auth_service):
+    """Verify a token already decoded by this worker."""
+    token = auth_service.create_access_token({"sub": "alice", "user_id": 1})
+    auth_service.verify_token(token)
+    assert benchmark(auth_service.verify_token, token).user_id == 1
+
+
+def test_hash_password(benchmark):
+    """Hash a password with bcrypt in this process."""
+    benchmark.pedantic(get_password_hash, args=(PASSWORD,), rounds=5)
+
+
+def test_verify_password(benchmark, password_hash):
+    """Verify a password against its bcrypt hash in this process."""
+    assert benchmark.pedantic(verify_password, args=(PASSWORD, password_hash), rounds=5)
+
+
+def test_verify_password_in_pool(aio_benchmark, password_hash):
+    """Verify a password through the worker pool, including IPC overhead."""
+    hasher = PasswordHasher(max_workers=1)
+    hasher.start()
+    try:
+        assert aio_benchmark(hasher.verify, PASSWORD, password_hash)
+    finally:
+        hasher.shutdown()
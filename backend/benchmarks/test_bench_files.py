@@ -0,0 +1,114 @@
+"""
+Benchmarks for storing uploads and generating thumbnails.
+"""
+
+import asyncio
+import io
+import itertools
+
+import pytest
+from fastapi import UploadFile
+from PIL import Image
+from starlette.datastructures import Headers
+
+from app.services import file_upload
+from app.services.file_upload import FileUploadService
+from app.services.thumbnails import ThumbnailJobRunner, generate_thumbnails
+
+PNG_HEADER = b"\x89PNG\r\n\x1a\n"
+
+# Size of the generic uploads
+UPLOAD_SIZE = 256 * 1024
+
+
+def make_upload(content: bytes, content_type: str) -> UploadFile:
+    """An in-memory upload with the given body."""
+    return UploadFile(
+        file=io.BytesIO(content),
+        filename="upload",
+        headers=Headers({"content-type": content_type}),
+    )
+
+
+def make_image(seed: int, size=(800, 600), image_format: str = "PNG") -> bytes:
+    """Encode an image whose bytes differ for every seed."""
+    image = Image.new("RGB", size, (seed % 256, (seed // 256) % 256, 128))
+    image.putpixel((0, 0), (seed % 251, 0, 0))
+    buffer = io.BytesIO()
+    image.save(buffer, image_format)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def upload_service(async_session_factory, tmp_path):
+    """An upload service writing to a temporary directory."""
+    service = FileUploadService(session_factory=async_session_factory)
+    service.upload_dir = tmp_path / "uploads"
+    service.storage_quota = None
+    return service
+
+
+@pytest.fixture
+def thumbnail_runner(monkeypatch, run):
+    """A private thumbnail runner, drained and stopped after the benchmark."""
+    runner = ThumbnailJobRunner(max_workers=1)
+    monkeypatch.setattr(file_upload, "thumbnail_runner", runner)
+    yield runner
+    run(asyncio.gather(*runner._tasks, return_exceptions=True))
+    runner.shutdown()
+
+
+def test_save_file(benchmark, upload_service, run):
+    """Stream a new upload into content-addressed storage."""
+    counter = itertools.count()
+
+    def setup():
+        body = PNG_HEADER + next(counter).to_bytes(8, "big") * (UPLOAD_SIZE // 8)
+        return (make_upload(body, "image/png"),), {"user_id": 1}
+
+    filename = benchmark.pedantic(
+        lambda *args, **kwargs: run(upload_service.save_file(*args, **kwargs)),
+        setup=setup,
+        rounds=100,
+    )
+    assert filename
+
+
+def test_save_duplicate_file(benchmark, upload_service, run):
+    """Store an upload whose body is already stored."""
+    body = PNG_HEADER + b"x" * UPLOAD_SIZE
+
+    def setup():
+        return (make_upload(body, "image/png"),), {"user_id": 1}
+
+    benchmark.pedantic(
+        lambda *args, **kwargs: run(upload_service.save_file(*args, **kwargs)),
+        setup=setup,
+        rounds=100,
+    )
+
+
+def test_save_image_with_thumbnails(benchmark, upload_service, thumbnail_runner, run):
+    """Store a new image and queue its thumbnails."""
+    counter = itertools.count()
+
+    def setup():
+        return (make_upload(make_image(next(counter)), "image/png"),), {"user_id": 1}
+
+    result = benchmark.pedantic(
+        lambda *args, **kwargs: run(
+            upload_service.save_image_with_thumbnails(*args, **kwargs)
+        ),
+        setup=setup,
+        rounds=50,
+    )
+    assert result["status"] in ("pending", "ready")
+
+
+def test_generate_thumbnails(benchmark, tmp_path):
+    """Create every thumbnail variant of a 12-megapixel JPEG."""
+    source = tmp_path / "photo.jpg"
+    source.write_bytes(make_image(1, size=(4000, 3000), image_format="JPEG"))
+
+    result = benchmark.pedantic(generate_thumbnails, args=(str(source),), rounds=5)
+    assert set(result["thumbnails"]) == {"large", "medium", "small"}
@@ -0,0 +1,51 @@
+"""
+Benchmarks for rate limit checks against an in-memory Redis.
+"""
+
+import pytest
+
+from app.middleware.rate_limit import HybridRateLimiter, RateLimiter
+
+# High enough that no benchmark round is ever rejected
+LIMIT = {"requests": 10**9, "window": 60}
+
+
+@pytest.fixture
+def limiter(fake_redis):
+    """A Redis-only rate limiter."""
+    rate_limiter = RateLimiter(fake_redis)
+    rate_limiter.rate_limits["api"] = LIMIT
+    return rate_limiter
+
+
+@pytest.fixture
+def hybrid_limiter(fake_redis, run):
+    """A rate limiter with its local tier running."""
+    rate_limiter = HybridRateLimiter(fake_redis)
+    rate_limiter.rate_limits["api"] = LIMIT
+
+    async def start():
+        rate_limiter.start()
+
+    run(start())
+    yield rate_limiter
+    run(rate_limiter.stop())
+
+
+def test_is_rate_limited(aio_benchmark, limiter):
+    """Check and count one request with a Redis script call."""
+    is_limited, _ = aio_benchmark(limiter.is_rate_limited, "client", "api")
+    assert not is_limited
+
+
+def test_is_rate_limited_rejected(aio_benchmark, limiter):
+    """Check a client that is already over its limit."""
+    limiter.rate_limits["auth"] = {"requests": 1, "window": 60}
+    is_limited, _ = aio_benchmark(limiter.is_rate_limited, "client", "auth")
+    assert is_limited
+
+
+def test_hybrid_is_rate_limited(aio_benchmark, hybrid_limiter):
+    """Check one request, admitted from the local token bucket when possible."""
+    is_limited, _ = aio_benchmark(hybrid_limiter.is_rate_limited, "client", "api")
+    assert not is_limited
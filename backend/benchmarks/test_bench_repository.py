@@ -0,0 +1,34 @@
+"""
+Benchmarks for user repository lookups on SQLite.
+"""
+
+from app.repositories.user_repository import UserRepository
+
+
+def test_get_by_id(benchmark, db):
+    """Look a user up by primary key."""
+    assert benchmark(UserRepository(db).get_by_id, 500) is not None
+
+
+def test_get_by_username(benchmark, db):
+    """Look a user up by unique username."""
+    assert benchmark(UserRepository(db).get_by_username, "user500") is not None
+
+
+def test_get_by_email(benchmark, db):
+    """Look a user up by unique email."""
+    assert benchmark(UserRepository(db).get_by_email, "user500@example.com")
+
+
+def test_user_exists(benchmark, db):
+    """Check a username/email pair for registration."""
+    assert benchmark(UserRepository(db).user_exists, "user500", "new@example.com")
+
+
+def test_paginate_users(benchmark, db):
+    """Fetch one 50-row keyset page from the middle of the table."""
+    repository = UserRepository(db)
+    cursor = repository.paginate(page_size=500).next_cursor
+
+    page = benchmark(repository.paginate, cursor=cursor, page_size=50)
+    assert len(page.items) == 50
@@ -0,0 +1,18 @@
+"""
+Benchmarks for response serialization.
+"""
+
+import pytest
+
+from benchmarks.serialization import make_users, serializers
+
+
+@pytest.mark.parametrize("size", [1, 1000])
+@pytest.mark.parametrize("name", list(serializers()))
+def test_serialize_users(benchmark, name, size):
+    """Encode user rows for a response."""
+    serialize = serializers()[name]
+    rows = make_users(size)
+    benchmark.group = f"serialize {size} users"
+
+    assert benchmark(serialize, rows)
@@ -0,0 +1,125 @@
+"""
+Test cases for the admin listing and export routes.
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1.admin import router
+from app.core.identity_cache import CachedUser
+from app.db.database import Base, get_db
+from app.repositories.user_repository import AuditLogRepository, UserRepository
+from app.services.auth import get_current_user
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Provide sessions on a fresh SQLite database with users and audit logs."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'admin.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    with factory() as db:
+        UserRepository(db).create_many(
+            {
+                "email": f"user{index}@example.com",
+                "username": f"user{index}",
+                "hashed_password": "x",
+            }
+            for index in range(5)
+        )
+        AuditLogRepository(db).create_many(
+            {
+                "user_id": 1,
+                "action": "USER_LOGIN",
+                "resource": "auth",
+                "created_at": datetime(2024, 1, 1) + timedelta(hours=index),
+            }
+            for index in range(5)
+        )
+    yield factory
+    engine.dispose()
+
+
+def make_client(session_factory, is_superuser: bool = True) -> TestClient:
+    """Build an app serving the admin routes as the given kind of user."""
+    app = FastAPI()
+    app.include_router(router)
+
+    def get_test_db():
+        with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = get_test_db
+    app.dependency_overrides[get_current_user] = lambda: CachedUser(
+        id=1,
+        username="admin",
+        email="admin@example.com",
+        is_active=True,
+        is_superuser=is_superuser,
+    )
+    return TestClient(app)
+
+
+def fetch_all(client: TestClient, path: str) -> list:
+    """Follow a listing's cursors and collect every item."""
+    items, params = [], {"limit": 2}
+    while True:
+        response = client.get(path, params=params)
+        assert response.status_code == 200
+        page = response.json()
+        items.extend(page["items"])
+        if page["next_cursor"] is None:
+            return items
+        params["cursor"] = page["next_cursor"]
+
+
+def test_users_cursor_round_trip(session_factory):
+    """Test following cursors visits every user once, in order."""
+    users = fetch_all(make_client(session_factory), "/admin/users")
+
+    assert [user["id"] for user in users] == [1, 2, 3, 4, 5]
+
+
+def test_audit_logs_cursor_round_trip(session_factory):
+    """Test following cursors visits every audit log once, newest first."""
+    logs = fetch_all(make_client(session_factory), "/admin/audit-logs")
+
+    assert [log["id"] for log in logs] == [5, 4, 3, 2, 1]
+
+
+@pytest.mark.parametrize("path", ["/admin/users", "/admin/audit-logs"])
+def test_invalid_cursor_rejected(session_factory, path):
+    """Test a malformed cursor is a client error."""
+    response = make_client(session_factory).get(path, params={"cursor": "bogus"})
+
+    assert response.status_code == 400
+
+
+def test_export_uses_request_session(session_factory):
+    """Test exports read through the request's database session."""
+    response = make_client(session_factory).get("/admin/users/export")
+
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert [json.loads(line)["username"] for line in lines] == [
+        f"user{index}" for index in range(5)
+    ]
+
+
+@pytest.mark.parametrize(
+    "path", ["/admin/users", "/admin/users/export", "/admin/audit-logs"]
+)
+def test_non_superuser_forbidden(session_factory, path):
+    """Test the admin routes refuse regular users."""
+    response = make_client(session_factory, is_superuser=False).get(path)
+
+    assert response.status_code == 403
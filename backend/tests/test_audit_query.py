@@ -0,0 +1,121 @@
+"""
+Test cases for audit log partitioning and the audit query API.
+"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.schema import CreateTable
+
+from app.db.database import Base
+from app.db.partitions import add_months, ensure_monthly_partitions
+from app.models.user import AuditLog
+from app.repositories.user_repository import AuditLogRepository
+
+START = datetime(2024, 1, 1)
+
+
+@pytest.fixture
+def test_db(tmp_path):
+    """Provide a session on a fresh SQLite database with sample audit logs."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'audit.db'}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, expire_on_commit=False)()
+    AuditLogRepository(db).create_many(
+        {
+            "user_id": index % 3,
+            "action": "USER_LOGIN" if index % 2 else "USER_LOGOUT",
+            "resource": "auth",
+            "created_at": START + timedelta(hours=index),
+        }
+        for index in range(60)
+    )
+    yield db
+    db.close()
+    engine.dispose()
+
+
+def test_add_months():
+    """Test month arithmetic wraps across years."""
+    assert add_months(date(2024, 11, 15), 0) == date(2024, 11, 1)
+    assert add_months(date(2024, 11, 15), 2) == date(2025, 1, 1)
+
+
+def test_postgres_table_is_partitioned():
+    """Test the PostgreSQL DDL partitions by month and keys on created_at."""
+    ddl = str(CreateTable(AuditLog.__table__).compile(dialect=postgresql.dialect()))
+
+    assert "PRIMARY KEY (id, created_at)" in ddl
+    assert "PARTITION BY RANGE (created_at)" in ddl
+
+
+class RecordingConnection:
+    """A PostgreSQL connection stand-in that records the SQL it runs."""
+
+    dialect = postgresql.dialect()
+
+    def __init__(self, partitions):
+        self.partitions = partitions
+        self.statements = []
+
+    def execute(self, statement, parameters=None):
+        self.statements.append(" ".join(str(statement).split()))
+
+    def scalars(self, statement, parameters=None):
+        return self.partitions
+
+
+def test_ensure_monthly_partitions():
+    """Test missing partitions take their rows from the default partition."""
+    conn = RecordingConnection(["audit_logs_y2024m12", "audit_logs_default"])
+
+    names = ensure_monthly_partitions(
+        conn, AuditLog.__table__, months_ahead=2, today=date(2024, 12, 20)
+    )
+
+    assert names == [
+        "audit_logs_y2024m12",
+        "audit_logs_y2025m01",
+        "audit_logs_y2025m02",
+    ]
+    assert conn.statements[1].endswith("PARTITION OF audit_logs DEFAULT")
+    created = [s for s in conn.statements if s.startswith("CREATE TABLE audit")]
+    assert created == [
+        "CREATE TABLE audit_logs_y2025m01 (LIKE audit_logs)",
+        "CREATE TABLE audit_logs_y2025m02 (LIKE audit_logs)",
+    ]
+    move, attach = conn.statements[3:5]
+    assert "DELETE FROM audit_logs_default" in move
+    assert "created_at >= '2025-01-01' AND created_at < '2025-02-01'" in move
+    assert move.endswith("INSERT INTO audit_logs_y2025m01 SELECT * FROM moved")
+    assert attach == (
+        "ALTER TABLE audit_logs ATTACH PARTITION audit_logs_y2025m01 "
+        "FOR VALUES FROM ('2025-01-01') TO ('2025-02-01')"
+    )
+
+
+def test_search_filters_and_pages(test_db):
+    """Test filtered queries page newest first without gaps or repeats."""
+    repository = AuditLogRepository(test_db)
+    filters = {
+        "user_id": 1,
+        "action": "USER_LOGIN",
+        "since": START + timedelta(hours=6),
+        "until": START + timedelta(hours=50),
+    }
+
+    seen, cursor = [], None
+    while True:
+        page = repository.search(cursor=cursor, page_size=3, **filters)
+        seen.extend(page.items)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    expected = [index for index in range(6, 50) if index % 3 == 1 and index % 2 == 1]
+    assert [log.created_at for log in seen] == [
+        START + timedelta(hours=index) for index in reversed(expected)
+    ]
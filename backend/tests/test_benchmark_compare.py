@@ -0,0 +1,68 @@
+"""
+Test cases for benchmark baseline comparison.
+"""
+
+import json
+
+from benchmarks.compare import compare, load_stats, main
+
+
+def write_results(path, medians):
+    """Write a pytest-benchmark style results file."""
+    path.write_text(
+        json.dumps(
+            {
+                "benchmarks": [
+                    {
+                        "fullname": name,
+                        "stats": {
+                            "min": median,
+                            "median": median,
+                            "mean": median,
+                            "stddev": 0.0,
+                            "rounds": 10,
+                        },
+                    }
+                    for name, median in medians.items()
+                ]
+            }
+        )
+    )
+
+
+def test_compare_flags_changes_beyond_threshold():
+    """Test each benchmark is classified against the threshold."""
+    baseline = {name: {"median": 1.0} for name in ("slow", "fast", "same", "gone")}
+    current = {
+        "slow": {"median": 1.5},
+        "fast": {"median": 0.5},
+        "same": {"median": 1.1},
+        "added": {"median": 1.0},
+    }
+
+    statuses = {
+        row["name"]: row["status"] for row in compare(baseline, current, threshold=0.2)
+    }
+
+    assert statuses == {
+        "slow": "regression",
+        "fast": "improved",
+        "same": "ok",
+        "gone": "missing",
+        "added": "new",
+    }
+
+
+def test_save_and_check(tmp_path, capsys):
+    """Test a saved baseline round-trips and regressions fail the check."""
+    results = tmp_path / "results.json"
+    baseline = tmp_path / "baselines" / "local.json"
+    write_results(results, {"bench_a": 0.001, "bench_b": 0.002})
+
+    assert main(["save", str(results), str(baseline)]) == 0
+    assert load_stats(baseline) == load_stats(results)
+    assert main(["check", str(baseline), str(results)]) == 0
+
+    write_results(results, {"bench_a": 0.001, "bench_b": 0.003})
+    assert main(["check", str(baseline), str(results), "--threshold", "0.1"]) == 1
+    assert "1 benchmark(s) regressed" in capsys.readouterr().out
@@ -0,0 +1,170 @@
+"""
+Test cases for bulk repository operations.
+"""
+
+import pytest
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.models.user import AuditLog, User
+from app.repositories import UPSERT_INSERTS, unit_of_work
+from app.repositories.user_repository import AuditLogRepository, UserRepository
+
+
+@pytest.fixture
+def test_db(tmp_path):
+    """Provide a session on a fresh SQLite database that counts statements."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'bulk.db'}")
+    Base.metadata.create_all(bind=engine)
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    db = sessionmaker(bind=engine, expire_on_commit=False)()
+    db.info["statements"] = statements
+    yield db
+    db.close()
+    engine.dispose()
+
+
+def user_rows(count: int, start: int = 0):
+    """Generate user rows for bulk inserts."""
+    for index in range(start, start + count):
+        yield {
+            "email": f"user{index}@example.com",
+            "username": f"user{index}",
+            "hashed_password": "x",
+        }
+
+
+def count_users(db) -> int:
+    """Count rows in the users table."""
+    return db.scalar(select(func.count()).select_from(User))
+
+
+def test_create_many_returns_ids_in_order(test_db):
+    """Test bulk inserts are chunked and return generated IDs."""
+    statements = test_db.info["statements"]
+    statements.clear()
+
+    ids = UserRepository(test_db).create_many(user_rows(250), batch_size=100)
+
+    assert ids == list(range(1, 251))
+    assert count_users(test_db) == 250
+    assert sum(statement.startswith("INSERT") for statement in statements) == 3
+    assert test_db.get(User, 1).is_active is True
+
+
+def test_update_many(test_db):
+    """Test bulk updates by primary key only touch the given columns."""
+    repo = UserRepository(test_db)
+    ids = repo.create_many(user_rows(10))
+
+    updated = repo.update_many(
+        {"id": user_id, "is_active": False} for user_id in ids[:4]
+    )
+
+    assert updated == 4
+    inactive = test_db.scalars(select(User.id).where(User.is_active.is_(False))).all()
+    assert sorted(inactive) == ids[:4]
+    assert (
+        test_db.scalar(select(User.email).where(User.id == ids[0]))
+        == "user0@example.com"
+    )
+
+
+def test_upsert_many(test_db):
+    """Test upserts insert new rows and update conflicting ones."""
+    repo = UserRepository(test_db)
+    repo.create_many(user_rows(3))
+
+    rows = [
+        {
+            "email": "user0@example.com",
+            "username": "user0",
+            "hashed_password": "x",
+            "full_name": "Zero",
+        },
+        {
+            "email": "new@example.com",
+            "username": "new",
+            "hashed_password": "x",
+            "full_name": "New",
+        },
+    ]
+    ids = repo.upsert_many(
+        rows, conflict_columns=["email"], update_columns=["full_name"]
+    )
+
+    assert len(ids) == 2
+    assert count_users(test_db) == 4
+    assert test_db.scalar(select(User.full_name).where(User.id == 1)) == "Zero"
+    assert test_db.scalar(select(User.updated_at).where(User.id == 1)) is not None
+
+
+def test_upsert_many_without_on_conflict(test_db, monkeypatch):
+    """Test dialects without ON CONFLICT upsert by looking rows up first."""
+    monkeypatch.delitem(UPSERT_INSERTS, "sqlite")
+    repo = UserRepository(test_db)
+    repo.create_many(user_rows(3))
+
+    rows = [
+        {"email": "user0@example.com", "username": "user0", "full_name": "Zero"},
+        {"email": "new@example.com", "username": "new", "full_name": "New"},
+    ]
+    ids = repo.upsert_many(
+        [{**row, "hashed_password": "x"} for row in rows],
+        conflict_columns=["email"],
+        update_columns=["full_name"],
+    )
+
+    assert sorted(ids) == [1, 4]
+    assert count_users(test_db) == 4
+    assert test_db.scalar(select(User.full_name).where(User.id == 1)) == "Zero"
+    assert test_db.scalar(select(User.updated_at).where(User.id == 1)) is not None
+    assert test_db.scalar(select(User.full_name).where(User.id == 4)) == "New"
+
+
+def test_upsert_without_update_columns_skips_conflicts(test_db):
+    """Test upserts of conflict columns only leave existing rows alone."""
+    repo = UserRepository(test_db)
+    repo.create_many(user_rows(2))
+
+    repo.upsert_many(
+        [{"email": "user0@example.com", "username": "other", "hashed_password": "y"}],
+        conflict_columns=["email"],
+        update_columns=[],
+    )
+
+    assert test_db.scalar(select(User.username).where(User.id == 1)) == "user0"
+
+
+def test_delete_where_in_batches(test_db):
+    """Test batched deletes remove every matching row and nothing else."""
+    repo = AuditLogRepository(test_db)
+    repo.create_many(
+        {"action": "USER_LOGIN" if index % 3 else "USER_LOGOUT", "resource": "auth"}
+        for index in range(100)
+    )
+
+    deleted = repo.delete_where(AuditLog.action == "USER_LOGIN", batch_size=10)
+
+    assert deleted == 66
+    remaining = test_db.scalars(select(AuditLog.action).distinct()).all()
+    assert remaining == ["USER_LOGOUT"]
+
+
+def test_bulk_writes_join_unit_of_work(test_db):
+    """Test bulk writes roll back with the enclosing unit of work."""
+    repo = UserRepository(test_db)
+
+    with pytest.raises(RuntimeError):
+        with unit_of_work(test_db):
+            repo.create_many(user_rows(5))
+            repo.delete_where(User.username == "user0")
+            raise RuntimeError("abort")
+
+    assert count_users(test_db) == 0
@@ -0,0 +1,25 @@
+"""
+Test cases for database configuration helpers.
+"""
+
+import pytest
+
+from app.db.database import make_async_url
+
+
+def test_make_async_url_swaps_driver():
+    """Test sync URLs are translated to their async drivers."""
+    assert (
+        make_async_url("postgresql://user:secret@db:5432/app_db")
+        == "postgresql+asyncpg://user:secret@db:5432/app_db"
+    )
+    assert make_async_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+    assert make_async_url("sqlite+aiosqlite:///./test.db") == (
+        "sqlite+aiosqlite:///./test.db"
+    )
+
+
+def test_make_async_url_rejects_unknown_backend():
+    """Test backends without an async driver are rejected."""
+    with pytest.raises(ValueError):
+        make_async_url("mysql://user@db/app_db")
@@ -0,0 +1,86 @@
+"""
+Test cases for conditional and ranged file responses.
+"""
+
+import os
+
+import pytest
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+
+from app.core.file_response import file_response, parse_range
+
+BODY = bytes(range(256)) * 4
+ETAG = '"abc123"'
+
+
+@pytest.fixture
+def client(tmp_path):
+    """Provide a client for an app serving one file through ``file_response``."""
+    path = tmp_path / "blob"
+    path.write_bytes(BODY)
+    app = FastAPI()
+
+    @app.api_route("/file", methods=["GET", "HEAD"])
+    async def serve(request: Request):
+        return file_response(
+            request, path, os.stat(path), etag=ETAG, media_type="application/pdf"
+        )
+
+    return TestClient(app)
+
+
+def test_parse_range():
+    """Test single byte ranges are parsed and others ignored."""
+    assert parse_range("bytes=0-99", 1000) == (0, 99)
+    assert parse_range("bytes=900-", 1000) == (900, 999)
+    assert parse_range("bytes=-100", 1000) == (900, 999)
+    assert parse_range("bytes=990-2000", 1000) == (990, 999)
+    assert parse_range("bytes=0-1,5-6", 1000) is None
+    assert parse_range("items=0-1", 1000) is None
+    with pytest.raises(HTTPException) as exc_info:
+        parse_range("bytes=1000-", 1000)
+    assert exc_info.value.headers["Content-Range"] == "bytes */1000"
+
+
+def test_full_response_headers(client):
+    """Test full responses carry validators and immutable caching."""
+    response = client.get("/file")
+
+    assert response.status_code == 200
+    assert response.content == BODY
+    assert response.headers["etag"] == ETAG
+    assert response.headers["accept-ranges"] == "bytes"
+    assert "immutable" in response.headers["cache-control"]
+
+
+def test_range_request(client):
+    """Test a single range is answered with 206 and the requested bytes."""
+    response = client.get("/file", headers={"Range": "bytes=100-199"})
+
+    assert response.status_code == 206
+    assert response.content == BODY[100:200]
+    assert response.headers["content-range"] == f"bytes 100-199/{len(BODY)}"
+    assert response.headers["content-length"] == "100"
+
+
+def test_stale_if_range_serves_full_body(client):
+    """Test ranges are ignored when If-Range no longer matches."""
+    response = client.get(
+        "/file", headers={"Range": "bytes=0-9", "If-Range": '"other"'}
+    )
+
+    assert response.status_code == 200
+    assert response.content == BODY
+
+
+def test_conditional_requests(client):
+    """Test matching validators are answered with 304."""
+    last_modified = client.get("/file").headers["last-modified"]
+
+    assert client.get("/file", headers={"If-None-Match": ETAG}).status_code == 304
+    assert (
+        client.get("/file", headers={"If-Modified-Since": last_modified}).status_code
+        == 304
+    )
+    assert client.get("/file", headers={"If-None-Match": '"x"'}).status_code == 200
@@ -0,0 +1,240 @@
+"""
+Test cases for the file upload service.
+"""
+
+import hashlib
+import io
+import os
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException, UploadFile, status
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from starlette.datastructures import Headers
+
+from app.db.database import Base
+from app.repositories.file_repository import AsyncFileRepository
+from app.services.file_upload import FileUploadService
+
+PNG_HEADER = b"\x89PNG\r\n\x1a\n"
+
+
+def make_upload(content: bytes, content_type: str = "image/png") -> UploadFile:
+    """Create an in-memory upload with the given body."""
+    return UploadFile(
+        file=io.BytesIO(content),
+        filename="avatar.png",
+        headers=Headers({"content-type": content_type}),
+    )
+
+
+@pytest_asyncio.fixture
+async def upload_service(tmp_path):
+    """Provide an upload service writing to a temporary directory and index."""
+    database = tmp_path / "files.db"
+    sync_engine = create_engine(f"sqlite:///{database}")
+    Base.metadata.create_all(bind=sync_engine)
+    sync_engine.dispose()
+    engine = create_async_engine(f"sqlite+aiosqlite:///{database}")
+
+    service = FileUploadService(
+        session_factory=async_sessionmaker(bind=engine, expire_on_commit=False)
+    )
+    service.upload_dir = tmp_path / "uploads"
+    service.chunk_size = 16
+    yield service
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_store_upload_streams_to_disk(upload_service):
+    """Test uploads are written in chunks with hash and sniffed type."""
+    content = PNG_HEADER + b"x" * 100
+
+    stored = await upload_service.store_upload(make_upload(content), user_id=1)
+
+    sha256 = hashlib.sha256(content).hexdigest()
+    blob_path = upload_service.blob_path(sha256)
+    assert blob_path.parent.parent.name == sha256[:2]
+    assert blob_path.read_bytes() == content
+    assert await upload_service.get_file(stored.filename) == blob_path
+    assert stored.size == len(content)
+    assert stored.sha256 == sha256
+    assert stored.content_type == "image/png"
+    assert stored.new_blob
+    assert not list(upload_service.temp_dir.iterdir())
+
+
+@pytest.mark.asyncio
+async def test_oversized_upload_aborts(upload_service):
+    """Test uploads are rejected once they cross the size limit."""
+    upload_service.max_file_size = 64
+
+    with pytest.raises(HTTPException) as exc_info:
+        await upload_service.store_upload(make_upload(PNG_HEADER + b"x" * 100))
+
+    assert exc_info.value.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    assert not list(upload_service.temp_dir.iterdir())
+
+
+@pytest.mark.asyncio
+async def test_content_is_sniffed(upload_service):
+    """Test a body that does not match an allowed type is rejected."""
+    with pytest.raises(HTTPException) as exc_info:
+        await upload_service.store_upload(make_upload(b"<html>not an image"))
+
+    assert exc_info.value.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+
+
+@pytest.mark.asyncio
+async def test_identical_uploads_share_a_blob(upload_service):
+    """Test the same body uploaded twice is stored once."""
+    content = PNG_HEADER + b"same avatar"
+
+    first = await upload_service.store_upload(make_upload(content), user_id=1)
+    second = await upload_service.store_upload(make_upload(content), user_id=2)
+
+    assert first.filename != second.filename
+    assert first.new_blob and not second.new_blob
+    assert await upload_service.get_file(
+        first.filename
+    ) == await upload_service.get_file(second.filename)
+    assert len(list(upload_service.blob_dir.rglob("*"))) == 3  # two shards + blob
+
+
+@pytest.mark.asyncio
+async def test_duplicate_upload_keeps_existing_blob(upload_service):
+    """Test a duplicate upload leaves the stored blob and its mtime alone."""
+    content = PNG_HEADER + b"cached"
+    first = await upload_service.store_upload(make_upload(content), user_id=1)
+    blob_path = upload_service.blob_path(first.sha256)
+    os.utime(blob_path, (1_000_000, 1_000_000))
+
+    await upload_service.store_upload(make_upload(content), user_id=2)
+
+    assert blob_path.stat().st_mtime == 1_000_000
+    assert list(upload_service.temp_dir.glob("*.part")) == []
+
+
+@pytest.mark.asyncio
+async def test_blob_removed_with_last_reference(upload_service):
+    """Test deleting files only removes the blob once nothing points at it."""
+    content = PNG_HEADER + b"shared"
+    first = await upload_service.store_upload(make_upload(content), user_id=1)
+    await upload_service.store_upload(make_upload(content), user_id=2)
+    await upload_service.store_upload(make_upload(content), user_id=2)
+    blob_path = upload_service.blob_path(first.sha256)
+
+    assert await upload_service.delete_file(first.filename)
+    assert not await upload_service.delete_file(first.filename)
+    assert blob_path.exists()
+
+    assert len(await upload_service.delete_user_files(2)) == 2
+    assert not blob_path.exists()
+
+
+@pytest.mark.asyncio
+async def test_upload_restores_blob_removed_by_release(upload_service, monkeypatch):
+    """Test an upload racing a release still leaves its blob on disk."""
+    content = PNG_HEADER + b"race"
+    first = await upload_service.store_upload(make_upload(content), user_id=1)
+    blob_path = upload_service.blob_path(first.sha256)
+    add_reference = AsyncFileRepository.add_reference
+
+    async def release_then_add(repository, *args, **kwargs):
+        # The last reference is released and its body unlinked meanwhile
+        entry = await repository.get_with_blob(first.filename)
+        await repository.remove_references([entry[0]])
+        blob_path.unlink()
+        return await add_reference(repository, *args, **kwargs)
+
+    monkeypatch.setattr(AsyncFileRepository, "add_reference", release_then_add)
+    second = await upload_service.store_upload(make_upload(content), user_id=2)
+
+    assert second.new_blob
+    assert await upload_service.get_file(second.filename) == blob_path
+    assert blob_path.read_bytes() == content
+
+
+@pytest.mark.asyncio
+async def test_release_keeps_blob_referenced_again(upload_service):
+    """Test a blob re-added after its row was deleted is not removed."""
+    content = PNG_HEADER + b"readded"
+    first = await upload_service.store_upload(make_upload(content), user_id=1)
+    blob_path = upload_service.blob_path(first.sha256)
+    async with upload_service.session_factory() as db:
+        entry = await AsyncFileRepository(db).get_with_blob(first.filename)
+        await AsyncFileRepository(db).remove_references([entry[0]])
+        # A concurrent upload commits before the release removes the body
+        await AsyncFileRepository(db).add_reference(
+            "readded", first.sha256, first.size, first.content_type, user_id=2
+        )
+
+    await upload_service._remove_blob(first.sha256)
+
+    assert blob_path.read_bytes() == content
+    assert list(blob_path.parent.iterdir()) == [blob_path]
+
+
+@pytest.mark.asyncio
+async def test_locate_file_uses_content_hash_etag(upload_service):
+    """Test files and their variants resolve to blob paths with strong ETags."""
+    content = PNG_HEADER + b"etag"
+    stored = await upload_service.store_upload(make_upload(content), user_id=1)
+
+    location = await upload_service.locate_file(stored.filename)
+    assert location.etag == f'"{stored.sha256}"'
+    assert location.content_type == "image/png"
+
+    # Variants only resolve once their thumbnail exists
+    assert await upload_service.locate_file(f"thumb_small_{stored.filename}") is None
+    location.path.with_name(f"thumb_small_{stored.sha256}").write_bytes(b"jpeg")
+    variant = await upload_service.locate_file(f"thumb_small_{stored.filename}")
+    assert variant.etag == f'"{stored.sha256}-small"'
+    assert variant.content_type == "image/jpeg"
+
+
+@pytest.mark.asyncio
+async def test_thumbnail_status_only_shown_to_owner(upload_service):
+    """Test another user cannot see an image's thumbnail status."""
+    stored = await upload_service.store_upload(make_upload(PNG_HEADER), user_id=1)
+
+    job = await upload_service.get_thumbnail_status(stored.filename, user_id=1)
+    assert job == {"status": "pending"}
+    assert await upload_service.get_thumbnail_status(stored.filename, user_id=2) is None
+
+
+@pytest.mark.asyncio
+async def test_user_files_listed_and_deleted_in_batches(upload_service):
+    """Test listing and batch deletion only touch the user's own files."""
+    upload_service.delete_batch_size = 2
+    for index in range(5):
+        await upload_service.store_upload(
+            make_upload(PNG_HEADER + bytes([index])), user_id=1
+        )
+    other = await upload_service.store_upload(make_upload(PNG_HEADER), user_id=2)
+
+    files = await upload_service.list_user_files(1)
+    assert len(files) == 5
+    assert await upload_service.get_usage(1) == 5 * (len(PNG_HEADER) + 1)
+
+    assert len(await upload_service.delete_user_files(1)) == 5
+    assert await upload_service.list_user_files(1) == []
+    assert await upload_service.get_file(other.filename) is not None
+
+
+@pytest.mark.asyncio
+async def test_storage_quota_enforced(upload_service):
+    """Test uploads beyond a user's storage quota are rejected."""
+    upload_service.storage_quota = 64
+    await upload_service.store_upload(make_upload(PNG_HEADER + b"x" * 40), user_id=1)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await upload_service.store_upload(
+            make_upload(PNG_HEADER + b"y" * 40), user_id=1
+        )
+
+    assert exc_info.value.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    assert "quota" in exc_info.value.detail
+    assert await upload_service.get_usage(1) == len(PNG_HEADER) + 40
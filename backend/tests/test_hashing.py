@@ -0,0 +1,88 @@
+"""
+Test cases for the password hashing executor.
+"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException, status
+
+from app.core.hashing import PasswordHasher, password_hasher
+from app.models.user import User
+
+
+@pytest.fixture
+def hasher():
+    """Provide a single-worker password hasher."""
+    password_hasher = PasswordHasher(max_workers=1, max_pending=4)
+    yield password_hasher
+    password_hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_round_trip(hasher):
+    """Test hashing in the pool produces a verifiable hash."""
+    hashed = await hasher.hash("testpassword123")
+
+    assert hashed != "testpassword123"
+    assert await hasher.verify("testpassword123", hashed)
+    assert not await hasher.verify("wrongpassword", hashed)
+    assert hasher.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_limit_sheds_load(hasher):
+    """Test calls beyond the queue limit are rejected with 503."""
+    hasher.max_pending = 0
+
+    with pytest.raises(HTTPException) as exc_info:
+        await hasher.hash("testpassword123")
+
+    assert exc_info.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert exc_info.value.headers["Retry-After"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_hash_many_preserves_order():
+    """Test batch hashing returns one verifiable hash per password, in order."""
+    hasher = PasswordHasher(max_workers=2, max_pending=4)
+    try:
+        passwords = ["first-password", "second-password", "third-password"]
+        hashes = await hasher.hash_many(passwords)
+
+        assert len(hashes) == 3
+        for password, hashed in zip(passwords, hashes, strict=True):
+            assert await hasher.verify(password, hashed)
+        assert await hasher.hash_many([]) == []
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_hash_many_leaves_a_worker_for_logins():
+    """Test a verify is not queued behind a batch, whose passwords all count."""
+    hasher = PasswordHasher(max_workers=2, max_pending=16, chunk_size=2)
+    try:
+        hashed = await hasher.hash("login-password")
+        batch = asyncio.create_task(hasher.hash_many([f"user-{i}" for i in range(8)]))
+        while not hasher.pending:
+            await asyncio.sleep(0.01)
+
+        assert hasher.pending == 2
+        assert await hasher.verify("login-password", hashed)
+        assert not batch.done()
+        assert len(await batch) == 8
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_user_model_helpers_use_pool():
+    """Test the model's password helpers run in the shared hashing pool."""
+    try:
+        hashed = await User.get_password_hash("testpassword123")
+
+        assert password_hasher._executor is not None
+        assert await User.verify_password("testpassword123", hashed)
+    finally:
+        password_hasher.shutdown()
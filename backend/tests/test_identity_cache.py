@@ -0,0 +1,86 @@
+"""
+Test cases for the user identity cache.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.identity_cache import IdentityCache, identity_cache
+from app.db.database import Base
+from app.repositories.user_repository import AsyncUserRepository
+
+
+def make_user(user_id: int = 1, is_active: bool = True) -> SimpleNamespace:
+    """Create a stand-in for a ``User`` row."""
+    return SimpleNamespace(
+        id=user_id,
+        username=f"user{user_id}",
+        email=f"user{user_id}@example.com",
+        is_active=is_active,
+        is_superuser=False,
+        created_at=None,
+        updated_at=None,
+    )
+
+
+def test_cached_identity_is_reused():
+    """Test a cached snapshot is returned until invalidated."""
+    cache = IdentityCache()
+    cache.set(make_user())
+
+    assert cache.get(1).username == "user1"
+
+    cache.invalidate(1)
+    assert cache.get(1) is None
+    assert cache.stats == {"hits": 1, "misses": 1, "size": 0}
+
+
+def test_entry_expires_after_ttl():
+    """Test snapshots are not served past the TTL."""
+    cache = IdentityCache(ttl_seconds=0)
+    cache.set(make_user())
+
+    assert cache.get(1) is None
+
+
+def test_stale_read_is_not_cached():
+    """Test a row read before an invalidation is not cached afterwards."""
+    cache = IdentityCache()
+    generation = cache.generation
+
+    cache.invalidate(1)
+    snapshot = cache.set(make_user(is_active=False), generation)
+
+    assert snapshot.is_active is False
+    assert cache.get(1) is None
+
+
+@pytest.mark.asyncio
+async def test_async_update_invalidates_after_commit(tmp_path, monkeypatch):
+    """Test a read racing the commit cannot re-cache the old row."""
+    database = tmp_path / "identity.db"
+    Base.metadata.create_all(bind=create_engine(f"sqlite:///{database}"))
+    engine = create_async_engine(f"sqlite+aiosqlite:///{database}")
+    try:
+        async with async_sessionmaker(bind=engine, expire_on_commit=False)() as db:
+            repository = AsyncUserRepository(db)
+            user = await repository.create(
+                email="a@example.com", username="alice", hashed_password="x"
+            )
+            commit = db.commit
+
+            async def commit_after_read():
+                # Another request caches the row as it was before this commit
+                identity_cache.set(make_user(user.id), identity_cache.generation)
+                await commit()
+
+            monkeypatch.setattr(db, "commit", commit_after_read)
+            await repository.update(user, is_active=False)
+
+        assert identity_cache.get(user.id) is None
+    finally:
+        identity_cache.clear()
+        await engine.dispose()
@@ -0,0 +1,42 @@
+"""
+Test cases for load test reporting.
+"""
+
+import pytest
+
+from benchmarks.load import Recorder, format_report, percentile
+
+
+def test_percentile_nearest_rank():
+    """Test percentiles pick the nearest-ranked sample."""
+    ordered = [float(value) for value in range(1, 101)]
+
+    assert percentile(ordered, 0.50) == 50.0
+    assert percentile(ordered, 0.95) == 95.0
+    assert percentile(ordered, 0.99) == 99.0
+    assert percentile([7.0], 0.99) == 7.0
+    assert percentile([], 0.5) == 0.0
+
+
+def test_recorder_report_per_endpoint_and_total():
+    """Test throughput, errors and rate limiting are reported per endpoint."""
+    recorder = Recorder()
+    for _ in range(8):
+        recorder.record("GET /auth/me", 200, 0.010)
+    recorder.record("GET /auth/me", 500, 0.200)
+    recorder.record("GET /auth/me", None, 1.000)
+    recorder.record("POST /auth/login", 429, 0.001)
+    recorder.record("POST /auth/login", 200, 0.300)
+
+    rows = {row["endpoint"]: row for row in recorder.report(elapsed=2.0)}
+
+    me = rows["GET /auth/me"]
+    assert me["requests"] == 10
+    assert me["rps"] == 5.0
+    assert me["p50_ms"] == pytest.approx(10.0)
+    assert me["p99_ms"] == pytest.approx(1000.0)
+    assert me["error_rate"] == 0.2
+    assert rows["POST /auth/login"]["limited_rate"] == 0.5
+    assert rows["total"]["requests"] == 12
+    assert rows["total"]["error_rate"] == pytest.approx(2 / 12)
+    assert "GET /auth/me" in format_report(list(rows.values()))
@@ -0,0 +1,116 @@
+"""
+Test cases for Prometheus metrics.
+"""
+
+import fakeredis.aioredis
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine
+
+from app.core.metrics import PoolCollector, metrics_response
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.rate_limit import RateLimiter
+
+
+def sample(name: str, **labels) -> float:
+    """Current value of one sample in the default registry."""
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture
+def client():
+    """Provide a client for a small app behind the metrics middleware."""
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/metrics-test/items/{item_id}")
+    def read_item(item_id: int):
+        return {"id": item_id}
+
+    @app.get("/metrics")
+    def metrics():
+        return metrics_response()
+
+    return TestClient(app)
+
+
+def test_requests_labelled_by_route_template(client):
+    """Test path parameters never become label values."""
+    route = "/metrics-test/items/{item_id}"
+    before = sample("http_requests_total", method="GET", route=route, status="200")
+    invalid = sample("http_requests_total", method="GET", route=route, status="422")
+    observed = sample("http_request_duration_seconds_count", method="GET", route=route)
+
+    for item_id in ("1", "2", "3", "oops"):
+        client.get(f"/metrics-test/items/{item_id}")
+
+    labels = {"method": "GET", "route": route}
+    assert sample("http_requests_total", status="200", **labels) == before + 3
+    assert sample("http_requests_total", status="422", **labels) == invalid + 1
+    assert sample("http_request_duration_seconds_count", **labels) == observed + 4
+
+
+def test_unmatched_paths_share_one_label(client):
+    """Test unknown paths and methods are folded together."""
+    labels = {"route": "unmatched", "status": "404"}
+    before = sample("http_requests_total", method="GET", **labels)
+    other = sample("http_requests_total", method="other", **labels)
+
+    client.get("/metrics-test/missing/1")
+    client.get("/metrics-test/missing/2")
+    client.request("PROPFIND", "/metrics-test/missing/3")
+
+    assert sample("http_requests_total", method="GET", **labels) == before + 2
+    assert sample("http_requests_total", method="other", **labels) == other + 1
+
+
+def test_metrics_endpoint_serves_text_format(client):
+    """Test /metrics renders the Prometheus exposition format."""
+    client.get("/metrics-test/items/1")
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "http_request_duration_seconds_bucket" in response.text
+
+
+def test_pool_collector_reports_engine_pools(tmp_path):
+    """Test pool gauges are read from the engine when collected."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", pool_size=3, max_overflow=0
+    )
+    collector = PoolCollector()
+    collector.track("test", engine)
+
+    with engine.connect():
+        values = {
+            metric.name: metric.samples[0].value for metric in collector.collect()
+        }
+
+    assert values["db_pool_size"] == 3
+    assert values["db_pool_checked_out"] == 1
+    engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_decisions_counted():
+    """Test limiter decisions and Redis round trips are recorded."""
+    limiter = RateLimiter(fakeredis.aioredis.FakeRedis(decode_responses=True))
+    limiter.rate_limits["metrics-test"] = {"requests": 1, "window": 60}
+    labels = {"limit_type": "metrics-test", "source": "redis"}
+    round_trips = sample(
+        "redis_command_duration_seconds_count", command="rate_limit_check"
+    )
+
+    await limiter.is_rate_limited("client", "metrics-test")
+    await limiter.is_rate_limited("client", "metrics-test")
+
+    assert sample("rate_limit_decisions_total", decision="allowed", **labels) == 1
+    assert sample("rate_limit_decisions_total", decision="limited", **labels) == 1
+    assert (
+        sample("redis_command_duration_seconds_count", command="rate_limit_check")
+        == round_trips + 2
+    )
@@ -0,0 +1,96 @@
+"""
+Test cases for keyset pagination and streaming on repositories.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.models.user import AuditLog, User
+from app.repositories.pagination import InvalidCursor
+from app.repositories.user_repository import AuditLogRepository, UserRepository
+
+
+@pytest.fixture
+def test_db(tmp_path):
+    """Provide a session on a fresh SQLite database with sample rows."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'pages.db'}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, expire_on_commit=False)()
+
+    start = datetime(2024, 1, 1)
+    db.add_all(
+        User(
+            email=f"user{index}@example.com",
+            username=f"user{index:02d}",
+            hashed_password="x",
+        )
+        for index in range(25)
+    )
+    db.add_all(
+        AuditLog(
+            action="USER_LOGIN",
+            resource="auth",
+            # Pairs of entries share a timestamp to exercise the tie-breaker
+            created_at=start + timedelta(minutes=index // 2),
+        )
+        for index in range(25)
+    )
+    db.commit()
+    yield db
+    db.close()
+    engine.dispose()
+
+
+def collect_pages(repository, **kwargs):
+    """Walk every page and return the items and the number of pages."""
+    items, pages, cursor = [], 0, None
+    while True:
+        page = repository.paginate(cursor=cursor, **kwargs)
+        items.extend(page.items)
+        pages += 1
+        if page.next_cursor is None:
+            return items, pages
+        cursor = page.next_cursor
+
+
+def test_pages_cover_every_row_once(test_db):
+    """Test walking the cursors visits each row exactly once in order."""
+    users, pages = collect_pages(UserRepository(test_db), page_size=10)
+
+    assert pages == 3
+    assert [user.id for user in users] == list(range(1, 26))
+
+
+def test_sort_column_with_ties(test_db):
+    """Test descending pages on a non-unique column use the ID tie-breaker."""
+    logs, _ = collect_pages(
+        AuditLogRepository(test_db), sort="created_at", descending=True, page_size=4
+    )
+
+    keys = [(log.created_at, log.id) for log in logs]
+    assert len(set(keys)) == 25
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_cursor_bound_to_sort_order(test_db):
+    """Test a cursor cannot be replayed against a different ordering."""
+    repository = UserRepository(test_db)
+    cursor = repository.paginate(sort="username", page_size=5).next_cursor
+
+    assert repository.paginate(cursor=cursor, sort="username", page_size=5).items
+    with pytest.raises(InvalidCursor):
+        repository.paginate(cursor=cursor, sort="email", page_size=5)
+    with pytest.raises(InvalidCursor):
+        repository.paginate(cursor="not-a-cursor", sort="username")
+
+
+def test_stream_yields_batches(test_db):
+    """Test streaming returns every row in batches of the requested size."""
+    batches = list(UserRepository(test_db).stream(batch_size=10))
+
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert not test_db.identity_map
@@ -0,0 +1,167 @@
+"""
+Test cases for per-request SQL statement tracking.
+"""
+
+import fakeredis.aioredis
+import pytest
+from fastapi import Depends, FastAPI, Request
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.hashing import password_hasher
+from app.db.database import Base
+from app.db.query_stats import (
+    NPlusOneWarning,
+    QueryStats,
+    _record_statement,
+    assert_max_queries,
+    request_stats,
+    track_session,
+)
+from app.middleware.query_stats import QueryStatsMiddleware
+from app.models.user import AuditLog, User
+from app.services.audit import audit_sink
+from app.services.auth import AuthService
+from app.services.refresh_tokens import RedisRefreshTokenStore
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Provide sessions on a fresh SQLite database."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'queries.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine, expire_on_commit=False)
+    engine.dispose()
+
+
+def make_client(session_factory, debug: bool) -> TestClient:
+    """Build an app whose route selects users one at a time."""
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware, debug=debug, n_plus_one_threshold=5)
+
+    def get_test_db(request: Request):
+        db = session_factory()
+        track_session(db, request_stats(request))
+        try:
+            yield db
+        finally:
+            db.close()
+
+    @app.get("/lookup/{count}")
+    def lookup(count: int, db=Depends(get_test_db)):
+        for user_id in range(count):
+            db.get(User, user_id)
+        return {"looked_up": count}
+
+    return TestClient(app)
+
+
+def test_tracked_session_records_statements(session_factory):
+    """Test statements run by a tracked session are counted and timed."""
+    stats = QueryStats()
+    with session_factory() as db:
+        track_session(db, stats)
+        db.execute(text("SELECT 1"))
+        for user_id in range(3):
+            db.get(User, user_id)
+        db.commit()
+
+        # Statements after the connection went back to the pool still count
+        db.execute(text("SELECT 2"))
+
+    assert stats.count == 5
+    assert stats.seconds > 0
+    assert max(stats.statements.values()) == 3
+    assert len(stats.slowest) == 3
+    assert stats.slowest == sorted(stats.slowest, reverse=True)
+
+
+def test_untracked_session_reuses_connection_cleanly(session_factory):
+    """Test stats stay with their session, not its pooled connection."""
+    stats = QueryStats()
+    with session_factory() as db:
+        track_session(db, stats)
+        db.execute(text("SELECT 1"))
+
+    with session_factory() as db:
+        db.execute(text("SELECT 1"))
+
+    assert stats.count == 1
+
+
+def test_statement_without_start_time_is_counted(session_factory):
+    """Test a statement whose start was not seen is counted untimed."""
+    stats = QueryStats()
+    with session_factory() as db:
+        track_session(db, stats)
+        connection = db.connection()
+        _record_statement(connection, None, "SELECT 1", (), None, False)
+
+    assert stats.count == 1
+    assert stats.seconds == 0
+
+
+def test_query_budget_exceeded(session_factory):
+    """Test the budget helper fails and lists the statements run."""
+    with session_factory() as db:
+        with assert_max_queries(3) as stats:
+            for user_id in range(3):
+                db.get(User, user_id)
+
+        with pytest.raises(AssertionError, match="at most 2 queries, ran 3"):
+            with assert_max_queries(2):
+                for user_id in range(3, 6):
+                    db.get(User, user_id)
+
+    assert stats.count == 3
+
+
+def test_debug_headers_describe_statements(session_factory):
+    """Test debug mode reports the request's statements in headers."""
+    response = make_client(session_factory, debug=True).get("/lookup/2")
+
+    assert response.headers["X-DB-Query-Count"] == "2"
+    assert response.headers["X-DB-Time"].endswith("ms")
+    assert "SELECT" in response.headers["X-DB-Slowest-1"]
+
+
+def test_repeated_statement_warns(session_factory):
+    """Test one statement run per row triggers an N+1 warning."""
+    client = make_client(session_factory, debug=False)
+
+    with pytest.warns(NPlusOneWarning, match="/lookup/{count} ran one statement 6"):
+        response = client.get("/lookup/6")
+
+    assert response.status_code == 200
+    assert "X-DB-Query-Count" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_login_query_budget(session_factory, monkeypatch):
+    """Test logging in reads and updates the user once and writes one audit row."""
+    # With the sink stopped, the audit row is written inline to this database
+    monkeypatch.setattr(audit_sink, "session_factory", session_factory)
+    with session_factory() as db:
+        user = User(
+            email="a@example.com",
+            username="alice",
+            hashed_password=await password_hasher.hash("secret"),
+        )
+        db.add(user)
+        db.commit()
+
+        auth_service = AuthService(db)
+        auth_service.refresh_tokens = RedisRefreshTokenStore(
+            fakeredis.aioredis.FakeRedis(decode_responses=True)
+        )
+        with assert_max_queries(3):
+            token = await auth_service.login_user("alice", "secret")
+
+        assert db.scalar(select(func.count()).select_from(AuditLog)) == 1
+
+    password_hasher.shutdown()
+    assert token["token_type"] == "bearer"
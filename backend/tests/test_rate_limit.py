@@ -0,0 +1,185 @@
+"""
+Test cases for the Redis rate limiter.
+"""
+
+import asyncio
+
+import fakeredis.aioredis
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.redis_client import redis_client
+from app.middleware.rate_limit import (
+    HybridRateLimiter,
+    RateLimiter,
+    get_limit_type,
+    rate_limit_middleware,
+)
+
+
+@pytest.fixture
+def limiter():
+    """Provide a rate limiter backed by an in-memory Redis."""
+    rate_limiter = RateLimiter(fakeredis.aioredis.FakeRedis(decode_responses=True))
+    rate_limiter.rate_limits["auth"] = {"requests": 3, "window": 60}
+    return rate_limiter
+
+
+@pytest.mark.asyncio
+async def test_requests_limited_after_quota(limiter):
+    """Test requests beyond the window quota are rejected."""
+    results = [await limiter.is_rate_limited("client", "auth") for _ in range(4)]
+
+    assert [is_limited for is_limited, _ in results] == [False, False, False, True]
+    assert [info["remaining"] for _, info in results] == [2, 1, 0, 0]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_counted_exactly(limiter):
+    """Test concurrent checks never admit more than the quota."""
+    results = await asyncio.gather(
+        *(limiter.is_rate_limited("client", "auth") for _ in range(10))
+    )
+
+    assert sum(not is_limited for is_limited, _ in results) == 3
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_fail_open():
+    """Test the limiter allows requests when Redis is unavailable."""
+    server = fakeredis.FakeServer()
+    server.connected = False
+    limiter = RateLimiter(fakeredis.aioredis.FakeRedis(server=server))
+
+    is_limited, _ = await limiter.is_rate_limited("client")
+
+    assert is_limited is False
+
+
+def test_limit_type_by_path():
+    """Test auth routes get the stricter auth policy."""
+    assert get_limit_type("/api/v1/auth/login") == "auth"
+    assert get_limit_type("/api/v1/auth/register") == "auth"
+    assert get_limit_type("/api/v1/auth/me") == "api"
+    assert get_limit_type("/api/v1/auth/refresh") == "api"
+    assert get_limit_type("/api/v1/users/") == "api"
+    assert get_limit_type("/health") == "default"
+
+
+@pytest.fixture
+def limited_client():
+    """Provide a client for a small app behind the rate limit middleware."""
+    app = FastAPI()
+    app.middleware("http")(rate_limit_middleware)
+
+    @app.get("/api/v1/auth/me")
+    def me():
+        return {"username": "alice"}
+
+    @app.post("/api/v1/auth/login")
+    def login():
+        return {"access_token": "token"}
+
+    previous = redis_client._client
+    redis_client.use(fakeredis.aioredis.FakeRedis(decode_responses=True))
+    yield TestClient(app)
+    redis_client.use(previous)
+
+
+def test_only_credential_endpoints_get_auth_policy(limited_client):
+    """Test /auth/me stays usable after more calls than the login quota."""
+    me = [limited_client.get("/api/v1/auth/me").status_code for _ in range(8)]
+    login = [limited_client.post("/api/v1/auth/login").status_code for _ in range(6)]
+
+    assert me == [200] * 8
+    assert login == [200] * 5 + [429]
+
+
+@pytest_asyncio.fixture
+async def hybrid_limiter():
+    """Provide a started two-tier limiter that only syncs when asked."""
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    rate_limiter = HybridRateLimiter(
+        client, sync_interval=3600, max_keys=2, local_min_limit=0
+    )
+    rate_limiter.rate_limits["api"] = {"requests": 20, "window": 60}
+    rate_limiter.start()
+    yield rate_limiter
+    await rate_limiter.stop()
+
+
+@pytest.mark.asyncio
+async def test_hybrid_decides_locally_and_syncs(hybrid_limiter):
+    """Test leased tokens admit requests locally and sync to Redis in a batch."""
+    for _ in range(5):
+        is_limited, _ = await hybrid_limiter.is_rate_limited("client", "api")
+        assert is_limited is False
+
+    client = hybrid_limiter.redis_client
+    window_key = (await client.keys("rate_limit:client:api:*"))[0]
+    assert await client.get(window_key) == "1"
+
+    assert await hybrid_limiter.sync() == 1
+    assert await client.get(window_key) == "5"
+
+
+@pytest.mark.asyncio
+async def test_hybrid_never_exceeds_limit(hybrid_limiter):
+    """Test a single worker admits exactly the quota."""
+    results = [await hybrid_limiter.is_rate_limited("client", "api") for _ in range(30)]
+
+    assert sum(not is_limited for is_limited, _ in results) == 20
+
+
+@pytest.mark.asyncio
+async def test_hybrid_evicts_idle_keys(hybrid_limiter):
+    """Test local state is bounded and evicted admissions still sync."""
+    for client_key in ("a", "b", "c"):
+        await hybrid_limiter.is_rate_limited(client_key, "api")
+        await hybrid_limiter.is_rate_limited(client_key, "api")
+
+    assert len(hybrid_limiter._buckets) == 2
+    await hybrid_limiter.sync()
+
+    client = hybrid_limiter.redis_client
+    window_key = (await client.keys("rate_limit:a:api:*"))[0]
+    assert await client.get(window_key) == "2"
+
+
+@pytest.mark.asyncio
+async def test_hybrid_splits_leases_between_workers(hybrid_limiter):
+    """Test each worker leases only its share of the remaining headroom."""
+    await hybrid_limiter.is_rate_limited("client", "api")
+    alone = hybrid_limiter._buckets["client", "api"].tokens
+
+    hybrid_limiter.workers = 4
+    await hybrid_limiter.is_rate_limited("other", "api")
+
+    assert hybrid_limiter._buckets["other", "api"].tokens == alone // 4
+
+
+@pytest.mark.asyncio
+async def test_hybrid_checks_small_limits_in_redis(hybrid_limiter):
+    """Test policies below the local minimum never admit from local tokens."""
+    hybrid_limiter.local_min_limit = 50
+    hybrid_limiter.rate_limits["auth"] = {"requests": 5, "window": 60}
+
+    results = [await hybrid_limiter.is_rate_limited("client", "auth") for _ in range(6)]
+
+    assert [is_limited for is_limited, _ in results] == [False] * 5 + [True]
+    assert ("client", "auth") not in hybrid_limiter._buckets
+    window_key = (await hybrid_limiter.redis_client.keys("rate_limit:client:auth:*"))[0]
+    assert await hybrid_limiter.redis_client.get(window_key) == "5"
+
+
+def test_hybrid_orphans_bounded():
+    """Test unsynced admissions kept while Redis is down stay bounded."""
+    limiter = HybridRateLimiter(max_keys=2)
+    for window_start in range(5):
+        limiter._queue_orphan(f"current:{window_start}", "previous", 1, 60)
+    limiter._queue_orphan("current:3", "previous", 2, 60)
+
+    assert list(limiter._orphans) == ["current:4", "current:3"]
+    assert limiter._orphans["current:3"][1] == 3
@@ -0,0 +1,139 @@
+"""
+Test cases for refresh token stores.
+"""
+
+import fakeredis.aioredis
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.models.user import RefreshToken, User
+from app.services.auth import AuthService
+from app.services.refresh_tokens import (
+    DatabaseRefreshTokenStore,
+    RedisRefreshTokenStore,
+    token_digest,
+)
+
+
+@pytest_asyncio.fixture
+async def redis_store():
+    """Provide a refresh token store backed by an in-memory Redis."""
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    yield RedisRefreshTokenStore(client)
+    await client.aclose()
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Provide sessions on a fresh SQLite database that counts statements."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'tokens.db'}")
+    Base.metadata.create_all(bind=engine)
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    factory.statements = statements
+    yield factory
+    engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_redis_store_keys_tokens_by_digest(redis_store):
+    """Test tokens are stored under their digest with a native TTL."""
+    await redis_store.add("secret-token", 7, ttl=60)
+    client = redis_store.get_redis_client()
+    key = redis_store.token_key(token_digest("secret-token"))
+
+    assert await redis_store.get_user_id("secret-token") == 7
+    assert await redis_store.get_user_id("other-token") is None
+    assert 0 < await client.ttl(key) <= 60
+    assert not [key async for key in client.scan_iter("*secret-token*")]
+
+
+@pytest.mark.asyncio
+async def test_redis_store_revoke(redis_store):
+    """Test a revoked token is no longer valid and leaves the user's set."""
+    await redis_store.add("first", 7, ttl=60)
+    await redis_store.add("second", 7, ttl=60)
+
+    assert await redis_store.revoke("first") is True
+    assert await redis_store.revoke("first") is False
+    assert await redis_store.get_user_id("first") is None
+    assert await redis_store.get_user_id("second") == 7
+    assert await redis_store.get_redis_client().smembers(redis_store.user_key(7)) == {
+        token_digest("second")
+    }
+
+
+@pytest.mark.asyncio
+async def test_redis_store_revoke_all(redis_store):
+    """Test revoking all tokens of one user leaves other users alone."""
+    for token in ("a", "b", "c"):
+        await redis_store.add(token, 1, ttl=60)
+    await redis_store.add("d", 2, ttl=60)
+
+    assert await redis_store.revoke_all(1) == 3
+    assert [await redis_store.get_user_id(token) for token in "abcd"] == [
+        None,
+        None,
+        None,
+        2,
+    ]
+    assert not await redis_store.get_redis_client().exists(redis_store.user_key(1))
+    assert await redis_store.revoke_all(1) == 0
+
+
+@pytest.mark.asyncio
+async def test_database_store_filters_revoked_tokens(session_factory):
+    """Test the database store honours revocation and stores only digests."""
+    store = DatabaseRefreshTokenStore(session_factory)
+    await store.add("first", 1, ttl=60)
+    await store.add("second", 1, ttl=60)
+    await store.add("expired", 1, ttl=-60)
+
+    assert await store.get_user_id("first") == 1
+    assert await store.get_user_id("expired") is None
+    assert await store.revoke("first") is True
+    assert await store.get_user_id("first") is None
+    assert await store.revoke_all(1) == 2
+    assert await store.get_user_id("second") is None
+
+    with session_factory() as db:
+        assert {token.token for token in db.query(RefreshToken)} == {
+            token_digest(token) for token in ("first", "second", "expired")
+        }
+    assert await store.delete_expired() == 3
+
+
+@pytest.mark.asyncio
+async def test_refresh_access_token_skips_database_for_cached_user(
+    redis_store, session_factory
+):
+    """Test refreshing a token for a cached user runs no SQL at all."""
+    with session_factory() as db:
+        user = User(email="a@example.com", username="alice", hashed_password="x")
+        db.add(user)
+        db.commit()
+
+        auth_service = AuthService(db)
+        auth_service.refresh_tokens = redis_store
+        refresh_token = await auth_service.create_refresh_token(user.id)
+
+        await auth_service.refresh_access_token(refresh_token)
+        session_factory.statements.clear()
+        token = await auth_service.refresh_access_token(refresh_token)
+
+        assert token["token_type"] == "bearer"
+        assert session_factory.statements == []
+
+        await auth_service.logout_user(refresh_token)
+        with pytest.raises(HTTPException) as exc_info:
+            await auth_service.refresh_access_token(refresh_token)
+        assert exc_info.value.status_code == 401
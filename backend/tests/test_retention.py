@@ -0,0 +1,198 @@
+"""
+Test cases for retention jobs.
+"""
+
+import gzip
+import json
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.db.partitions import parse_partition_name
+from app.models.user import AuditLog, RefreshToken
+from app.services.retention import RetentionJobs, archive_table, main
+
+
+@pytest.fixture
+def test_engine(tmp_path):
+    """Provide an engine on a fresh SQLite database."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'retention.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def jobs(test_engine, tmp_path):
+    """Provide retention jobs with small batches and no throttling."""
+    return RetentionJobs(
+        audit_retention_days=30,
+        archive_dir=str(tmp_path / "archive"),
+        batch_size=3,
+        pause=0,
+        session_factory=sessionmaker(bind=test_engine),
+        engine=test_engine,
+    )
+
+
+def count(jobs, model) -> int:
+    """Count rows in a model's table."""
+    with jobs.session_factory() as db:
+        return db.scalar(select(func.count()).select_from(model))
+
+
+def test_purge_refresh_tokens(jobs):
+    """Test expired and revoked tokens are removed and valid ones kept."""
+    now = datetime.utcnow()
+    with jobs.session_factory() as db:
+        db.add_all(
+            [
+                RefreshToken(
+                    user_id=1, token=f"expired{i}", expires_at=now - timedelta(hours=1)
+                )
+                for i in range(5)
+            ]
+            + [
+                RefreshToken(
+                    user_id=1,
+                    token="revoked",
+                    expires_at=now + timedelta(days=1),
+                    is_revoked=True,
+                ),
+                RefreshToken(
+                    user_id=1, token="valid", expires_at=now + timedelta(days=1)
+                ),
+            ]
+        )
+        db.commit()
+
+    result = jobs.purge_refresh_tokens()
+
+    assert result.job == "refresh_tokens"
+    assert result.deleted == 6
+    assert result.seconds >= 0
+    assert count(jobs, RefreshToken) == 1
+
+
+def test_purge_audit_logs_in_batches(jobs):
+    """Test audit logs past retention are deleted across several batches."""
+    now = datetime.utcnow()
+    with jobs.session_factory() as db:
+        db.add_all(
+            [
+                AuditLog(
+                    action="old",
+                    resource="auth",
+                    created_at=now - timedelta(days=31 + i),
+                )
+                for i in range(7)
+            ]
+            + [
+                AuditLog(
+                    action="new", resource="auth", created_at=now - timedelta(days=1)
+                )
+            ]
+        )
+        db.commit()
+
+    (result,) = jobs.run_once(["audit_logs"])
+
+    assert result.deleted == 7
+    assert result.archived == []
+    assert count(jobs, AuditLog) == 1
+
+
+class LockedConnection:
+    """A PostgreSQL connection stand-in whose advisory lock is held elsewhere."""
+
+    def __init__(self):
+        self.statements = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def scalar(self, statement, parameters=None):
+        self.statements.append(str(statement))
+        return False
+
+    def execute(self, statement, parameters=None):
+        self.statements.append(str(statement))
+
+    def commit(self):
+        pass
+
+
+def test_run_skipped_while_locked_elsewhere(jobs):
+    """Test a run is skipped when another process holds the retention lock."""
+    conn = LockedConnection()
+    jobs.engine = SimpleNamespace(
+        dialect=SimpleNamespace(name="postgresql"), connect=lambda: conn
+    )
+    with jobs.session_factory() as db:
+        db.add(AuditLog(action="old", resource="auth", created_at=datetime(2000, 1, 1)))
+        db.commit()
+
+    assert jobs.run_once() == []
+    assert count(jobs, AuditLog) == 1
+    assert conn.statements == ["SELECT pg_try_advisory_lock(hashtext(:name))"]
+
+
+def test_audit_retention_disabled(jobs):
+    """Test audit logs are kept when no retention is configured."""
+    jobs.audit_retention_days = None
+    with jobs.session_factory() as db:
+        db.add(AuditLog(action="old", resource="auth", created_at=datetime(2000, 1, 1)))
+        db.commit()
+
+    assert jobs.purge_audit_logs().deleted == 0
+    assert count(jobs, AuditLog) == 1
+
+
+def test_archive_table_writes_compressed_ndjson(jobs, test_engine, tmp_path):
+    """Test a table is archived as gzip NDJSON with one object per row."""
+    with jobs.session_factory() as db:
+        db.add_all(
+            [
+                AuditLog(
+                    action=f"a{i}", resource="auth", created_at=datetime(2024, 1, 2)
+                )
+                for i in range(4)
+            ]
+        )
+        db.commit()
+    path = tmp_path / "archive" / "audit_logs.ndjson.gz"
+
+    with test_engine.connect() as conn:
+        assert archive_table(conn, "audit_logs", path, batch_size=2) == 4
+
+    with gzip.open(path, "rt") as file:
+        rows = [json.loads(line) for line in file]
+    assert [row["action"] for row in rows] == ["a0", "a1", "a2", "a3"]
+    assert rows[0]["created_at"].startswith("2024-01-02")
+    assert not list(path.parent.glob(".*.part"))
+
+
+def test_parse_partition_name():
+    """Test only monthly partitions of the given table are recognised."""
+    assert parse_partition_name("audit_logs", "audit_logs_y2024m03").month == 3
+    assert parse_partition_name("audit_logs", "audit_logs_default") is None
+    assert parse_partition_name("audit_logs", "other_y2024m03") is None
+
+
+def test_cli_runs_selected_job(jobs, monkeypatch, capsys):
+    """Test the command line entry point reports each job it ran."""
+    monkeypatch.setattr("app.services.retention.retention_jobs", jobs)
+
+    assert main(["--job", "refresh_tokens", "--batch-size", "10"]) == 0
+
+    output = capsys.readouterr().out
+    assert output.startswith("refresh_tokens: removed 0 rows in ")
+    assert "audit_logs" not in output
+    assert jobs.batch_size == 10
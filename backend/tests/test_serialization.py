@@ -0,0 +1,84 @@
+"""
+Test cases for the fast JSON serialization path.
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.identity_cache import CachedUser
+from app.models.user import User
+from app.schemas.pagination import CursorPage
+from app.schemas.user import Token, token_serializer, user_serializer
+from app.schemas.user import User as UserSchema
+
+
+def make_user(index: int, created_at: datetime) -> User:
+    """Build a transient user row."""
+    return User(
+        id=index,
+        email=f"user{index}@example.com",
+        username=f"user{index}",
+        hashed_password="secret-hash",
+        is_active=True,
+        is_superuser=False,
+        created_at=created_at,
+        updated_at=None,
+    )
+
+
+@pytest.mark.parametrize(
+    "created_at",
+    [
+        datetime(2024, 1, 2, 3, 4, 5),
+        datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+        datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone(timedelta(hours=2))),
+    ],
+)
+def test_user_matches_pydantic_output(created_at):
+    """Test rows encode exactly as the response model would."""
+    user = make_user(1, created_at)
+
+    assert (
+        user_serializer.dumps(user)
+        == UserSchema.model_validate(user).model_dump_json().encode()
+    )
+
+
+def test_fields_outside_schema_are_dropped():
+    """Test only the schema's fields are encoded."""
+    user = make_user(1, datetime(2024, 1, 1))
+
+    assert "hashed_password" not in json.loads(user_serializer.dumps(user))
+    assert (
+        json.loads(
+            token_serializer.dumps(
+                {"access_token": "abc", "token_type": "bearer", "user_id": 1}
+            )
+        )
+        == Token(access_token="abc", token_type="bearer").model_dump()
+    )
+
+
+def test_cached_user_and_missing_mapping_keys():
+    """Test dataclasses are read like rows and required mapping keys enforced."""
+    cached = CachedUser.from_model(make_user(1, datetime(2024, 1, 1)))
+
+    assert json.loads(user_serializer.dumps(cached))["username"] == "user1"
+    with pytest.raises(KeyError):
+        token_serializer.dumps({"token_type": "bearer"})
+
+
+def test_page_and_lines_match_pydantic_output():
+    """Test pages and NDJSON encode like the equivalent schemas."""
+    users = [make_user(index, datetime(2024, 1, 1)) for index in range(3)]
+
+    page = user_serializer.dumps_page(users, "next")
+    expected = CursorPage[UserSchema](items=users, next_cursor="next")
+    assert page == expected.model_dump_json().encode()
+
+    lines = user_serializer.dumps_lines(users).decode().splitlines()
+    assert lines == [
+        UserSchema.model_validate(user).model_dump_json() for user in users
+    ]
@@ -0,0 +1,104 @@
+"""
+Test cases for application startup.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app import main
+from app.core.hashing import PasswordHasher
+from app.main import create_app
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def test_import_has_no_side_effects(tmp_path):
+    """Test importing the ASGI module touches neither the database nor disk."""
+    database = tmp_path / "startup.db"
+    uploads = tmp_path / "uploads"
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite:///{database}",
+        "UPLOAD_DIR": str(uploads),
+        "REDIS_HOST": "redis.invalid",
+    }
+    code = "import sys, app.main; print('PIL' in sys.modules)"
+
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.strip() == "False"
+    assert not database.exists()
+    assert not uploads.exists()
+
+
+def test_create_app_builds_independent_apps():
+    """Test each call returns a fresh app with the same routes."""
+    first, second = create_app(), create_app()
+
+    assert first is not second
+    assert [route.path for route in first.routes] == [
+        route.path for route in second.routes
+    ]
+
+
+@pytest.mark.asyncio
+async def test_hasher_warm_starts_workers():
+    """Test warming starts the worker pool and leaves it usable."""
+    hasher = PasswordHasher(max_workers=2)
+    try:
+        await hasher.warm()
+
+        assert hasher._executor is not None
+        assert await hasher.verify("secret", await hasher.hash("secret"))
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_teardown_continues_past_failures(monkeypatch):
+    """Test one resource failing to stop does not skip the rest."""
+    app = create_app()
+    stopped = []
+
+    async def record(name):
+        stopped.append(name)
+
+    async def fail():
+        raise RuntimeError("audit sink failed")
+
+    async def no_warm_up(app):
+        pass
+
+    monkeypatch.setattr(main.settings, "CREATE_TABLES_ON_STARTUP", False)
+    monkeypatch.setattr(main, "warm_up", no_warm_up)
+    for name, resource in [
+        ("retention", main.retention_jobs),
+        ("partitions", main.audit_partitions),
+        ("rate_limiter", main.rate_limiter),
+    ]:
+        monkeypatch.setattr(resource, "start", lambda: None)
+        monkeypatch.setattr(resource, "stop", lambda name=name: record(name))
+    monkeypatch.setattr(main.audit_sink, "start", lambda: None)
+    monkeypatch.setattr(main.audit_sink, "stop", fail)
+    monkeypatch.setattr(main.redis_client, "close", lambda: record("redis"))
+    monkeypatch.setattr(
+        main, "async_engine", SimpleNamespace(dispose=lambda: record("database"))
+    )
+
+    with pytest.raises(RuntimeError, match="audit sink failed"):
+        async with main.lifespan(app):
+            pass
+
+    assert stopped == ["retention", "partitions", "rate_limiter", "redis", "database"]
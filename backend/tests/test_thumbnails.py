@@ -0,0 +1,82 @@
+"""
+Test cases for background thumbnail generation.
+"""
+
+import asyncio
+
+import pytest
+from PIL import Image
+
+from app.services.thumbnails import (
+    THUMBNAIL_SIZES,
+    ThumbnailJobRunner,
+    generate_thumbnails,
+    thumbnail_filename,
+)
+
+
+@pytest.fixture
+def source_image(tmp_path):
+    """Write a large JPEG to a temporary directory."""
+    path = tmp_path / "user_1_photo.jpg"
+    Image.new("RGB", (2400, 1600), "red").save(path, "JPEG")
+    return path
+
+
+def test_generate_thumbnails_cascades_sizes(source_image):
+    """Test each variant is written within its bounding box."""
+    result = generate_thumbnails(str(source_image))
+
+    assert result["size"] == (2400, 1600)
+    assert result["format"] == "JPEG"
+    for size_name, (width, height) in THUMBNAIL_SIZES.items():
+        thumb_path = source_image.with_name(
+            thumbnail_filename(size_name, source_image.name)
+        )
+        with Image.open(thumb_path) as thumb:
+            assert thumb.width == width
+            assert thumb.height <= height
+    assert not list(source_image.parent.glob(".*.part"))
+
+
+@pytest.mark.asyncio
+async def test_runner_reports_pending_then_ready(source_image):
+    """Test jobs report pending until the worker pool finishes them."""
+    runner = ThumbnailJobRunner(max_workers=1)
+    try:
+        runner.submit(source_image)
+        assert runner.get_status(source_image) == {"status": "pending"}
+
+        await asyncio.gather(*runner._tasks)
+
+        job = runner.get_status(source_image)
+        assert job["status"] == "ready"
+        assert set(job["thumbnails"]) == set(THUMBNAIL_SIZES)
+    finally:
+        runner.shutdown()
+
+
+def test_status_falls_back_to_disk(source_image):
+    """Test jobs unknown to this process are resolved from the variant files."""
+    runner = ThumbnailJobRunner(max_workers=1)
+
+    assert runner.get_status(source_image) == {"status": "pending"}
+    generate_thumbnails(str(source_image))
+    assert runner.get_status(source_image)["status"] == "ready"
+    assert runner.get_status(source_image.with_name("missing.jpg")) is None
+
+
+@pytest.mark.asyncio
+async def test_failure_reported_to_other_workers(tmp_path):
+    """Test a failed job is reported from disk by a runner that did not run it."""
+    source = tmp_path / "user_1_broken.jpg"
+    source.write_bytes(b"not an image")
+    runner = ThumbnailJobRunner(max_workers=1)
+    try:
+        runner.submit(source)
+        await asyncio.gather(*runner._tasks)
+    finally:
+        runner.shutdown()
+
+    assert runner.get_status(source) == {"status": "failed"}
+    assert ThumbnailJobRunner(max_workers=1).get_status(source) == {"status": "failed"}
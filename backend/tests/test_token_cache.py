@@ -0,0 +1,77 @@
+"""
+Test cases for the decoded JWT claims cache.
+"""
+
+import time
+
+import pytest
+from jose import JWTError, jwt
+
+from app.core import token_cache as token_cache_module
+from app.core.token_cache import TokenCache
+
+SECRET_KEY = "test-secret"
+ALGORITHM = "HS256"
+
+
+def make_token(sub: str = "testuser", lifetime: int = 60) -> str:
+    """Create a signed token expiring after ``lifetime`` seconds."""
+    return jwt.encode(
+        {"sub": sub, "exp": int(time.time()) + lifetime}, SECRET_KEY, ALGORITHM
+    )
+
+
+def test_repeat_decode_is_a_hit():
+    """Test a reused token is served from the cache."""
+    cache = TokenCache()
+    token = make_token()
+
+    assert cache.decode(token, SECRET_KEY, ALGORITHM)["sub"] == "testuser"
+    assert cache.decode(token, SECRET_KEY, ALGORITHM)["sub"] == "testuser"
+    assert cache.stats == {"hits": 1, "misses": 1, "size": 1}
+
+
+def test_invalid_token_is_not_cached():
+    """Test tokens that fail validation raise and are not stored."""
+    cache = TokenCache()
+    token = make_token()
+
+    with pytest.raises(JWTError):
+        cache.decode(token, "other-secret", ALGORITHM)
+    assert cache.stats["size"] == 0
+
+
+def test_entry_evicted_at_expiry(monkeypatch):
+    """Test an entry is dropped once the token's exp has passed."""
+    cache = TokenCache()
+    token = make_token(lifetime=5)
+    cache.decode(token, SECRET_KEY, ALGORITHM)
+
+    real_time = time.time
+    monkeypatch.setattr(token_cache_module.time, "time", lambda: real_time() + 10)
+    cache.decode(token, SECRET_KEY, ALGORITHM)
+
+    assert cache.stats == {"hits": 0, "misses": 2, "size": 0}
+
+
+def test_key_rotation_flushes_cache():
+    """Test changing the signing key drops claims verified with the old key."""
+    cache = TokenCache()
+    cache.decode(make_token(), SECRET_KEY, ALGORITHM)
+
+    new_token = jwt.encode({"sub": "other", "exp": int(time.time()) + 60}, "rotated")
+    cache.decode(new_token, "rotated", ALGORITHM)
+
+    assert cache.stats["size"] == 1
+
+
+def test_size_is_bounded():
+    """Test the least recently used entry is evicted past max_size."""
+    cache = TokenCache(max_size=2)
+    tokens = [make_token(sub=f"user{i}") for i in range(3)]
+    for token in tokens:
+        cache.decode(token, SECRET_KEY, ALGORITHM)
+
+    assert cache.stats["size"] == 2
+    cache.decode(tokens[0], SECRET_KEY, ALGORITHM)
+    assert cache.misses == 4
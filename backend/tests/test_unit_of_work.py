@@ -0,0 +1,97 @@
+"""
+Test cases for repository unit-of-work transactions.
+"""
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.hashing import password_hasher
+from app.db.database import Base
+from app.models.user import AuditLog, RefreshToken, User
+from app.repositories import unit_of_work
+from app.repositories.user_repository import RefreshTokenRepository, UserRepository
+from app.services.audit import audit_sink
+from app.services.auth import AuthService
+from app.services.refresh_tokens import DatabaseRefreshTokenStore
+
+
+@pytest.fixture
+def test_db(tmp_path):
+    """Provide a session on a fresh SQLite database that records commits."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'uow.db'}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, expire_on_commit=False)()
+    db.info["commits"] = 0
+
+    @event.listens_for(db, "after_commit")
+    def count_commit(session):
+        session.info["commits"] += 1
+
+    yield db
+    db.close()
+    engine.dispose()
+
+
+def test_writes_commit_once(test_db):
+    """Test repository writes inside a unit of work share one commit."""
+    repo = UserRepository(test_db)
+
+    with unit_of_work(test_db):
+        user = repo.create(
+            email="test@example.com", username="testuser", hashed_password="x"
+        )
+        assert user.id is not None
+        assert user.created_at is not None
+        repo.update_last_login(user)
+        assert test_db.info["commits"] == 0
+
+    assert test_db.info["commits"] == 1
+
+
+def test_error_rolls_back(test_db):
+    """Test an exception discards all writes in the unit of work."""
+    repo = UserRepository(test_db)
+
+    with pytest.raises(RuntimeError):
+        with unit_of_work(test_db):
+            repo.create(
+                email="test@example.com", username="testuser", hashed_password="x"
+            )
+            raise RuntimeError("boom")
+
+    assert test_db.query(User).count() == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_login_rolls_back(test_db, monkeypatch):
+    """Test a failure mid-login discards the last-login update and token."""
+    session_factory = sessionmaker(bind=test_db.get_bind(), expire_on_commit=False)
+    monkeypatch.setattr(audit_sink, "session_factory", session_factory)
+    user = UserRepository(test_db).create(
+        email="test@example.com",
+        username="testuser",
+        hashed_password=await password_hasher.hash("secret"),
+    )
+    updated_at = user.updated_at
+    create_refresh_token = RefreshTokenRepository.create_refresh_token
+
+    def fail_after_write(self, *args):
+        create_refresh_token(self, *args)
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(
+        RefreshTokenRepository, "create_refresh_token", fail_after_write
+    )
+    auth_service = AuthService(test_db)
+    auth_service.refresh_tokens = DatabaseRefreshTokenStore(session_factory)
+    try:
+        with pytest.raises(RuntimeError):
+            await auth_service.login_user("testuser", "secret")
+    finally:
+        password_hasher.shutdown()
+
+    test_db.expire_all()
+    assert test_db.get(User, user.id).updated_at == updated_at
+    assert test_db.query(RefreshToken).count() == 0
+    assert test_db.query(AuditLog).count() == 0
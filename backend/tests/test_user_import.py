@@ -0,0 +1,116 @@
+"""
+Test cases for the streaming bulk user import.
+"""
+
+import json
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.hashing import password_hasher
+from app.core.security import verify_password
+from app.db.database import Base
+from app.models.user import User
+from app.services.user_import import UserImporter
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Provide a session factory bound to a fresh SQLite database."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'import.db'}")
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    with factory() as db:
+        db.add(User(email="taken@example.com", username="taken", hashed_password="x"))
+        db.commit()
+    yield factory
+    password_hasher.shutdown()
+    engine.dispose()
+
+
+async def stream(body: str, chunk_size: int = 7):
+    """Yield a body in small chunks that split lines and characters."""
+    data = body.encode()
+    for start in range(0, len(data), chunk_size):
+        yield data[start : start + chunk_size]
+
+
+async def run_import(importer, body: str, import_format: str):
+    """Collect the results of an import."""
+    return [result async for result in importer.run(stream(body), import_format)]
+
+
+@pytest.mark.asyncio
+async def test_csv_import(session_factory):
+    """Test CSV rows are validated, deduplicated and inserted in batches."""
+    body = (
+        "email,username,password,full_name\n"
+        'ann@example.com,ann,secret-1,"Ann\nSmith"\n'
+        "bob@example.com,bob,secret-2,Bob\n"
+        "not-an-email,carl,secret-3,Carl\n"
+        "taken@example.com,dave,secret-4,Dave\n"
+        "ann@example.com,ann2,secret-5,Ann Again\n"
+        "eve@example.com,eve,secret-6\n"
+    )
+    importer = UserImporter(batch_size=2, session_factory=session_factory)
+
+    results = await run_import(importer, body, "csv")
+
+    errors = {result["line"]: result["errors"] for result in results[:-1]}
+    assert set(errors) == {5, 6, 7, 8}
+    assert errors[5][0].startswith("email:")
+    assert results[-1] == {"status": "done", "created": 2, "failed": 4}
+
+    with session_factory() as db:
+        ann = db.scalar(select(User).where(User.username == "ann"))
+        assert ann.full_name == "Ann\nSmith"
+        assert verify_password("secret-1", ann.hashed_password)
+        assert db.scalar(select(User).where(User.username == "bob")) is not None
+
+
+@pytest.mark.asyncio
+async def test_ndjson_import(session_factory):
+    """Test NDJSON rows are imported and malformed lines reported."""
+    rows = [
+        {"email": "fay@example.com", "username": "fay", "password": "secret-7"},
+        {"email": "gus@example.com", "username": "taken", "password": "secret-8"},
+    ]
+    body = "\n".join(json.dumps(row) for row in rows) + "\n{oops\n[1]\n"
+    importer = UserImporter(batch_size=10, session_factory=session_factory)
+
+    results = await run_import(importer, body, "ndjson")
+
+    assert [result.get("line") for result in results[:-1]] == [3, 4, 2]
+    assert results[-1] == {"status": "done", "created": 1, "failed": 3}
+
+
+@pytest.mark.asyncio
+async def test_busy_hasher_fails_batch_not_stream(session_factory, monkeypatch):
+    """Test a shed batch is reported row by row and the summary still sent."""
+    calls = 0
+    hash_many = password_hasher.hash_many
+
+    async def busy_once(passwords):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise HTTPException(status_code=503, detail="Server is busy")
+        return await hash_many(passwords)
+
+    monkeypatch.setattr(password_hasher, "hash_many", busy_once)
+    rows = [
+        {"email": f"user{i}@example.com", "username": f"user{i}", "password": "pw"}
+        for i in range(3)
+    ]
+    body = "\n".join(json.dumps(row) for row in rows) + "\n"
+    importer = UserImporter(batch_size=2, session_factory=session_factory)
+
+    results = await run_import(importer, body, "ndjson")
+
+    assert results[:-1] == [
+        {"line": line, "status": "error", "errors": ["Server is busy"]}
+        for line in (1, 2)
+    ]
+    assert results[-1] == {"status": "done", "created": 1, "failed": 2}